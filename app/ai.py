@@ -7,6 +7,8 @@ from typing import Any, Dict, Optional
 
 import requests
 
+from . import timing
+
 
 DEFAULT_OLLAMA_BASE_URL = os.environ.get("OLLAMA_BASE_URL", "http://host.docker.internal:11434")
 DEFAULT_OLLAMA_MODEL = os.environ.get("OLLAMA_MODEL", "llama3.2")
@@ -14,7 +16,8 @@ DEFAULT_OLLAMA_MODEL = os.environ.get("OLLAMA_MODEL", "llama3.2")
 
 def _post_ollama(path: str, payload: Dict[str, Any], base_url: Optional[str] = None, timeout_s: int = 600) -> Dict[str, Any]:
     url = f"{(base_url or DEFAULT_OLLAMA_BASE_URL)}{path}"
-    resp = requests.post(url, json=payload, timeout=timeout_s)
+    with timing.span("upstream"):
+        resp = requests.post(url, json=payload, timeout=timeout_s)
     resp.raise_for_status()
     return resp.json()
 
@@ -109,7 +112,8 @@ def generate_weather_report(forecast: Dict[str, Any], location: str, *, base_url
 def ollama_list_models(base_url: Optional[str] = None) -> Optional[list[str]]:
     try:
         url = f"{(base_url or DEFAULT_OLLAMA_BASE_URL)}/api/tags"
-        resp = requests.get(url, timeout=5)
+        with timing.span("upstream"):
+            resp = requests.get(url, timeout=5)
         resp.raise_for_status()
         data = resp.json()
         models = []
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+from typing import Any, Dict, List, Optional
+import logging
+
+from sqlalchemy import event, inspect, text
+
+from .database import engine
+from .models import Article, UNDATED_SORT_BELOW, UNDATED_SORT_OFFSET
+
+logger = logging.getLogger("app.cards")
+
+CARDS_TABLE = "article_cards"
+CARD_COLUMNS = (
+    "id", "location_id", "source_name", "sort_key", "title", "source_url", "image_url",
+    "published_at", "fetched_at", "sort_ts", "ai_model", "excerpt", "byline", "rewrite_note",
+)
+# `articles` columns a card is built from; an UPDATE touching any of them rewrites it
+SOURCE_COLUMNS = (
+    "location_id", "source_name", "sort_key", "ai_title", "source_title", "source_url", "image_url",
+    "published_at", "fetched_at", "ai_model", "ai_body",
+)
+# Card columns computed in Python (the triggers leave them to the ORM hooks below)
+TEXT_COLUMNS = ("excerpt", "byline")
+# `articles` columns those depend on
+TEXT_SOURCES = ("ai_body", "ai_model", "source_url", "source_title")
+REWRITE_NOTE = "Showing original text (AI unavailable)"
+
+_FIRSTS = ["Waffles", "Pickles", "Biscuit", "Snickers", "Pumpkin", "Noodle", "Sprinkles", "Muffin", "Peaches", "Tofu"]
+_LASTS = [
+    "McGiggles", "Von Quill", "Fizzlebottom", "O'Snark", "Bumblebee", "Flapjack", "Wobbleton", "Sparkplug",
+    "Featherstone", "Noodlekins",
+]
+_TITLES = ["Correspondent", "Staff Writer", "Senior Scribe", "Field Reporter", "News Enthusiast"]
+
+
+def excerpt_chars() -> int:
+    try:
+        return max(40, int(os.environ.get("ARTICLE_EXCERPT_CHARS", "240")))
+    except Exception:
+        return 240
+
+
+def excerpt(body: Optional[str], limit: Optional[int] = None) -> Optional[str]:
+    """First `limit` characters of `body` on one line, cut at a word with an ellipsis."""
+    if not body:
+        return None
+    limit = limit or excerpt_chars()
+    flat = " ".join(body.split())
+    if len(flat) <= limit:
+        return flat
+    cut = flat[:limit]
+    if " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut.rstrip(",;:.-") + "…"
+
+
+def byline(source_url: Optional[str], source_title: Optional[str], article_id: Optional[int]) -> str:
+    """The playful author name shown on a rewritten article, stable per article."""
+    try:
+        seed = (source_url or source_title or str(article_id) or "seed").encode("utf-8", errors="ignore")
+        h = int(hashlib.sha256(seed).hexdigest(), 16)
+        return f"{_FIRSTS[h % len(_FIRSTS)]} {_LASTS[(h // 7) % len(_LASTS)]}, {_TITLES[(h // 13) % len(_TITLES)]}"
+    except Exception:
+        return "Sammy Scribbles, Staff Writer"
+
+
+def card_text(ai_body: Optional[str], ai_model: Optional[str], source_url: Optional[str],
+              source_title: Optional[str], article_id: Optional[int]) -> Dict[str, Any]:
+    """The excerpt and byline of a card; only rewritten (non-fallback) articles get a byline."""
+    rewritten = bool(ai_body) and not (ai_model or "").startswith("fallback:")
+    return {
+        "excerpt": excerpt(ai_body),
+        "byline": byline(source_url, source_title, article_id) if rewritten else None,
+    }
+
+
+def _write_text(conn, a: Article) -> None:
+    conn.execute(
+        text(f"UPDATE {CARDS_TABLE} SET excerpt = :excerpt, byline = :byline WHERE id = :id"),
+        {"id": a.id, **card_text(a.ai_body, a.ai_model, a.source_url, a.source_title, a.id)},
+    )
+
+
+@event.listens_for(Article, "after_insert")
+def _card_text_on_insert(mapper, conn, target: Article) -> None:
+    _write_text(conn, target)
+
+
+@event.listens_for(Article, "after_update")
+def _card_text_on_update(mapper, conn, target: Article) -> None:
+    state = inspect(target)
+    if any(state.attrs[c].history.has_changes() for c in TEXT_SOURCES):
+        _write_text(conn, target)
+
+
+def fill_card_text(conn, batch: int = 500) -> int:
+    """Compute excerpt and byline for cards that lack them. Returns the number filled.
+
+    The ORM hooks fill them on every article write; this catches cards built
+    by the triggers alone (rows written outside the app, backfills, rebuilds).
+    """
+    filled = 0
+    last_id = 0
+    while True:
+        rows = conn.execute(text(
+            f"SELECT a.id, a.ai_body, a.ai_model, a.source_url, a.source_title FROM {CARDS_TABLE} c "
+            f"JOIN articles a ON a.id = c.id "
+            f"WHERE c.excerpt IS NULL AND length(a.ai_body) > 0 AND c.id > :last ORDER BY c.id LIMIT :n"
+        ), {"last": last_id, "n": batch}).all()
+        if not rows:
+            return filled
+        conn.execute(
+            text(f"UPDATE {CARDS_TABLE} SET excerpt = :excerpt, byline = :byline WHERE id = :id"),
+            [{"id": r.id, **card_text(r.ai_body, r.ai_model, r.source_url, r.source_title, r.id)} for r in rows],
+        )
+        filled += len(rows)
+        last_id = rows[-1].id
+
+
+def _iso_sql(col: str) -> str:
+    # SQLite DATETIME text ("YYYY-MM-DD HH:MM:SS.ffffff") as datetime.isoformat() prints it
+    return f"replace(CASE WHEN substr({col}, 20) = '.000000' THEN substr({col}, 1, 19) ELSE {col} END, ' ', 'T')"
+
+
+def _card_values(p: str) -> str:
+    """SELECT list building a card from the articles row aliased `p` (`new` in triggers).
+
+    Plain SQL only, so any SQLite client can write `articles`; excerpt and
+    byline are left NULL for `fill_card_text` and the ORM hooks.
+    """
+    fallback = f"substr(coalesce({p}.ai_model, ''), 1, 9) = 'fallback:'"
+    return ", ".join([
+        f"{p}.id", f"{p}.location_id", f"{p}.source_name", f"{p}.sort_key",
+        f"coalesce(nullif({p}.ai_title, ''), {p}.source_title)",
+        f"{p}.source_url", f"{p}.image_url",
+        _iso_sql(f"{p}.published_at"), _iso_sql(f"{p}.fetched_at"),
+        f"CASE WHEN {p}.sort_key < {UNDATED_SORT_BELOW} THEN {p}.sort_key + {UNDATED_SORT_OFFSET} ELSE {p}.sort_key END",
+        f"{p}.ai_model",
+        "NULL", "NULL",
+        f"CASE WHEN {fallback} THEN '{REWRITE_NOTE}' END",
+    ])
+
+
+def ensure_cards(conn) -> int:
+    """(Re)create the sync triggers and fill in missing cards. Returns the number added.
+
+    Like the FTS triggers, these keep `article_cards` in step with every
+    insert, update and delete on `articles`, whichever code path makes it.
+    Triggers are recreated on every start so definition changes apply. An
+    update keeps the stored excerpt and byline unless the columns they are
+    computed from changed.
+    """
+    cols = ", ".join(CARD_COLUMNS)
+    keep_text = " AND ".join(f"new.{c} IS old.{c}" for c in TEXT_SOURCES)
+    refresh = ", ".join(f"{c} = excluded.{c}" for c in CARD_COLUMNS if c != "id" and c not in TEXT_COLUMNS)
+    conn.execute(text(f"DROP TRIGGER IF EXISTS {CARDS_TABLE}_ai"))
+    conn.execute(text(f"DROP TRIGGER IF EXISTS {CARDS_TABLE}_au"))
+    conn.execute(text(f"DROP TRIGGER IF EXISTS {CARDS_TABLE}_ad"))
+    conn.execute(text(
+        f"CREATE TRIGGER {CARDS_TABLE}_ai AFTER INSERT ON articles BEGIN "
+        f"INSERT OR REPLACE INTO {CARDS_TABLE} ({cols}) SELECT {_card_values('new')}; END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER {CARDS_TABLE}_au AFTER UPDATE OF {', '.join(SOURCE_COLUMNS)} ON articles BEGIN "
+        f"INSERT INTO {CARDS_TABLE} ({cols}) SELECT {_card_values('new')} WHERE true "
+        f"ON CONFLICT (id) DO UPDATE SET {refresh}, "
+        f"excerpt = CASE WHEN new.ai_body IS old.ai_body THEN excerpt END, "
+        f"byline = CASE WHEN {keep_text} THEN byline END; END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER {CARDS_TABLE}_ad AFTER DELETE ON articles BEGIN "
+        f"DELETE FROM {CARDS_TABLE} WHERE id = old.id; END"
+    ))
+    conn.execute(text(f"DELETE FROM {CARDS_TABLE} WHERE id NOT IN (SELECT id FROM articles)"))
+    added = conn.execute(text(
+        f"INSERT INTO {CARDS_TABLE} ({cols}) SELECT {_card_values('a')} FROM articles a "
+        f"WHERE NOT EXISTS (SELECT 1 FROM {CARDS_TABLE} c WHERE c.id = a.id)"
+    )).rowcount
+    filled = fill_card_text(conn)
+    if added or filled:
+        logger.info("cards_backfilled", extra={"articles": added, "text_filled": filled})
+    return added
+
+
+def rebuild_cards(conn=None) -> int:
+    """Rewrite every card from `articles` (e.g. after changing ARTICLE_EXCERPT_CHARS)."""
+    def _run(c) -> int:
+        c.execute(text(f"DELETE FROM {CARDS_TABLE}"))
+        return ensure_cards(c)
+
+    if conn is not None:
+        n = _run(conn)
+    else:
+        with engine.begin() as c:
+            n = _run(c)
+    logger.info("cards_rebuilt", extra={"articles": n})
+    return n
+
+
+def _main(argv: List[str]) -> int:
+    import argparse
+    from .database import init_db
+
+    ap = argparse.ArgumentParser(prog="python -m app.cards", description="Article card projection tools")
+    ap.add_argument("command", choices=["rebuild"], help="rebuild: rewrite every card from the articles table")
+    args = ap.parse_args(argv)
+    if args.command == "rebuild":
+        init_db()
+        n = rebuild_cards()
+        print(f"rebuilt {n} cards")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
@@ -0,0 +1,388 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+import logging
+
+from sqlalchemy import text
+
+from .database import DB_PATH, engine
+
+logger = logging.getLogger("app.cluster")
+
+LEASE_NAME = "scheduler"
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.1, float(os.environ.get(name, str(default))))
+    except Exception:
+        return default
+
+
+def election_enabled() -> bool:
+    """LEADER_ELECTION=1/0 forces it; 'auto' (default) turns it on when uvicorn runs several workers."""
+    mode = (os.environ.get("LEADER_ELECTION", "auto") or "auto").strip().lower()
+    if mode in ("1", "true", "yes", "on"):
+        return True
+    if mode in ("0", "false", "no", "off"):
+        return False
+    try:
+        return int(os.environ.get("WEB_CONCURRENCY", "1")) > 1
+    except ValueError:
+        return False
+
+
+@contextlib.contextmanager
+def startup_lock() -> Iterator[None]:
+    """Serialize startup work (migrations) across worker processes on this host."""
+    try:
+        import fcntl
+    except ImportError:  # not POSIX; single-process deployments only
+        yield
+        return
+    with open(DB_PATH + ".startup.lock", "w") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+class Cluster:
+    """Leader election and state sharing between uvicorn worker processes.
+
+    Workers compete for an SQLite lease row; the holder renews it every
+    LEADER_HEARTBEAT_S and is the only one that runs the scheduler and harvest
+    jobs. Other workers take over once the lease has been unrenewed for
+    LEADER_LEASE_TTL_S.
+
+    Workers also share a small event log. Each worker appends its own stream
+    events (`bus`) and control messages (`ctl`, e.g. "run a harvest", "drop
+    cached settings"), and tails everyone else's, so SSE clients on any worker
+    see every event. The leader also writes status/job snapshots to
+    `cluster_state` for followers to serve.
+
+    With election disabled (single worker, the default) this process is the
+    leader and nothing touches the database.
+    """
+
+    def __init__(self) -> None:
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._leader = False
+        self._renewed_at = 0.0  # monotonic time of the last successful renewal attempt start
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._on_elected: Optional[Callable[[], None]] = None
+        self._on_demoted: Optional[Callable[[], None]] = None
+        self._handlers: Dict[str, Tuple[Callable[[Dict[str, Any]], None], bool]] = {}
+        self._providers: Dict[str, Callable[[], Any]] = {}
+        self._outbox: Deque[Tuple[str, str, Dict[str, Any]]] = deque(maxlen=1000)
+        self._last_event_id = 0
+        self._shared: Dict[str, Any] = {}
+        self._shared_since = 0.0
+
+    # --- settings ---
+
+    @staticmethod
+    def lease_ttl_s() -> float:
+        return _env_float("LEADER_LEASE_TTL_S", 15.0)
+
+    @staticmethod
+    def heartbeat_s() -> float:
+        return _env_float("LEADER_HEARTBEAT_S", 5.0)
+
+    @staticmethod
+    def poll_s() -> float:
+        return _env_float("CLUSTER_POLL_S", 1.0)
+
+    # --- public API ---
+
+    def is_leader(self) -> bool:
+        with self._lock:
+            return self._leader
+
+    def on(self, type_: str, handler: Callable[[Dict[str, Any]], None], leader_only: bool = False) -> None:
+        """Handle control messages of `type_` sent by other workers."""
+        self._handlers[type_] = (handler, leader_only)
+
+    def provide(self, key: str, fn: Callable[[], Any]) -> None:
+        """Snapshot the leader publishes under `key` for followers (see `shared`)."""
+        self._providers[key] = fn
+
+    def shared(self, key: str) -> Any:
+        """Latest snapshot the leader published under `key`, or None."""
+        with self._lock:
+            return self._shared.get(key)
+
+    def broadcast(self, type_: str, data: Optional[Dict[str, Any]] = None) -> None:
+        """Send a control message to the other workers (no-op without election)."""
+        if self.enabled:
+            self._outbox.append(("ctl", type_, data or {}))
+
+    def mirror(self, event: Dict[str, Any]) -> None:
+        """EventBus tap: forward a locally published stream event to the other workers."""
+        if self.enabled:
+            item = ("bus", event.get("type") or "", event.get("data") or {})
+            # Progress events are full snapshots; keep only the newest of a burst
+            try:
+                if item[1] == "progress" and self._outbox[-1][:2] == ("bus", "progress"):
+                    self._outbox[-1] = item
+                    return
+            except IndexError:  # empty, or drained by the flush meanwhile
+                pass
+            self._outbox.append(item)
+
+    def request(self, type_: str, data: Optional[Dict[str, Any]] = None, timeout_s: float = 5.0) -> Optional[Dict[str, Any]]:
+        """Ask the leader to run a command and wait for its reply (None on timeout)."""
+        rid = uuid.uuid4().hex[:12]
+        self._write_events([("ctl", type_, {**(data or {}), "request_id": rid})])
+        deadline = time.monotonic() + timeout_s
+        while time.monotonic() < deadline:
+            with engine.connect() as conn:
+                row = conn.execute(text("SELECT data FROM cluster_state WHERE key = :k"), {"k": f"cmd:{rid}"}).first()
+            if row is not None:
+                return json.loads(row[0]) if row[0] else {}
+            time.sleep(0.1)
+        logger.warning("cluster_request_timeout", extra={"type": type_, "request_id": rid})
+        return None
+
+    def reply(self, request: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """Answer a `request` from a control handler on the leader."""
+        rid = request.get("request_id")
+        if rid:
+            self._put_state({f"cmd:{rid}": result})
+
+    def start(self, on_elected: Callable[[], None], on_demoted: Callable[[], None]) -> None:
+        self._on_elected = on_elected
+        self._on_demoted = on_demoted
+        self.enabled = election_enabled()
+        if not self.enabled:
+            with self._lock:
+                self._leader = True
+            on_elected()
+            return
+        with engine.connect() as conn:
+            self._last_event_id = int(conn.execute(text("SELECT COALESCE(MAX(id), 0) FROM cluster_events")).scalar() or 0)
+        logger.info("cluster_started", extra={"worker": self.worker_id})
+        self._heartbeat()
+        if not self.is_leader():
+            self._read_state()
+        self._thread = threading.Thread(target=self._loop, name="cluster", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Release the lease on shutdown so another worker takes over immediately."""
+        if not self.enabled:
+            return
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        try:
+            self._flush()
+            with engine.begin() as conn:
+                conn.execute(
+                    text("UPDATE leader_lease SET expires_at = 0 WHERE name = :n AND holder = :me"),
+                    {"n": LEASE_NAME, "me": self.worker_id},
+                )
+        except Exception:
+            logger.exception("cluster_release_failed")
+        self._set_leader(False)
+
+    def status(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"enabled": self.enabled, "worker": self.worker_id, "leader": self.is_leader()}
+        if self.enabled:
+            try:
+                with engine.connect() as conn:
+                    row = conn.execute(
+                        text("SELECT holder, expires_at, acquired_at FROM leader_lease WHERE name = :n"), {"n": LEASE_NAME}
+                    ).first()
+                if row is not None:
+                    out.update({"holder": row[0], "lease_expires_in_s": round(row[1] - time.time(), 1), "leader_since": row[2]})
+            except Exception:
+                pass
+        return out
+
+    # --- lease ---
+
+    def _try_acquire(self) -> bool:
+        now = time.time()
+        params = {"n": LEASE_NAME, "me": self.worker_id, "now": now, "exp": now + self.lease_ttl_s()}
+        with engine.begin() as conn:
+            res = conn.execute(
+                text(
+                    "UPDATE leader_lease SET holder = :me, expires_at = :exp, "
+                    "acquired_at = CASE WHEN holder = :me THEN acquired_at ELSE :now END "
+                    "WHERE name = :n AND (holder = :me OR expires_at < :now)"
+                ),
+                params,
+            )
+            if res.rowcount == 0:
+                conn.execute(
+                    text("INSERT OR IGNORE INTO leader_lease (name, holder, expires_at, acquired_at) VALUES (:n, :me, :exp, :now)"),
+                    params,
+                )
+            holder = conn.execute(text("SELECT holder FROM leader_lease WHERE name = :n"), {"n": LEASE_NAME}).scalar()
+        return holder == self.worker_id
+
+    def _set_leader(self, leader: bool) -> bool:
+        with self._lock:
+            changed = leader != self._leader
+            self._leader = leader
+        return changed
+
+    def _heartbeat(self) -> None:
+        attempt = time.monotonic()
+        try:
+            leader = self._try_acquire()
+        except Exception:
+            # Could not reach the lease (e.g. database locked); keep the current
+            # role until the lease would have expired, then step down, since
+            # another worker may already hold it
+            logger.exception("cluster_heartbeat_failed")
+            if not self.is_leader() or attempt - self._renewed_at < self.lease_ttl_s():
+                return
+            leader = False
+        else:
+            if leader:
+                self._renewed_at = attempt
+        if not self._set_leader(leader):
+            return
+        if leader:
+            logger.info("cluster_elected", extra={"worker": self.worker_id})
+            if self._on_elected:
+                try:
+                    self._on_elected()
+                except Exception:
+                    logger.exception("cluster_on_elected_failed")
+        else:
+            logger.warning("cluster_demoted", extra={"worker": self.worker_id})
+            if self._on_demoted:
+                try:
+                    self._on_demoted()
+                except Exception:
+                    logger.exception("cluster_on_demoted_failed")
+
+    # --- event log and shared state ---
+
+    def _write_events(self, items: List[Tuple[str, str, Dict[str, Any]]]) -> None:
+        now = time.time()
+        rows = [
+            {"o": self.worker_id, "k": kind, "t": type_, "d": json.dumps(data, default=str), "c": now}
+            for kind, type_, data in items
+        ]
+        with engine.begin() as conn:
+            conn.execute(
+                text("INSERT INTO cluster_events (origin, kind, type, data, created_at) VALUES (:o, :k, :t, :d, :c)"),
+                rows,
+            )
+
+    def _flush(self) -> bool:
+        items: List[Tuple[str, str, Dict[str, Any]]] = []
+        while self._outbox:
+            items.append(self._outbox.popleft())
+        if not items:
+            return False
+        # Only the latest progress snapshot and data-changed notice matter
+        for kind in (("bus", "progress"), ("ctl", "data_changed")):
+            last = max((i for i, it in enumerate(items) if it[:2] == kind), default=None)
+            items = [it for i, it in enumerate(items) if it[:2] != kind or i == last]
+        self._write_events(items)
+        return True
+
+    def _put_state(self, values: Dict[str, Any]) -> None:
+        now = time.time()
+        with engine.begin() as conn:
+            conn.execute(
+                text("INSERT OR REPLACE INTO cluster_state (key, data, updated_at) VALUES (:k, :d, :u)"),
+                [{"k": k, "d": json.dumps(v, default=str), "u": now} for k, v in values.items()],
+            )
+
+    def _publish_state(self) -> None:
+        values: Dict[str, Any] = {}
+        for key, fn in self._providers.items():
+            try:
+                values[key] = fn()
+            except Exception:
+                logger.exception("cluster_provider_failed", extra={"key": key})
+        if values:
+            self._put_state(values)
+
+    def _read_state(self) -> None:
+        with engine.connect() as conn:
+            rows = conn.execute(
+                text("SELECT key, data, updated_at FROM cluster_state WHERE updated_at > :s AND key NOT LIKE 'cmd:%'"),
+                {"s": self._shared_since},
+            ).all()
+        if not rows:
+            return
+        with self._lock:
+            for key, data, updated in rows:
+                self._shared[key] = json.loads(data) if data else None
+                self._shared_since = max(self._shared_since, updated)
+
+    def _tail(self) -> None:
+        from .events import bus
+
+        with engine.connect() as conn:
+            rows = conn.execute(
+                text("SELECT id, origin, kind, type, data FROM cluster_events WHERE id > :last ORDER BY id LIMIT 500"),
+                {"last": self._last_event_id},
+            ).all()
+        leader = self.is_leader()
+        for eid, origin, kind, type_, data in rows:
+            self._last_event_id = eid
+            if origin == self.worker_id:
+                continue
+            payload = json.loads(data) if data else {}
+            if kind == "bus":
+                bus.publish(type_, payload, mirror=False)
+                continue
+            handler = self._handlers.get(type_)
+            if handler is None or (handler[1] and not leader):
+                continue
+            try:
+                handler[0](payload)
+            except Exception:
+                logger.exception("cluster_handler_failed", extra={"type": type_})
+
+    def _prune(self) -> None:
+        cutoff = time.time() - 300
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM cluster_events WHERE created_at < :c"), {"c": cutoff})
+            conn.execute(text("DELETE FROM cluster_state WHERE key LIKE 'cmd:%' AND updated_at < :c"), {"c": cutoff})
+
+    def _loop(self) -> None:
+        next_beat = time.monotonic() + self.heartbeat_s()
+        next_prune = time.monotonic() + 60
+        while not self._stop.wait(self.poll_s()):
+            try:
+                now = time.monotonic()
+                beat = now >= next_beat
+                if beat:
+                    self._heartbeat()
+                    next_beat = now + self.heartbeat_s()
+                flushed = self._flush()
+                if self.is_leader():
+                    if beat or flushed:
+                        self._publish_state()
+                    if now >= next_prune:
+                        self._prune()
+                        next_prune = now + 60
+                else:
+                    self._read_state()
+                self._tail()
+            except Exception:
+                logger.exception("cluster_loop_failed")
+
+
+cluster = Cluster()
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import gzip
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import logging
+
+try:
+    import brotli  # optional; gzip only without it
+except ImportError:  # pragma: no cover
+    brotli = None
+
+logger = logging.getLogger("app.compression")
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+# Streams are passed through as they are (SSE must flush event by event)
+SKIP_TYPES = ("text/event-stream",)
+
+
+def compression_enabled() -> bool:
+    return os.environ.get("COMPRESSION", "1").lower() not in ("0", "false", "no", "off")
+
+
+def _min_bytes() -> int:
+    try:
+        return max(0, int(os.environ.get("COMPRESS_MIN_BYTES", "1024")))
+    except Exception:
+        return 1024
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Best encoding the client accepts: 'br' (if available), then 'gzip'."""
+    offered: Dict[str, float] = {}
+    for part in (accept_encoding or "").lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            offered[name.strip()] = q
+    for enc in (("br",) if brotli is not None else ()) + ("gzip",):
+        if offered.get(enc, offered.get("*", 0.0)) > 0:
+            return enc
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        # Quality 5 is close to gzip's speed at a clearly better ratio for JSON
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware that gzip/brotli-compresses complete text responses.
+
+    Only single-message bodies of at least COMPRESS_MIN_BYTES with a text or
+    JSON content type are touched; streaming responses and anything already
+    encoded pass through. A strong ETag is sent back weak on the compressed
+    variant (as nginx does), and compressed bytes are kept per (ETag,
+    encoding) so cached API responses are not recompressed on every hit.
+    """
+
+    def __init__(self, app, cache_entries: int = 128) -> None:
+        self.app = app
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[Tuple[bytes, str], bytes]" = OrderedDict()
+        self._cache_entries = cache_entries
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not compression_enabled():
+            await self.app(scope, receive, send)
+            return
+        accept = ""
+        for name, value in scope.get("headers") or ():
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = choose_encoding(accept)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[dict] = None
+        passthrough = False
+
+        async def _send(message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+            body = message.get("body", b"")
+            if message.get("more_body", False) or not self._compressible(start, body):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+            await self._send_compressed(send, start, body, encoding)
+
+        await self.app(scope, receive, _send)
+
+    def _compressible(self, start: dict, body: bytes) -> bool:
+        if start.get("status", 200) in (204, 206, 304) or len(body) < _min_bytes():
+            return False
+        ctype = b""
+        for name, value in start.get("headers") or ():
+            if name == b"content-encoding":
+                return False
+            if name == b"content-type":
+                ctype = value
+        ctype_s = ctype.decode("latin-1").lower()
+        if any(ctype_s.startswith(t) for t in SKIP_TYPES):
+            return False
+        return any(ctype_s.startswith(t) for t in COMPRESSIBLE_TYPES)
+
+    async def _send_compressed(self, send, start: dict, body: bytes, encoding: str) -> None:
+        headers: List[Tuple[bytes, bytes]] = []
+        etag: Optional[bytes] = None
+        vary: List[bytes] = []
+        for name, value in start.get("headers") or ():
+            if name == b"content-length":
+                continue
+            if name == b"etag":
+                etag = value
+                continue
+            if name == b"vary":
+                vary.append(value)
+                continue
+            headers.append((name, value))
+
+        data = self._cached(etag, encoding) if etag and not etag.startswith(b"W/") else None
+        if data is None:
+            data = compress(body, encoding)
+            if etag and not etag.startswith(b"W/"):
+                self._store(etag, encoding, data)
+        if etag is not None:
+            headers.append((b"etag", etag if etag.startswith(b"W/") else b"W/" + etag))
+        if not any(b"accept-encoding" in v.lower() for v in vary):
+            vary.append(b"Accept-Encoding")
+        headers.append((b"vary", b", ".join(vary)))
+        headers.append((b"content-encoding", encoding.encode()))
+        headers.append((b"content-length", str(len(data)).encode()))
+        await send({**start, "headers": headers})
+        await send({"type": "http.response.body", "body": data})
+
+    def _cached(self, etag: bytes, encoding: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._cache.get((etag, encoding))
+            if data is not None:
+                self._cache.move_to_end((etag, encoding))
+            return data
+
+    def _store(self, etag: bytes, encoding: str, data: bytes) -> None:
+        with self._lock:
+            self._cache[(etag, encoding)] = data
+            while len(self._cache) > self._cache_entries:
+                self._cache.popitem(last=False)
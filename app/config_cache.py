@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+import logging
+
+from .database import SessionLocal
+from .models import AppConfig, AppSettings, TTSSettings
+
+logger = logging.getLogger("app.config_cache")
+
+
+@dataclass(frozen=True)
+class LocationConfig:
+    """Immutable snapshot of an `AppConfig` row; safe to share across threads."""
+
+    id: int
+    location_name: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    timezone: Optional[str] = None
+    source: Optional[str] = None
+    resolved_at: Optional[datetime] = None
+    feed_urls: Optional[str] = None
+    enabled: Optional[bool] = True
+
+    @classmethod
+    def from_row(cls, row: AppConfig) -> "LocationConfig":
+        return cls(
+            id=row.id,
+            location_name=row.location_name,
+            latitude=row.latitude,
+            longitude=row.longitude,
+            timezone=row.timezone,
+            source=row.source,
+            resolved_at=row.resolved_at,
+            feed_urls=row.feed_urls,
+            enabled=row.enabled,
+        )
+
+
+@dataclass(frozen=True)
+class AISettings:
+    """Snapshot of `AppSettings` (id=1). Fields hold the saved values; None when unset."""
+
+    ollama_base_url: Optional[str] = None
+    ollama_model: Optional[str] = None
+    temp_unit: Optional[str] = None
+    wind_speed_unit: Optional[str] = None
+
+    @property
+    def base_url(self) -> Optional[str]:
+        return self.ollama_base_url or os.environ.get("OLLAMA_BASE_URL")
+
+    @property
+    def model(self) -> Optional[str]:
+        return self.ollama_model or os.environ.get("OLLAMA_MODEL")
+
+
+@dataclass(frozen=True)
+class TTSConfig:
+    """Snapshot of `TTSSettings` (id=1)."""
+
+    enabled: bool = False
+    base_url: Optional[str] = None
+    voice: Optional[str] = None
+    speed: Optional[float] = None
+
+
+class ConfigCache:
+    """Process-wide cache of the singleton config rows.
+
+    Each kind is loaded on first use and kept until `invalidate` is called;
+    every code path that writes AppConfig/AppSettings/TTSSettings calls it
+    after committing, so readers never see stale values in this process.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._locations: Optional[Dict[int, LocationConfig]] = None
+        self._ai: Optional[AISettings] = None
+        self._tts: Optional[TTSConfig] = None
+        # Bumped by invalidate; a load that raced with a write is not stored
+        self._gen = 0
+
+    def _load_locations(self) -> Dict[int, LocationConfig]:
+        with self._lock:
+            if self._locations is not None:
+                return self._locations
+            gen = self._gen
+        session = SessionLocal()
+        try:
+            rows = session.query(AppConfig).order_by(AppConfig.id.asc()).all()
+            locs = {r.id: LocationConfig.from_row(r) for r in rows}
+        finally:
+            session.close()
+        with self._lock:
+            if self._gen == gen:
+                self._locations = locs
+        return locs
+
+    def location(self, loc_id: int = 1) -> Optional[LocationConfig]:
+        """Cached location by id. The primary location (id=1) is resolved and persisted if missing."""
+        loc = self._load_locations().get(loc_id)
+        if loc is None and loc_id == 1:
+            from .geo import resolve_location
+            # resolve_location invalidates on insert, so the reload picks the new row up
+            resolve_location()
+            loc = self._load_locations().get(1)
+        return loc
+
+    def locations(self, enabled_only: bool = False) -> List[LocationConfig]:
+        """All cached locations, primary first. NULL `enabled` counts as enabled."""
+        self.location(1)
+        locs = list(self._load_locations().values())
+        if enabled_only:
+            locs = [c for c in locs if c.enabled is None or c.enabled]
+        return locs
+
+    def ai(self) -> AISettings:
+        with self._lock:
+            if self._ai is not None:
+                return self._ai
+            gen = self._gen
+        session = SessionLocal()
+        try:
+            row = session.query(AppSettings).filter_by(id=1).one_or_none()
+            val = AISettings(
+                ollama_base_url=row.ollama_base_url or None,
+                ollama_model=row.ollama_model or None,
+                temp_unit=row.temp_unit or None,
+                wind_speed_unit=row.wind_speed_unit or None,
+            ) if row else AISettings()
+        finally:
+            session.close()
+        with self._lock:
+            if self._gen == gen:
+                self._ai = val
+        return val
+
+    def tts(self) -> TTSConfig:
+        with self._lock:
+            if self._tts is not None:
+                return self._tts
+            gen = self._gen
+        session = SessionLocal()
+        try:
+            row = session.query(TTSSettings).filter_by(id=1).one_or_none()
+            val = TTSConfig(
+                enabled=bool(row.enabled),
+                base_url=row.base_url or None,
+                voice=row.voice or None,
+                speed=row.speed,
+            ) if row else TTSConfig()
+        finally:
+            session.close()
+        with self._lock:
+            if self._gen == gen:
+                self._tts = val
+        return val
+
+    def invalidate(self, *kinds: str, broadcast: bool = True) -> None:
+        """Drop cached values. `kinds` is any of 'locations', 'ai', 'tts'; none means all.
+
+        Other worker processes are told to drop theirs too unless `broadcast`
+        is False (used when applying such a message).
+        """
+        kinds = kinds or ("locations", "ai", "tts")
+        if broadcast:
+            from .cluster import cluster
+            cluster.broadcast("config_invalidate", {"kinds": list(kinds)})
+        with self._lock:
+            self._gen += 1
+            if "locations" in kinds:
+                self._locations = None
+            if "ai" in kinds:
+                self._ai = None
+            if "tts" in kinds:
+                self._tts = None
+        # Locations and units show up in cached API responses
+        from .response_cache import response_cache
+        response_cache.bump("config", broadcast=broadcast)
+        logger.debug("config_invalidated", extra={"kinds": list(kinds)})
+
+
+config_cache = ConfigCache()
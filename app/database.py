@@ -1,15 +1,72 @@
 from __future__ import annotations
 
+import asyncio
+import contextvars
 import os
-from sqlalchemy import create_engine, text
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker, declarative_base
 
+from .timing import install_db_timing
+
 
 DB_PATH = os.environ.get("DB_PATH", "/data/app.db")
 DB_URL = f"sqlite:///{DB_PATH}"
 
-# SQLite needs check_same_thread=False for multithreaded FastAPI + APScheduler
-engine = create_engine(DB_URL, connect_args={"check_same_thread": False})
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, str(default)))
+    except Exception:
+        return default
+
+
+def sqlite_profile() -> dict:
+    """PRAGMAs applied to every new connection (env-tunable).
+
+    WAL lets API readers proceed while the scheduler writes; NORMAL
+    synchronous is durable across app crashes in WAL mode and avoids an
+    fsync per commit. Set SQLITE_PRAGMAS=0 to connect with SQLite defaults.
+    """
+    return {
+        # Only takes effect on a new database; `python -m app.maintenance convert-vacuum` converts old ones
+        "auto_vacuum": os.environ.get("SQLITE_AUTO_VACUUM", "INCREMENTAL"),
+        "journal_mode": os.environ.get("SQLITE_JOURNAL_MODE", "WAL"),
+        "synchronous": os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+        "busy_timeout": _env_int("SQLITE_BUSY_TIMEOUT_MS", 5000),
+        # Negative cache_size is in KiB
+        "cache_size": -abs(_env_int("SQLITE_CACHE_SIZE_KB", 20000)),
+        "mmap_size": _env_int("SQLITE_MMAP_SIZE_MB", 128) * 1024 * 1024,
+        "temp_store": os.environ.get("SQLITE_TEMP_STORE", "MEMORY"),
+    }
+
+
+# SQLite needs check_same_thread=False for multithreaded FastAPI + APScheduler.
+# The pool is sized for the API threadpool plus harvest/refresh threads.
+engine = create_engine(
+    DB_URL,
+    connect_args={"check_same_thread": False, "timeout": max(0, _env_int("SQLITE_BUSY_TIMEOUT_MS", 5000)) / 1000.0},
+    pool_size=_env_int("DB_POOL_SIZE", 10),
+    max_overflow=_env_int("DB_MAX_OVERFLOW", 20),
+    pool_timeout=_env_int("DB_POOL_TIMEOUT_S", 30),
+)
+
+
+@event.listens_for(engine, "connect")
+def _apply_sqlite_profile(dbapi_conn, _record) -> None:
+    if os.environ.get("SQLITE_PRAGMAS", "1").lower() in ("0", "false", "no", "off"):
+        return
+    cur = dbapi_conn.cursor()
+    try:
+        for name, value in sqlite_profile().items():
+            cur.execute(f"PRAGMA {name}={value}")
+    finally:
+        cur.close()
+
+
+install_db_timing(engine)
+
 # Keep attributes available after commit so detached objects can be used safely
 # across background tasks without triggering refreshes on closed sessions.
 SessionLocal = sessionmaker(
@@ -21,14 +78,155 @@ SessionLocal = sessionmaker(
 Base = declarative_base()
 
 
+def async_reads_enabled() -> bool:
+    return os.environ.get("ASYNC_DB", "0").lower() in ("1", "true", "yes", "on")
+
+
+_async_sessions = None
+_async_checked = False
+
+
+def _async_session_factory():
+    """async_sessionmaker over aiosqlite, or None when disabled or not installed."""
+    global _async_sessions, _async_checked
+    if _async_checked:
+        return _async_sessions
+    _async_checked = True
+    if not async_reads_enabled():
+        return None
+    try:
+        import aiosqlite  # noqa: F401
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+        from sqlalchemy.pool import AsyncAdaptedQueuePool
+    except ImportError:
+        return None
+    # Pool explicitly: older SQLAlchemy releases default aiosqlite files to NullPool
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{DB_PATH}",
+        poolclass=AsyncAdaptedQueuePool,
+        connect_args={"timeout": max(0, _env_int("SQLITE_BUSY_TIMEOUT_MS", 5000)) / 1000.0},
+        pool_size=_env_int("ASYNC_DB_POOL_SIZE", 10),
+        max_overflow=_env_int("DB_MAX_OVERFLOW", 20),
+        pool_timeout=_env_int("DB_POOL_TIMEOUT_S", 30),
+    )
+    event.listen(async_engine.sync_engine, "connect", _apply_sqlite_profile)
+    install_db_timing(async_engine.sync_engine)
+    _async_sessions = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    return _async_sessions
+
+
+def _run_with_session(fn):
+    session = SessionLocal()
+    try:
+        return fn(session)
+    finally:
+        session.close()
+
+
+_read_pool: ThreadPoolExecutor | None = None
+_read_pool_lock = threading.Lock()
+
+
+def _read_executor() -> ThreadPoolExecutor:
+    global _read_pool
+    with _read_pool_lock:
+        if _read_pool is None:
+            _read_pool = ThreadPoolExecutor(max_workers=_env_int("DB_READ_THREADS", 8), thread_name_prefix="db-read")
+        return _read_pool
+
+
+async def run_read(fn):
+    """Run `fn(session)` for a read-only request handler and return its result.
+
+    By default `fn` runs on a small thread pool of its own (DB_READ_THREADS),
+    so neither its queries nor its Python post-processing run on the event
+    loop, and slow chat/TTS calls holding Starlette's threadpool cannot
+    starve list and weather reads.
+
+    ASYNC_DB=1 uses an aiosqlite session instead. SQLAlchemy then runs `fn`
+    in a greenlet on the event-loop thread: only the SQLite wait leaves the
+    loop, while row handling, serialization and config_cache misses (sync
+    engine) block it. `fn` gets an ordinary Session either way, so query
+    code is shared with the sync paths. It must return plain data, not ORM
+    objects.
+    """
+    factory = _async_session_factory()
+    if factory is None:
+        ctx = contextvars.copy_context()  # request timing spans follow the work into the thread
+        return await asyncio.get_running_loop().run_in_executor(_read_executor(), ctx.run, _run_with_session, fn)
+    async with factory() as session:
+        return await session.run_sync(fn)
+
+
+def _add_column_if_missing(conn, table: str, column: str, ddl: str) -> bool:
+    result = conn.execute(text(f"PRAGMA table_info({table})"))
+    columns = [row[1] for row in result]
+    if column in columns:
+        return False
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+    return True
+
+
+def _backfill_sort_keys(conn, batch: int = 1000) -> int:
+    """Fill articles.sort_key where it is missing (new column, or rows written outside the ORM)."""
+    from .models import Article, article_sort_key
+
+    t = Article.__table__
+    last_id = 0
+    updated = 0
+    while True:
+        rows = conn.execute(
+            t.select().with_only_columns(t.c.id, t.c.published_at, t.c.fetched_at)
+            .where(t.c.sort_key.is_(None), t.c.id > last_id)
+            .order_by(t.c.id)
+            .limit(batch)
+        ).all()
+        if not rows:
+            return updated
+        params = [
+            {"rid": r.id, "sk": article_sort_key(r.published_at, r.fetched_at)}
+            for r in rows
+        ]
+        conn.execute(text("UPDATE articles SET sort_key = :sk WHERE id = :rid"), params)
+        updated += len(rows)
+        last_id = rows[-1].id
+
+
 def init_db():
     from . import models  # noqa: F401 - ensure models are imported
     Base.metadata.create_all(bind=engine)
-    # Migration: Add wind_speed_unit column if it doesn't exist
     with engine.connect() as conn:
-        # Check if column exists by inspecting table info
-        result = conn.execute(text("PRAGMA table_info(app_settings)"))
-        columns = [row[1] for row in result]
-        if "wind_speed_unit" not in columns:
-            conn.execute(text("ALTER TABLE app_settings ADD COLUMN wind_speed_unit VARCHAR(10)"))
-            conn.commit()
+        # Migration: Add wind_speed_unit column if it doesn't exist
+        _add_column_if_missing(conn, "app_settings", "wind_speed_unit", "VARCHAR(10)")
+        # Migration: multi-location support. Existing rows belong to the primary location (id=1).
+        _add_column_if_missing(conn, "app_config", "feed_urls", "TEXT")
+        _add_column_if_missing(conn, "app_config", "enabled", "BOOLEAN")
+        if _add_column_if_missing(conn, "articles", "location_id", "INTEGER"):
+            conn.execute(text("UPDATE articles SET location_id = 1 WHERE location_id IS NULL"))
+        if _add_column_if_missing(conn, "weather_reports", "location_id", "INTEGER"):
+            conn.execute(text("UPDATE weather_reports SET location_id = 1 WHERE location_id IS NULL"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_articles_location_id ON articles (location_id)"))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_weather_reports_location_fetched ON weather_reports (location_id, fetched_at)"
+        ))
+        # Migration: materialized feed sort key, superseding ix_articles_pub_fetched_id
+        _add_column_if_missing(conn, "articles", "sort_key", "BIGINT")
+        _backfill_sort_keys(conn)
+        conn.execute(text("DROP INDEX IF EXISTS ix_articles_pub_fetched_id"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_articles_sort_key_id ON articles (sort_key, id)"))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_articles_location_sort_key ON articles (location_id, sort_key, id)"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_articles_source_sort_key ON articles (source_name, sort_key, id)"
+        ))
+        # Full-text search index (FTS5) plus sync triggers; backfilled on first creation
+        from .search import ensure_fts_index
+        ensure_fts_index(conn)
+        # List projection (article_cards) plus sync triggers; missing cards filled in
+        from .cards import ensure_cards
+        ensure_cards(conn)
+        # Per-source summary (counts, latest, extraction rate) plus sync triggers
+        from .sources import ensure_sources
+        ensure_sources(conn)
+        conn.commit()
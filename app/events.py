@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import threading
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+import logging
+
+logger = logging.getLogger("app.events")
+
+
+class _Subscriber:
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int) -> None:
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    def offer(self, event: Dict[str, Any]) -> None:
+        # Runs on the subscriber's loop; drop the oldest event if the client is slow
+        if self.queue.full():
+            try:
+                self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+        self.queue.put_nowait(event)
+
+
+class EventBus:
+    """Fan-out of server events (progress, new articles, weather) to stream clients.
+
+    `publish` may be called from any thread (scheduler, job and refresh
+    threads); delivery hops onto each subscriber's event loop.
+    """
+
+    def __init__(self, queue_size: int = 100) -> None:
+        self._lock = threading.Lock()
+        self._subs: Dict[int, _Subscriber] = {}
+        self._ids = itertools.count(1)
+        self._seq = itertools.count(1)
+        self._queue_size = queue_size
+        self._taps: List[Callable[[Dict[str, Any]], None]] = []
+
+    def add_tap(self, fn: Callable[[Dict[str, Any]], None]) -> None:
+        """Also hand every locally published event to `fn` (e.g. to relay it to other workers)."""
+        self._taps.append(fn)
+
+    def publish(self, type_: str, data: Optional[Dict[str, Any]] = None, mirror: bool = True) -> None:
+        """Deliver an event to subscribers. `mirror=False` skips the taps (events relayed from elsewhere)."""
+        event = {"id": next(self._seq), "type": type_, "time": datetime.utcnow().isoformat(), "data": data or {}}
+        if mirror:
+            for tap in self._taps:
+                try:
+                    tap(event)
+                except Exception:
+                    logger.exception("events:tap_failed")
+        with self._lock:
+            subs = list(self._subs.values())
+        for sub in subs:
+            try:
+                sub.loop.call_soon_threadsafe(sub.offer, event)
+            except RuntimeError:
+                # Loop already closed; the subscriber is cleaned up on its side
+                pass
+
+    def subscribe(self) -> tuple[int, _Subscriber]:
+        sub = _Subscriber(asyncio.get_running_loop(), self._queue_size)
+        with self._lock:
+            sid = next(self._ids)
+            self._subs[sid] = sub
+        return sid, sub
+
+    def unsubscribe(self, sid: int) -> None:
+        with self._lock:
+            self._subs.pop(sid, None)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subs)
+
+
+bus = EventBus()
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    payload = json.dumps(event.get("data") or {}, default=str)
+    return f"id: {event.get('id')}\nevent: {event.get('type')}\ndata: {payload}\n\n"
+
+
+async def sse_stream(request, initial: Optional[Dict[str, Dict[str, Any]]] = None, heartbeat_s: float = 15.0) -> AsyncIterator[str]:
+    """Yield SSE frames for one client until it disconnects.
+
+    `initial` maps event types to payloads sent right after connecting so the
+    client does not need a separate fetch to get current state.
+    """
+    sid, sub = bus.subscribe()
+    logger.info("events:subscribe", extra={"subscribers": bus.subscriber_count()})
+    try:
+        yield "retry: 5000\n\n"
+        for type_, data in (initial or {}).items():
+            yield format_sse({"id": 0, "type": type_, "data": data})
+        while True:
+            if await request.is_disconnected():
+                break
+            try:
+                event = await asyncio.wait_for(sub.queue.get(), timeout=heartbeat_s)
+            except asyncio.TimeoutError:
+                # Comment frame keeps proxies from closing an idle stream
+                yield ": keepalive\n\n"
+                continue
+            yield format_sse(event)
+    finally:
+        bus.unsubscribe(sid)
+        logger.info("events:unsubscribe", extra={"subscribers": bus.subscriber_count()})
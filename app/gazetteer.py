@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import bisect
+import gzip
+import os
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+import logging
+
+logger = logging.getLogger("app.gazetteer")
+
+# GeoNames "cities" dumps (cities500/1000/5000/15000.txt) are tab-separated
+# with these columns; see https://download.geonames.org/export/dump/readme.txt
+_COL_NAME = 1
+_COL_ASCII = 2
+_COL_ALT = 3
+_COL_LAT = 4
+_COL_LON = 5
+_COL_COUNTRY = 8
+_COL_ADMIN1 = 10
+_COL_POP = 14
+_COL_TZ = 17
+
+_FUZZY_MIN_SCORE = 0.5
+
+
+def _default_path() -> str:
+    return os.environ.get("GAZETTEER_PATH", "/data/gazetteer/cities15000.txt")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = re.sub(r"[^a-z0-9]+", " ", text.lower())
+    return " ".join(text.split())
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _open(path: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+class Gazetteer:
+    """In-memory place index built from a GeoNames-style dump.
+
+    Names (including ASCII and alternate names) map to places. Exact lookups
+    use a dict and misspelled names fall back to a trigram index scored by
+    Jaccard similarity. A sorted name list serves prefix search for
+    autocomplete only. A ", State/Country" hint must match the chosen place;
+    among matches the most populous wins.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path or _default_path()
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._places: List[Dict[str, Any]] = []
+        self._by_name: Dict[str, List[int]] = {}
+        self._names: List[str] = []
+        self._trigrams: Dict[str, List[str]] = {}
+        self._gram_count: Dict[str, int] = {}
+        self._admin1_named = False  # admin1CodesASCII.txt was found, so full state names can be matched
+
+    @property
+    def available(self) -> bool:
+        self._ensure_loaded()
+        return bool(self._places)
+
+    def _admin1_names(self) -> Dict[str, str]:
+        # admin1CodesASCII.txt lines look like "US.NY\tNew York\tNew York\t5128638"
+        path = os.environ.get("GAZETTEER_ADMIN1_PATH") or os.path.join(os.path.dirname(self.path), "admin1CodesASCII.txt")
+        out: Dict[str, str] = {}
+        if not os.path.exists(path):
+            return out
+        try:
+            with _open(path) as fh:
+                for line in fh:
+                    cols = line.rstrip("\n").split("\t")
+                    if len(cols) >= 2:
+                        out[cols[0]] = cols[1]
+        except Exception:
+            logger.exception("gazetteer_admin1_failed", extra={"path": path})
+        return out
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            try:
+                self._load()
+            except Exception:
+                logger.exception("gazetteer_load_failed", extra={"path": self.path})
+            self._loaded = True
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            logger.info("gazetteer_missing", extra={"path": self.path})
+            return
+        admin1 = self._admin1_names()
+        self._admin1_named = bool(admin1)
+        by_name: Dict[str, List[int]] = defaultdict(list)
+        with _open(self.path) as fh:
+            for line in fh:
+                cols = line.rstrip("\n").split("\t")
+                if len(cols) <= _COL_TZ:
+                    continue
+                try:
+                    lat = float(cols[_COL_LAT])
+                    lon = float(cols[_COL_LON])
+                    pop = int(cols[_COL_POP] or 0)
+                except ValueError:
+                    continue
+                country = cols[_COL_COUNTRY]
+                admin_code = cols[_COL_ADMIN1]
+                place = {
+                    "name": cols[_COL_NAME],
+                    "admin1": admin1.get(f"{country}.{admin_code}") or admin_code,
+                    "admin1_code": admin_code,
+                    "country_code": country,
+                    "latitude": lat,
+                    "longitude": lon,
+                    "timezone": cols[_COL_TZ] or None,
+                    "population": pop,
+                }
+                idx = len(self._places)
+                self._places.append(place)
+                names = {normalize(cols[_COL_NAME]), normalize(cols[_COL_ASCII])}
+                names.update(normalize(a) for a in cols[_COL_ALT].split(",") if a)
+                for n in names:
+                    if n:
+                        by_name[n].append(idx)
+
+        tri: Dict[str, List[str]] = defaultdict(list)
+        gram_count: Dict[str, int] = {}
+        for n in by_name:
+            grams = _trigrams(n)
+            gram_count[n] = len(grams)
+            for t in grams:
+                tri[t].append(n)
+        self._by_name = dict(by_name)
+        self._names = sorted(by_name)
+        self._trigrams = dict(tri)
+        self._gram_count = gram_count
+        logger.info("gazetteer_loaded", extra={"places": len(self._places), "names": len(self._names)})
+
+    def _matches_hint(self, p: Dict[str, Any], admin_hint: str) -> bool:
+        # Without the admin1 names file `admin1` is only the code, so a full
+        # state name ("Illinois") cannot be checked and does not match
+        return admin_hint in (normalize(p["admin1"] or ""), normalize(p["admin1_code"] or ""), normalize(p["country_code"] or ""))
+
+    def _pick(self, indices: List[int], admin_hint: str) -> Optional[Dict[str, Any]]:
+        """Most populous of `indices`, restricted to places matching `admin_hint`.
+
+        None when a hint is given and no candidate matches it, so the caller
+        asks the network instead of settling for a namesake elsewhere.
+        """
+        if admin_hint:
+            indices = [i for i in indices if self._matches_hint(self._places[i], admin_hint)]
+            if not indices:
+                return None
+        return dict(self._places[max(indices, key=lambda i: self._places[i]["population"])])
+
+    def _fuzzy(self, name: str) -> Optional[Tuple[str, float]]:
+        grams = _trigrams(name)
+        counts: Dict[str, int] = defaultdict(int)
+        for g in grams:
+            for cand in self._trigrams.get(g, ()):
+                counts[cand] += 1
+        best: Optional[Tuple[str, float]] = None
+        for cand, shared in counts.items():
+            score = shared / (len(grams) + self._gram_count[cand] - shared)
+            if best is None or score > best[1]:
+                best = (cand, score)
+        if best and best[1] >= _FUZZY_MIN_SCORE:
+            return best
+        return None
+
+    def lookup(self, query: str) -> Optional[Dict[str, Any]]:
+        """Best match for "City" or "City, State/Country", or None.
+
+        Only exact (including alternate) names and close misspellings match;
+        anything else, or a place outside the hinted state/country, returns
+        None so the caller falls back to the network. The result has Open-Meteo geocoder keys (`name`, `admin1`, `latitude`,
+        `longitude`, `timezone`) so callers can use either source.
+        """
+        self._ensure_loaded()
+        if not self._places or not query:
+            return None
+        parts = [p.strip() for p in query.split(",")]
+        name = normalize(parts[0])
+        admin_hint = normalize(parts[1]) if len(parts) > 1 else ""
+        if not name:
+            return None
+        indices = self._by_name.get(name)
+        if indices:
+            return self._pick(indices, admin_hint)
+        fuzzy = self._fuzzy(name)
+        if fuzzy:
+            place = self._pick(self._by_name[fuzzy[0]], admin_hint)
+            if place is not None:
+                place["fuzzy_score"] = round(fuzzy[1], 3)
+            return place
+        return None
+
+    def _prefix_indices(self, prefix: str) -> List[int]:
+        i = bisect.bisect_left(self._names, prefix)
+        seen: Set[int] = set()
+        while i < len(self._names) and self._names[i].startswith(prefix):
+            seen.update(self._by_name[self._names[i]])
+            i += 1
+        return list(seen)
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Places whose name starts with `prefix`, most populous first."""
+        self._ensure_loaded()
+        p = normalize(prefix)
+        if not p or not self._names:
+            return []
+        ranked = sorted(self._prefix_indices(p), key=lambda k: self._places[k]["population"], reverse=True)
+        return [dict(self._places[k]) for k in ranked[: max(1, int(limit))]]
+
+
+gazetteer = Gazetteer()
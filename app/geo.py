@@ -1,13 +1,20 @@
 from __future__ import annotations
 
 import os
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
+import logging
 
 import requests
 
 from .database import SessionLocal
-from .models import AppConfig
+from .models import AppConfig, GeocodeCache
+from . import timing
+from .gazetteer import gazetteer, normalize
+from .config_cache import config_cache, LocationConfig
+
+logger = logging.getLogger("app.geo")
 
 
 def _env_location_override() -> Optional[str]:
@@ -17,8 +24,9 @@ def _env_location_override() -> Optional[str]:
 
 def _ip_api() -> Optional[Dict[str, Any]]:
     try:
-        # ip-api.com free endpoint (HTTP only)
-        r = requests.get("http://ip-api.com/json", timeout=10)
+        # ip-api.com free endpoint (HTTP only). Kept short: this can run during startup.
+        with timing.span("upstream"):
+            r = requests.get("http://ip-api.com/json", timeout=float(os.environ.get("IP_GEOLOCATE_TIMEOUT_S", "5")))
         r.raise_for_status()
         data = r.json()
         if data.get("status") == "success":
@@ -28,19 +36,95 @@ def _ip_api() -> Optional[Dict[str, Any]]:
     return None
 
 
-def _openmeteo_geocode(name: str) -> Optional[Dict[str, Any]]:
-    try:
+def _openmeteo_search(name: str) -> Optional[Dict[str, Any]]:
+    """Open-Meteo geocoder; raises on network errors so they are not cached as misses."""
+    with timing.span("upstream"):
         r = requests.get(
             "https://geocoding-api.open-meteo.com/v1/search",
             params={"name": name, "count": 1, "language": "en", "format": "json"},
             timeout=15,
         )
-        r.raise_for_status()
-        js = r.json()
-        results = js.get("results") or []
-        return results[0] if results else None
+    r.raise_for_status()
+    js = r.json()
+    results = js.get("results") or []
+    return results[0] if results else None
+
+
+_GEOCODE_LOCK = threading.Lock()
+_GEOCODE_MEMO: Dict[str, Dict[str, Any]] = {}
+
+
+def _geocode_miss_ttl() -> timedelta:
+    try:
+        return timedelta(hours=float(os.environ.get("GEOCODE_MISS_TTL_HOURS", "24")))
     except Exception:
+        return timedelta(hours=24)
+
+
+def geocode(name: str) -> Optional[Dict[str, Any]]:
+    """Resolve a place name to `{name, admin1, latitude, longitude, timezone}`.
+
+    Tries, in order: an in-process memo, the `geocode_cache` table, the local
+    gazetteer, then Open-Meteo. Answers are written back to the table;
+    misses are kept for GEOCODE_MISS_TTL_HOURS so an unknown name does not
+    hit the network on every call.
+    """
+    key = normalize(name)[:255]
+    if not key:
         return None
+    with _GEOCODE_LOCK:
+        hit = _GEOCODE_MEMO.get(key)
+    if hit is not None:
+        return dict(hit)
+
+    session = SessionLocal()
+    try:
+        row = session.get(GeocodeCache, key)
+        if row is not None:
+            if row.latitude is not None and row.longitude is not None:
+                result = {
+                    "name": row.name,
+                    "admin1": row.admin1,
+                    "latitude": row.latitude,
+                    "longitude": row.longitude,
+                    "timezone": row.timezone,
+                }
+                with _GEOCODE_LOCK:
+                    _GEOCODE_MEMO[key] = result
+                return dict(result)
+            if row.created_at and datetime.utcnow() - row.created_at < _geocode_miss_ttl():
+                return None
+
+        result = gazetteer.lookup(name)
+        source = "gazetteer"
+        if not result:
+            try:
+                result = _openmeteo_search(name)
+            except Exception:
+                logger.warning("geocode_network_failed", extra={"query": key})
+                return None
+            source = "openmeteo" if result else "miss"
+
+        result = result or {}
+        session.merge(GeocodeCache(
+            query=key,
+            name=result.get("name"),
+            admin1=result.get("admin1"),
+            latitude=result.get("latitude"),
+            longitude=result.get("longitude"),
+            timezone=result.get("timezone"),
+            source=source,
+            created_at=datetime.utcnow(),
+        ))
+        session.commit()
+        logger.info("geocode_resolved", extra={"query": key, "source": source})
+    finally:
+        session.close()
+    if result.get("latitude") is None or result.get("longitude") is None:
+        return None
+    with _GEOCODE_LOCK:
+        _GEOCODE_MEMO[key] = dict(result)
+    return result
 
 
 def resolve_location() -> AppConfig:
@@ -58,7 +142,7 @@ def resolve_location() -> AppConfig:
         # 1) Env override
         env_loc = _env_location_override()
         if env_loc:
-            enriched = _openmeteo_geocode(env_loc)
+            enriched = geocode(env_loc)
             if enriched:
                 state = enriched.get("admin1") or ""
                 loc_name = f"{enriched.get('name')}, {state}".strip().strip(', ')
@@ -88,7 +172,7 @@ def resolve_location() -> AppConfig:
 
         # 3) If we have a name but no coords, try Open‑Meteo to enrich
         if cfg.location_name and (cfg.latitude is None or cfg.longitude is None):
-            enriched = _openmeteo_geocode(cfg.location_name)
+            enriched = geocode(cfg.location_name)
             if enriched:
                 cfg.latitude = enriched.get("latitude")
                 cfg.longitude = enriched.get("longitude")
@@ -107,6 +191,7 @@ def resolve_location() -> AppConfig:
         cfg.resolved_at = datetime.utcnow()
         session.merge(cfg)
         session.commit()
+        config_cache.invalidate("locations")
         try:
             session.refresh(cfg)
         except Exception:
@@ -116,11 +201,12 @@ def resolve_location() -> AppConfig:
         session.close()
 
 
-def location_keywords() -> list[str]:
+def location_keywords(cfg: Optional[AppConfig | LocationConfig] = None) -> list[str]:
     """Produce expanded search seeds from resolved location.
     Uses city/state and broader regional aliases to improve coverage.
+    Defaults to the primary location when `cfg` is not given.
     """
-    cfg = resolve_location()
+    cfg = cfg or config_cache.location()
     base = cfg.location_name or ""
     parts = [p.strip() for p in base.split(",")]
     city = parts[0] if parts else base
@@ -147,12 +233,17 @@ def location_keywords() -> list[str]:
     return [s for s in seeds if s]
 
 
-def set_location(name: str) -> AppConfig:
-    """Set a manual location override and persist to DB using Open‑Meteo geocoding."""
+def set_location(name: str, loc_id: Optional[int] = 1) -> AppConfig:
+    """Set a manual location override and persist to DB using `geocode`.
+    `loc_id=None` adds a new location instead of replacing one.
+    """
     session = SessionLocal()
     try:
-        cfg = session.query(AppConfig).filter_by(id=1).one_or_none() or AppConfig(id=1)
-        enriched = _openmeteo_geocode(name)
+        if loc_id is None:
+            cfg = AppConfig(enabled=True)
+        else:
+            cfg = session.query(AppConfig).filter_by(id=loc_id).one_or_none() or AppConfig(id=loc_id)
+        enriched = geocode(name)
         if enriched:
             state = enriched.get("admin1") or ""
             loc_name = f"{enriched.get('name')}, {state}".strip().strip(', ')
@@ -167,8 +258,9 @@ def set_location(name: str) -> AppConfig:
             cfg.source = "manual"
         from datetime import datetime
         cfg.resolved_at = datetime.utcnow()
-        session.merge(cfg)
+        cfg = session.merge(cfg)
         session.commit()
+        config_cache.invalidate("locations")
         try:
             session.refresh(cfg)
         except Exception:
@@ -178,6 +270,64 @@ def set_location(name: str) -> AppConfig:
         session.close()
 
 
+def list_locations(enabled_only: bool = False) -> list[AppConfig]:
+    """All configured locations, primary (id=1) first. Resolves the primary if missing."""
+    config_cache.location(1)
+    session = SessionLocal()
+    try:
+        q = session.query(AppConfig)
+        if enabled_only:
+            # NULL counts as enabled for rows created before the column existed
+            q = q.filter((AppConfig.enabled.is_(None)) | (AppConfig.enabled.is_(True)))
+        return q.order_by(AppConfig.id.asc()).all()
+    finally:
+        session.close()
+
+
+def get_location(loc_id: int) -> Optional[AppConfig]:
+    session = SessionLocal()
+    try:
+        return session.query(AppConfig).filter_by(id=loc_id).one_or_none()
+    finally:
+        session.close()
+
+
+def update_location(loc_id: int, *, feed_urls: Optional[list[str]] = None, enabled: Optional[bool] = None) -> Optional[AppConfig]:
+    session = SessionLocal()
+    try:
+        cfg = session.query(AppConfig).filter_by(id=loc_id).one_or_none()
+        if not cfg:
+            return None
+        if feed_urls is not None:
+            cfg.feed_urls = ",".join(u.strip() for u in feed_urls if u and u.strip()) or None
+        if enabled is not None:
+            cfg.enabled = bool(enabled)
+        session.commit()
+        config_cache.invalidate("locations")
+        return cfg
+    finally:
+        session.close()
+
+
+def delete_location(loc_id: int) -> bool:
+    """Remove a secondary location. The primary location (id=1) cannot be deleted."""
+    if loc_id == 1:
+        return False
+    session = SessionLocal()
+    try:
+        n = session.query(AppConfig).filter_by(id=loc_id).delete()
+        session.commit()
+        config_cache.invalidate("locations")
+        return n > 0
+    finally:
+        session.close()
+
+
+def location_feed_urls(cfg: AppConfig | LocationConfig) -> list[str]:
+    val = (cfg.feed_urls or "").strip()
+    return [x.strip() for x in val.split(",") if x.strip()] if val else []
+
+
 def auto_set_location() -> AppConfig:
     """Force re-detect server location and persist to DB (overwrites existing)."""
     session = SessionLocal()
@@ -186,7 +336,7 @@ def auto_set_location() -> AppConfig:
         # Prefer env override if present
         env_loc = _env_location_override()
         if env_loc:
-            enriched = _openmeteo_geocode(env_loc)
+            enriched = geocode(env_loc)
             if enriched:
                 state = enriched.get("admin1") or ""
                 loc_name = f"{enriched.get('name')}, {state}".strip().strip(', ')
@@ -213,7 +363,7 @@ def auto_set_location() -> AppConfig:
                 cfg.source = "ip-api"
             # Enrich if needed
             if cfg.location_name and (cfg.latitude is None or cfg.longitude is None):
-                enriched = _openmeteo_geocode(cfg.location_name)
+                enriched = geocode(cfg.location_name)
                 if enriched:
                     cfg.latitude = enriched.get("latitude")
                     cfg.longitude = enriched.get("longitude")
@@ -223,6 +373,7 @@ def auto_set_location() -> AppConfig:
         cfg.resolved_at = datetime.utcnow()
         session.merge(cfg)
         session.commit()
+        config_cache.invalidate("locations")
         return cfg
     finally:
         session.close()
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+import logging
+
+logger = logging.getLogger("app.jobs")
+
+
+def _default_deadline_s() -> Optional[float]:
+    try:
+        val = float(os.environ.get("HARVEST_DEADLINE_S", "0"))
+    except Exception:
+        return None
+    return val if val > 0 else None
+
+
+class HarvestCancelled(Exception):
+    """Raised inside a harvest when its job was cancelled or ran past its deadline."""
+
+
+@dataclass
+class HarvestJob:
+    id: str
+    trigger: str  # 'api', 'cron', 'adaptive', 'startup'
+    status: str = "queued"  # queued, running, succeeded, failed, cancelled, timed_out
+    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    deadline_s: Optional[float] = None
+    error: Optional[str] = None
+    # Phase name -> seconds spent, in the order phases were entered
+    phases: Dict[str, float] = field(default_factory=dict)
+    result: Dict[str, Any] = field(default_factory=dict)
+
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _started_mono: Optional[float] = field(default=None, repr=False)
+    _phase: Optional[str] = field(default=None, repr=False)
+    _phase_started: Optional[float] = field(default=None, repr=False)
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def deadline_passed(self) -> bool:
+        if not self.deadline_s or self._started_mono is None:
+            return False
+        return (time.monotonic() - self._started_mono) > self.deadline_s
+
+    def should_stop(self) -> bool:
+        return self._cancel.is_set() or self.deadline_passed()
+
+    def check(self) -> None:
+        if self._cancel.is_set():
+            raise HarvestCancelled("cancelled")
+        if self.deadline_passed():
+            raise HarvestCancelled(f"deadline exceeded ({self.deadline_s:g}s)")
+
+    def enter_phase(self, name: str) -> None:
+        """Close the running phase (accumulating its duration) and start `name`."""
+        now = time.monotonic()
+        with self._lock:
+            if self._phase is not None and self._phase_started is not None:
+                self.phases[self._phase] = round(self.phases.get(self._phase, 0.0) + (now - self._phase_started), 3)
+            self._phase = name
+            self._phase_started = now if name else None
+
+    def end_phase(self) -> None:
+        self.enter_phase("")
+        with self._lock:
+            self._phase = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            phases = dict(self.phases)
+            current = self._phase
+            if current and self._phase_started is not None:
+                phases[current] = round(phases.get(current, 0.0) + (time.monotonic() - self._phase_started), 3)
+        return {
+            "id": self.id,
+            "trigger": self.trigger,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "deadline_s": self.deadline_s,
+            "cancel_requested": self._cancel.is_set(),
+            "current_phase": current,
+            "phases": phases,
+            "result": dict(self.result),
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """Runs harvests one at a time in a background thread.
+
+    Triggers that arrive while a harvest is queued or running coalesce into
+    that job instead of starting a second one.
+    """
+
+    def __init__(self, history_size: int = 50) -> None:
+        self._lock = threading.Lock()
+        self._current: Optional[HarvestJob] = None
+        self._history: Deque[HarvestJob] = deque(maxlen=history_size)
+
+    def submit(self, trigger: str, deadline_s: Optional[float] = None) -> tuple[HarvestJob, bool]:
+        """Start a harvest job. Returns (job, created); created is False when coalesced."""
+        with self._lock:
+            if self._current is not None and self._current.status in ("queued", "running"):
+                logger.info("job_coalesced", extra={"job_id": self._current.id, "trigger": trigger})
+                return self._current, False
+            job = HarvestJob(
+                id=uuid.uuid4().hex[:12],
+                trigger=trigger,
+                deadline_s=deadline_s if deadline_s and deadline_s > 0 else _default_deadline_s(),
+            )
+            self._current = job
+            self._history.appendleft(job)
+        threading.Thread(target=self._run, args=(job,), name=f"harvest-job-{job.id}", daemon=True).start()
+        logger.info("job_submitted", extra={"job_id": job.id, "trigger": trigger})
+        return job, True
+
+    def _run(self, job: HarvestJob) -> None:
+        from .scheduler import run_harvest_once
+
+        job._started_mono = time.monotonic()
+        job.started_at = datetime.utcnow().isoformat()
+        job.status = "running"
+        try:
+            res = run_harvest_once(job=job)
+            if isinstance(res, dict):
+                job.result.update(res)
+            job.status = "succeeded"
+        except HarvestCancelled as e:
+            job.status = "timed_out" if (job.deadline_passed() and not job._cancel.is_set()) else "cancelled"
+            job.error = str(e)
+            logger.warning("job_stopped", extra={"job_id": job.id, "status": job.status})
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e) or e.__class__.__name__
+            logger.exception("job_failed", extra={"job_id": job.id})
+        finally:
+            job.end_phase()
+            job.finished_at = datetime.utcnow().isoformat()
+            logger.info("job_finished", extra={"job_id": job.id, "status": job.status, "phases": job.phases})
+            # Persist before releasing the slot, so the run is never missing
+            # from both the current job and the run history
+            try:
+                from .runs import record_run
+                record_run(job)
+            except Exception:
+                logger.exception("job_record_failed", extra={"job_id": job.id})
+            with self._lock:
+                if self._current is job:
+                    self._current = None
+
+    def current(self) -> Optional[HarvestJob]:
+        with self._lock:
+            return self._current
+
+    def get(self, job_id: str) -> Optional[HarvestJob]:
+        with self._lock:
+            for job in self._history:
+                if job.id == job_id:
+                    return job
+        return None
+
+    def history(self, limit: int = 20) -> List[Dict[str, Any]]:
+        with self._lock:
+            jobs = list(self._history)[: max(0, int(limit))]
+        return [j.to_dict() for j in jobs]
+
+    def cancel(self, job_id: str) -> Optional[HarvestJob]:
+        job = self.get(job_id)
+        if job is not None and job.status in ("queued", "running"):
+            job.cancel()
+            logger.info("job_cancel_requested", extra={"job_id": job_id})
+        return job
+
+
+jobs = JobManager()
@@ -7,48 +7,40 @@ from typing import List, Optional
 
 from fastapi import FastAPI, Request, UploadFile, File, Form
 from fastapi.responses import HTMLResponse, JSONResponse, FileResponse, Response, StreamingResponse
-from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from starlette.middleware.base import BaseHTTPMiddleware
 import logging
 import time
 
-from .database import init_db, SessionLocal
+from .database import init_db, SessionLocal, run_read
 from sqlalchemy import func, case, or_, and_
-from .models import Article, WeatherReport, AppConfig, AppSettings, TTSSettings, ChatMessage, MobileLog, Bookmark
-from .scheduler import start_scheduler, run_harvest_once, restart_scheduler
+from .models import Article, ArticleCard, WeatherReport, AppConfig, AppSettings, TTSSettings, ChatMessage, MobileLog, Bookmark, ArchivedArticle
+from .models import UNDATED_SORT_BELOW, UNDATED_SORT_OFFSET, epoch_ms
+from .scheduler import start_scheduler, restart_scheduler
+from .jobs import jobs
+from .cluster import cluster, startup_lock as cluster_startup_lock
+from .events import bus
 from . import maintenance
+from . import search
+from . import pagination
+from . import cards
+from . import sources
+from .response_cache import response_cache
+from .compression import CompressionMiddleware
+from .ratelimit import chat_limiter, logs_limiter
+from .timing import TimingMiddleware, metrics as request_metrics
+from .static_files import SiteStatic, SpaIndex
 import threading
-from .geo import resolve_location, set_location, auto_set_location
+from .config_cache import config_cache
+from .geo import resolve_location, set_location, auto_set_location, list_locations, update_location, delete_location, location_feed_urls
 from .progress import progress
 from . import scheduler as scheduler_mod
 from urllib.parse import urlparse, urlunparse
 from .tts import TTSClient, DEFAULT_TTS_BASE
 from .ai import generate_article_comment
-from collections import defaultdict, deque
 import uuid
 import hashlib
 
 MAX_LOG_UPLOAD_BYTES = int(os.getenv("MAX_LOG_UPLOAD_BYTES", str(5 * 1024 * 1024)))  # 5MB
-LOGS_PER_MIN_LIMIT = int(os.getenv("LOGS_RATE_LIMIT_PER_MIN", "10"))
-
-_LOGS_RL_LOCK = threading.Lock()
-_LOGS_RL: dict[str, deque] = defaultdict(deque)  # key: ip
-
-def _logs_rate_limited(ip: str) -> bool:
-    try:
-        now = time.time()
-        key = ip or "-"
-        with _LOGS_RL_LOCK:
-            q = _LOGS_RL[key]
-            while q and (now - q[0]) > 60.0:
-                q.popleft()
-            if len(q) >= LOGS_PER_MIN_LIMIT:
-                return True
-            q.append(now)
-    except Exception:
-        return False
-    return False
 
 def _ensure_logs_dir() -> str:
     base = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data", "logs"))
@@ -88,34 +80,6 @@ logging.basicConfig(
 logger = logging.getLogger("app")
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request, call_next):
-        start = time.perf_counter()
-        path = request.url.path
-        method = request.method
-        client = request.client.host if request.client else "-"
-        response = None
-        try:
-            response = await call_next(request)
-            return response
-        except Exception:
-            logger.exception("unhandled_exception", extra={"path": path, "method": method, "client": client})
-            raise
-        finally:
-            dur_ms = int((time.perf_counter() - start) * 1000)
-            status = getattr(response, 'status_code', '-')
-            logger.info(
-                "request",
-                extra={
-                    "method": method,
-                    "path": path,
-                    "status": status,
-                    "duration_ms": dur_ms,
-                    "client": client,
-                },
-            )
-
-
 app = FastAPI(title="News-AI")
 
 BASE_DIR = os.path.dirname(__file__)
@@ -123,13 +87,18 @@ templates = Jinja2Templates(directory=os.path.join(BASE_DIR, "templates"))
 
 static_dir = os.path.join(BASE_DIR, "static")
 if os.path.isdir(static_dir):
-    app.mount("/static", StaticFiles(directory=static_dir), name="static")
+    app.mount("/static", SiteStatic(directory=static_dir), name="static")
     # Serve Vite build assets at /assets for production bundle
     assets_dir = os.path.join(static_dir, "assets")
     if os.path.isdir(assets_dir):
-        app.mount("/assets", StaticFiles(directory=assets_dir), name="assets")
+        app.mount("/assets", SiteStatic(directory=assets_dir, immutable_prefix=""), name="assets")
+# The SPA shell, read once; every client-side route is answered from memory
+spa_index = SpaIndex(os.path.join(static_dir, "index.html"))
 
-app.add_middleware(RequestLoggingMiddleware)
+# Timing is outermost so it covers compression; both are pure ASGI and
+# leave streamed bodies alone
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(TimingMiddleware)
 
 
 def _normalize_ollama_base(url: Optional[str]) -> Optional[str]:
@@ -168,48 +137,85 @@ def _normalize_tts_base(url: Optional[str]) -> Optional[str]:
     except Exception:
         return url
 
-# ----- Simple in-memory rate limit for article chat -----
-_CHAT_RL_LOCK = threading.Lock()
-_CHAT_RL: dict[str, deque] = defaultdict(deque)  # key: f"{ip}:{article_id}"
-_CHAT_RL_MAX = int(os.getenv("CHAT_RATE_LIMIT_PER_MIN", "10"))
+def _become_leader() -> None:
+    """This worker owns the scheduler and harvest jobs (always true for a single worker)."""
+    start_scheduler()
+    logger.info("startup:scheduler_started")
+    # Kick off a first run on boot without blocking startup
+    job, _ = jobs.submit("startup")
+    logger.info("startup:first_run_queued", extra={"job_id": job.id})
+
+
+def _step_down() -> None:
+    scheduler_mod.stop_scheduler()
+    cur = jobs.current()
+    if cur is not None:
+        jobs.cancel(cur.id)
+
+
+def _cluster_run(msg: dict) -> None:
+    job, created = jobs.submit("api", deadline_s=msg.get("deadline_s"))
+    cluster.reply(msg, {"status": "queued" if created else "running", "job_id": job.id, "coalesced": not created})
+
+
+def _cluster_cancel(msg: dict) -> None:
+    job = jobs.cancel(str(msg.get("job_id") or ""))
+    cluster.reply(msg, job.to_dict() if job else {"error": "not_found"})
+
+
+def _status_snapshot() -> dict:
+    """Progress plus schedule info; followers serve the leader's last published copy."""
+    if not cluster.is_leader():
+        shared = cluster.shared("status")
+        if shared:
+            return dict(shared)
+    snap = progress.snapshot()
+    snap["next_runs"] = scheduler_mod.next_runs()
+    adaptive = scheduler_mod.adaptive_state()
+    if adaptive is not None:
+        snap["adaptive"] = adaptive
+    return snap
+
+
+def _jobs_snapshot(limit: int = 50) -> dict:
+    if not cluster.is_leader():
+        shared = cluster.shared("jobs")
+        if shared:
+            return {"current": shared.get("current"), "items": (shared.get("items") or [])[:limit]}
+    cur = jobs.current()
+    return {"current": cur.to_dict() if cur else None, "items": jobs.history(limit)}
 
-def _rate_limited(ip: str, article_id: int) -> bool:
-    try:
-        now = time.time()
-        key = f"{ip}:{article_id}"
-        with _CHAT_RL_LOCK:
-            q = _CHAT_RL[key]
-            # drop entries older than 60s
-            while q and (now - q[0]) > 60.0:
-                q.popleft()
-            if len(q) >= _CHAT_RL_MAX:
-                return True
-            q.append(now)
-    except Exception:
-        return False
-    return False
 
 @app.on_event("startup")
 def on_startup():
-    init_db()
-    logger.info("startup:init_db_done")
-    # Resolve and persist location before scheduler uses it
-    try:
-        resolve_location()
-        logger.info("startup:location_resolved")
-    except Exception:
-        logger.exception("startup:location_resolution_failed")
-    start_scheduler()
-    logger.info("startup:scheduler_started")
-    # Kick off a first run on boot without blocking startup
-    def _background_first_run():
+    # Workers start together; run migrations one at a time
+    with cluster_startup_lock():
+        init_db()
+        if os.environ.get("SQLITE_CONVERT_AUTO_VACUUM", "0").lower() in ("1", "true", "yes", "on"):
+            maintenance.convert_to_incremental()
+        logger.info("startup:init_db_done")
+        # Resolve and persist location before scheduler uses it; under the lock
+        # so only the first worker inserts it and the others read it back
         try:
-            run_harvest_once()
-            logger.info("startup:first_run_completed")
+            resolve_location()
+            logger.info("startup:location_resolved")
         except Exception:
-            logger.exception("startup:first_run_failed")
+            logger.exception("startup:location_resolution_failed")
+    # Only the elected worker runs the scheduler; the others relay to it
+    bus.add_tap(cluster.mirror)
+    cluster.on("config_invalidate", lambda m: config_cache.invalidate(*(m.get("kinds") or ()), broadcast=False))
+    cluster.on("data_changed", lambda m: response_cache.bump(m.get("reason") or "", broadcast=False))
+    cluster.on("scheduler_restart", lambda _m: restart_scheduler(), leader_only=True)
+    cluster.on("run", _cluster_run, leader_only=True)
+    cluster.on("cancel", _cluster_cancel, leader_only=True)
+    cluster.provide("status", _status_snapshot)
+    cluster.provide("jobs", _jobs_snapshot)
+    cluster.start(on_elected=_become_leader, on_demoted=_step_down)
 
-    threading.Thread(target=_background_first_run, daemon=True).start()
+
+@app.on_event("shutdown")
+def on_shutdown():
+    cluster.stop()
 
 
 @app.get("/health")
@@ -218,27 +224,112 @@ def health():
 
 
 @app.get("/api/status")
-def api_status():
-    snap = progress.snapshot()
-    snap["next_runs"] = scheduler_mod.next_runs()
-    return snap
+async def api_status():
+    return _status_snapshot()
+
+
+@app.get("/api/cluster")
+def api_cluster():
+    """Leader election state: this worker's id, whether it leads, and the lease holder."""
+    return cluster.status()
+
+
+@app.get("/api/metrics")
+def api_metrics():
+    """Request latency per route on this worker: count, mean, p50/p90/p99, DB and upstream time."""
+    return {"worker": cluster.worker_id, **request_metrics.snapshot()}
+
+
+@app.post("/api/metrics/reset")
+def api_metrics_reset():
+    """Start this worker's latency histograms over."""
+    request_metrics.reset()
+    return {"status": "ok"}
+
+
+@app.get("/api/events")
+async def api_events(request: Request):
+    """Server-Sent Events stream of progress transitions, new articles and weather updates.
+
+    Sends the current status (including next runs) on connect, so clients can
+    drop /api/status polling.
+    """
+    from .events import sse_stream
+    return StreamingResponse(
+        sse_stream(request, initial={"progress": _status_snapshot()}),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.post("/api/run-now")
-def run_now():
+def run_now(deadline_s: Optional[float] = None):
+    """Queue a harvest job and return immediately; joins the running job if one exists."""
     try:
-        logger.info("api:run_now:start")
-        run_harvest_once()
-        logger.info("api:run_now:ok")
-        return {"status": "ok"}
+        if not cluster.is_leader():
+            # The leader owns harvests; hand the request over and relay its answer
+            res = cluster.request("run", {"deadline_s": deadline_s})
+            logger.info("api:run_now:relayed", extra={"job_id": (res or {}).get("job_id")})
+            return JSONResponse(status_code=202, content=res or {"status": "queued", "job_id": None, "coalesced": False})
+        job, created = jobs.submit("api", deadline_s=deadline_s)
+        logger.info("api:run_now", extra={"job_id": job.id, "coalesced": not created})
+        return JSONResponse(
+            status_code=202,
+            content={"status": "queued" if created else "running", "job_id": job.id, "coalesced": not created},
+        )
     except Exception as e:
         logger.exception("api:run_now:error")
         return JSONResponse(status_code=500, content={"status": "error", "detail": str(e)})
 
 
-def _latest_weather(session: SessionLocal) -> Optional[WeatherReport]:
+@app.get("/api/jobs")
+def api_jobs(limit: int = 20):
+    limit = max(1, min(50, int(limit or 20)))
+    return _jobs_snapshot(limit)
+
+
+@app.get("/api/runs")
+def api_runs(limit: int = 20):
+    """Persisted harvest history with per-phase duration trends."""
+    from .runs import run_trends
+    limit = max(1, min(500, int(limit or 20)))
+    return run_trends(limit)
+
+
+@app.get("/api/jobs/{job_id}")
+def api_job_detail(job_id: str):
+    if not cluster.is_leader():
+        snap = _jobs_snapshot()
+        for item in [snap.get("current")] + list(snap.get("items") or []):
+            if item and item.get("id") == job_id:
+                return item
+        return JSONResponse(status_code=404, content={"error": "not_found"})
+    job = jobs.get(job_id)
+    if not job:
+        return JSONResponse(status_code=404, content={"error": "not_found"})
+    return job.to_dict()
+
+
+@app.post("/api/jobs/{job_id}/cancel")
+def api_job_cancel(job_id: str):
+    if not cluster.is_leader():
+        res = cluster.request("cancel", {"job_id": job_id})
+        if res is None:
+            return JSONResponse(status_code=504, content={"error": "leader_unavailable"})
+        if res.get("error"):
+            return JSONResponse(status_code=404, content=res)
+        return res
+    job = jobs.cancel(job_id)
+    if not job:
+        return JSONResponse(status_code=404, content={"error": "not_found"})
+    return job.to_dict()
+
+
+def _latest_weather(session: SessionLocal, location_id: Optional[int] = None) -> Optional[WeatherReport]:
+    # Served by ix_weather_reports_location_fetched; defaults to the primary location
     return (
         session.query(WeatherReport)
+        .filter(WeatherReport.location_id == (location_id or 1))
         .order_by(WeatherReport.fetched_at.desc())
         .limit(1)
         .one_or_none()
@@ -247,14 +338,10 @@ def _latest_weather(session: SessionLocal) -> Optional[WeatherReport]:
 
 def _latest_articles(session: SessionLocal, limit: int = 30, offset: int = 0) -> List[Article]:
     # Primary sort: published_at DESC when available. Items missing published_at come after,
-    # and are sorted by fetched_at DESC.
+    # and are sorted by fetched_at DESC. Both are folded into the indexed sort_key.
     return (
         session.query(Article)
-        .order_by(
-            case((Article.published_at.is_(None), 1), else_=0),
-            Article.published_at.desc(),
-            Article.fetched_at.desc(),
-        )
+        .order_by(Article.sort_key.desc(), Article.id.desc())
         .offset(int(offset))
         .limit(int(limit))
         .all()
@@ -262,29 +349,15 @@ def _latest_articles(session: SessionLocal, limit: int = 30, offset: int = 0) ->
 
 
 def _funny_author_for(article: Article) -> str:
-    try:
-        import hashlib
-        seed = (article.source_url or article.source_title or str(article.id) or "seed").encode("utf-8", errors="ignore")
-        h = int(hashlib.sha256(seed).hexdigest(), 16)
-        firsts = [
-            "Waffles", "Pickles", "Biscuit", "Snickers", "Pumpkin", "Noodle", "Sprinkles", "Muffin", "Peaches", "Tofu",
-        ]
-        lasts = [
-            "McGiggles", "Von Quill", "Fizzlebottom", "O'Snark", "Bumblebee", "Flapjack", "Wobbleton", "Sparkplug", "Featherstone", "Noodlekins",
-        ]
-        titles = ["Correspondent", "Staff Writer", "Senior Scribe", "Field Reporter", "News Enthusiast"]
-        return f"{firsts[h % len(firsts)]} {lasts[(h // 7) % len(lasts)]}, {titles[(h // 13) % len(titles)]}"
-    except Exception:
-        return "Sammy Scribbles, Staff Writer"
+    return cards.byline(article.source_url, article.source_title, article.id)
 
 
 @app.get("/", response_class=HTMLResponse)
-def index():
+def index(request: Request):
     # Serve built React app if available; fallback to server-rendered page
-    static_index = os.path.join(static_dir, "index.html")
-    if os.path.exists(static_index):
+    if spa_index.available:
         logger.info("serve:index_static")
-        return FileResponse(static_index)
+        return spa_index.response(request)
     # Fallback
     logger.warning("serve:index_fallback_html")
     session = SessionLocal()
@@ -324,16 +397,53 @@ def index():
 # (moved spa_fallback to the end of file to avoid shadowing API routes)
 
 
+def _parse_filter_date(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (ValueError, AttributeError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def _sort_key_window(from_dt: Optional[datetime], to_dt: Optional[datetime], column=ArticleCard.sort_key):
+    """Articles dated (or, if undated, fetched) within [from_dt, to_dt], as two sort_key ranges."""
+    lo = epoch_ms(from_dt) if from_dt is not None else None
+    hi = epoch_ms(to_dt) if to_dt is not None else None
+    dated = [column >= (lo if lo is not None else UNDATED_SORT_BELOW)]
+    undated = [column < UNDATED_SORT_BELOW]
+    if hi is not None:
+        dated.append(column <= hi)
+        undated.append(column <= hi - UNDATED_SORT_OFFSET)
+    if lo is not None:
+        undated.append(column >= lo - UNDATED_SORT_OFFSET)
+    return or_(and_(*dated), and_(*undated))
+
+
 def _build_article_query(session: SessionLocal, q: Optional[str] = None, source: Optional[str] = None, 
                          date_from: Optional[str] = None, date_to: Optional[str] = None, 
-                         sort_by: Optional[str] = None):
-    """Build article query with filters and sorting."""
-    query = session.query(Article)
+                         sort_by: Optional[str] = None, location_id: Optional[int] = None):
+    """Build the article list query with filters and sorting.
+
+    Lists read `article_cards` (see app/cards.py), which carries the same
+    filter and sort columns as `articles` with the same indexes.
+    """
+    query = session.query(ArticleCard)
+
+    # Location filter (indexed)
+    if location_id:
+        query = query.filter(ArticleCard.location_id == int(location_id))
     
-    # Search filter
-    if q and q.strip():
+    # Search filter: FTS5 index when available, LIKE scan otherwise
+    fts = search.match_subquery(q) if (q and q.strip() and search.fts_enabled()) else None
+    if fts is not None:
+        query = query.join(fts, fts.c.rid == ArticleCard.id)
+    elif q and q.strip():
         search_term = f"%{q.strip()}%"
-        query = query.filter(
+        matches = session.query(Article.id).filter(
             or_(
                 Article.ai_title.like(search_term),
                 Article.source_title.like(search_term),
@@ -341,141 +451,224 @@ def _build_article_query(session: SessionLocal, q: Optional[str] = None, source:
                 Article.source_name.like(search_term),
             )
         )
+        query = query.filter(ArticleCard.id.in_(matches))
     
     # Source filter
     if source and source.strip():
-        query = query.filter(Article.source_name == source.strip())
+        query = query.filter(ArticleCard.source_name == source.strip())
     
-    # Date range filter
-    if date_from:
-        try:
-            from_dt = datetime.fromisoformat(date_from.replace('Z', '+00:00'))
-            if from_dt.tzinfo is None:
-                from_dt = from_dt.replace(tzinfo=timezone.utc)
-            query = query.filter(
-                or_(
-                    Article.published_at >= from_dt,
-                    and_(Article.published_at.is_(None), Article.fetched_at >= from_dt)
-                )
-            )
-        except (ValueError, AttributeError):
-            pass
-    
-    if date_to:
-        try:
-            to_dt = datetime.fromisoformat(date_to.replace('Z', '+00:00'))
-            if to_dt.tzinfo is None:
-                to_dt = to_dt.replace(tzinfo=timezone.utc)
-            query = query.filter(
-                or_(
-                    Article.published_at <= to_dt,
-                    and_(Article.published_at.is_(None), Article.fetched_at <= to_dt)
-                )
-            )
-        except (ValueError, AttributeError):
-            pass
+    # Date range filter (published_at, or fetched_at when undated), as sort_key ranges
+    from_dt = _parse_filter_date(date_from)
+    to_dt = _parse_filter_date(date_to)
+    if from_dt is not None or to_dt is not None:
+        query = query.filter(_sort_key_window(from_dt, to_dt))
     
     # Sorting
     sort_by = (sort_by or "date_desc").lower()
-    if sort_by == "date_asc":
+    if sort_by == "relevance" and fts is not None:
+        # bm25(): lower is a better match
+        query = query.order_by(fts.c.rank.asc(), ArticleCard.id.desc())
+    elif sort_by == "date_asc":
+        # Undated articles still come last
         query = query.order_by(
-            case((Article.published_at.is_(None), 1), else_=0),
-            Article.published_at.asc(),
-            Article.fetched_at.asc(),
+            case((ArticleCard.sort_key < UNDATED_SORT_BELOW, 1), else_=0),
+            ArticleCard.sort_key.asc(),
+            ArticleCard.id.asc(),
         )
     elif sort_by == "source":
-        query = query.order_by(Article.source_name.asc(), Article.published_at.desc())
+        query = query.order_by(ArticleCard.source_name.asc(), ArticleCard.published_at.desc())
     elif sort_by == "title":
-        query = query.order_by(
-            func.coalesce(Article.ai_title, Article.source_title).asc(),
-            Article.published_at.desc(),
-        )
+        query = query.order_by(ArticleCard.title.asc(), ArticleCard.published_at.desc())
     else:  # date_desc (default)
-        query = query.order_by(
-            case((Article.published_at.is_(None), 1), else_=0),
-            Article.published_at.desc(),
-            Article.fetched_at.desc(),
-        )
+        query = query.order_by(ArticleCard.sort_key.desc(), ArticleCard.id.desc())
     
     return query
 
 
-def _article_to_dict(a: Article, session: Optional[SessionLocal] = None, check_bookmark: bool = False) -> dict:
-    """Convert Article model to dict."""
-    base_dt = a.published_at or a.fetched_at
-    if base_dt is not None and base_dt.tzinfo is None:
-        base_dt = base_dt.replace(tzinfo=timezone.utc)
-    sort_ts = int(base_dt.timestamp() * 1000) if base_dt else None
-    result = {
-        "id": a.id,
-        "title": a.ai_title or a.source_title,
-        "source": a.source_name,
-        "source_url": a.source_url,
-        "image_url": a.image_url,
-        "published_at": a.published_at.isoformat() if a.published_at else None,
-        "fetched_at": a.fetched_at.isoformat(),
-        "sort_ts": sort_ts,
-        "ai_model": a.ai_model,
-        "ai_body": a.ai_body,
-        "byline": _funny_author_for(a) if (a.ai_body and not (a.ai_model or "").startswith("fallback:")) else None,
-        "rewrite_note": ("Showing original text (AI unavailable)" if (a.ai_model or "").startswith("fallback:") else None),
+# Item fields the list endpoints can return. `view=card` swaps the full
+# body for a short excerpt; `fields=` picks any subset (`id` is always kept).
+ARTICLE_FIELDS = (
+    "id", "title", "source", "source_url", "image_url", "published_at", "fetched_at", "sort_ts",
+    "ai_model", "ai_body", "excerpt", "byline", "rewrite_note", "is_bookmarked",
+)
+ARTICLE_VIEWS = {
+    "full": tuple(f for f in ARTICLE_FIELDS if f != "excerpt"),
+    "card": tuple(f for f in ARTICLE_FIELDS if f != "ai_body"),
+}
+
+
+def _list_fields(view: Optional[str], fields: Optional[str]) -> tuple:
+    """Item fields for a list request. Raises ValueError for an unknown view or field."""
+    if fields and fields.strip():
+        names = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+        unknown = [f for f in names if f not in ARTICLE_FIELDS]
+        if unknown:
+            raise ValueError(f"unknown fields: {', '.join(unknown)}")
+        return names if "id" in names else ("id",) + names
+    view = (view or "full").lower()
+    if view not in ARTICLE_VIEWS:
+        raise ValueError(f"unknown view: {view}")
+    return ARTICLE_VIEWS[view]
+
+
+def _card_to_dict(c: ArticleCard, fields: tuple, bookmarked: Optional[set] = None,
+                  bodies: Optional[dict] = None) -> dict:
+    """One list item from its card; everything is precomputed, only `fields` are copied."""
+    values = {
+        "id": c.id,
+        "title": c.title,
+        "source": c.source_name,
+        "source_url": c.source_url,
+        "image_url": c.image_url,
+        "published_at": c.published_at,
+        "fetched_at": c.fetched_at,
+        "sort_ts": c.sort_ts,
+        "ai_model": c.ai_model,
+        "ai_body": (bodies or {}).get(c.id),
+        "excerpt": c.excerpt,
+        "byline": c.byline,
+        "rewrite_note": c.rewrite_note,
+        "is_bookmarked": (c.id in bookmarked) if bookmarked is not None else None,
     }
-    # Check if article is bookmarked if requested
-    if check_bookmark and session:
-        bookmark = session.query(Bookmark).filter_by(article_id=a.id).first()
-        result["is_bookmarked"] = bookmark is not None
-    return result
+    return {k: values[k] for k in fields if k != "is_bookmarked" or bookmarked is not None}
+
+
+def _bookmarked_ids(session: SessionLocal, ids: List[int]) -> set:
+    """Ids among `ids` that have a bookmark, in one query."""
+    if not ids:
+        return set()
+    rows = session.query(Bookmark.article_id).filter(Bookmark.article_id.in_(ids)).all()
+    return {r[0] for r in rows}
+
+
+def _article_bodies(session: SessionLocal, ids: List[int]) -> dict:
+    """`ai_body` by article id for the full view, in one primary-key query."""
+    if not ids:
+        return {}
+    return dict(session.query(Article.id, Article.ai_body).filter(Article.id.in_(ids)).all())
+
+
+def _cards_to_dicts(session: SessionLocal, cards: List[ArticleCard], bookmarked: Optional[set] = None,
+                    fields: tuple = ARTICLE_VIEWS["full"]) -> List[dict]:
+    """Convert a page of cards. Bookmark state and bodies take one query each, only when asked for."""
+    ids = [c.id for c in cards]
+    if bookmarked is None and "is_bookmarked" in fields:
+        bookmarked = _bookmarked_ids(session, ids)
+    bodies = _article_bodies(session, ids) if "ai_body" in fields else None
+    return [_card_to_dict(c, fields, bookmarked, bodies) for c in cards]
 
 
 @app.get("/api/articles")
-def api_articles(page: int = 1, limit: int = 10, q: Optional[str] = None, 
-                 source: Optional[str] = None, date_from: Optional[str] = None, 
-                 date_to: Optional[str] = None, sort_by: Optional[str] = None):
-    session = SessionLocal()
+async def api_articles(request: Request, page: int = 1, limit: int = 10, q: Optional[str] = None, 
+                       source: Optional[str] = None, date_from: Optional[str] = None, 
+                       date_to: Optional[str] = None, sort_by: Optional[str] = None,
+                       location_id: Optional[int] = None, cursor: Optional[str] = None,
+                       include_total: Optional[bool] = None, view: Optional[str] = None,
+                       fields: Optional[str] = None):
+    """List articles.
+
+    Page mode (`page`) returns an exact `total`/`pages`. Cursor mode (`cursor`
+    from a previous response's `next_cursor`) walks the sort order by key
+    instead of OFFSET; `total` is only included with `include_total=true` and
+    is then served from a short-lived cache.
+
+    `view=card` returns an `excerpt` instead of the full `ai_body`, and
+    `fields=` (comma-separated) picks the item keys; the query only loads
+    the body when it is returned.
+
+    Responses carry a strong ETag and are cached until the data changes;
+    `If-None-Match` with the current tag gets a 304.
+    """
     try:
-        # Clamp params
-        page = max(1, int(page or 1))
-        limit = max(1, min(100, int(limit or 10)))
-        
-        # Build filtered query
-        query = _build_article_query(session, q=q, source=source, date_from=date_from, 
-                                     date_to=date_to, sort_by=sort_by)
-        
+        item_fields = _list_fields(view, fields)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    return await response_cache.respond(request, lambda: run_read(lambda session: _articles_page(
+        session, page=page, limit=limit, q=q, source=source, date_from=date_from, date_to=date_to,
+        sort_by=sort_by, location_id=location_id, cursor=cursor, include_total=include_total,
+        fields=item_fields,
+    )))
+
+
+def _articles_page(session, *, page: int, limit: int, q: Optional[str], source: Optional[str],
+                   date_from: Optional[str], date_to: Optional[str], sort_by: Optional[str],
+                   location_id: Optional[int], cursor: Optional[str], include_total: Optional[bool],
+                   fields: tuple = ARTICLE_VIEWS["full"]):
+    # Clamp params
+    page = max(1, int(page or 1))
+    limit = max(1, min(100, int(limit or 10)))
+    sort_key = (sort_by or "date_desc").lower()
+    if sort_key == "relevance" and not (q and q.strip()):
+        sort_key = "date_desc"
+    if sort_key not in ("date_asc", "source", "title", "relevance"):
+        sort_key = "date_desc"
+    keyset = sort_key in ("date_desc", "date_asc")
+    
+    # Build filtered query
+    query = _build_article_query(session, q=q, source=source, date_from=date_from, 
+                                 date_to=date_to, sort_by=sort_key, location_id=location_id)
+    
+    if cursor:
+        try:
+            cur = pagination.decode_cursor(cursor)
+            if cur.get("s") != sort_key:
+                return JSONResponse(status_code=400, content={"error": "cursor does not match sort_by"})
+            if keyset:
+                arts, next_cursor = pagination.keyset_articles(query, sort_key, cur, limit, model=ArticleCard)
+            else:
+                arts, next_cursor = pagination.offset_page(query, sort_key, cur, limit)
+        except pagination.CursorError:
+            return JSONResponse(status_code=400, content={"error": "invalid cursor"})
+        total = None
+        if include_total:
+            total_key = (q, source, date_from, date_to, location_id)
+            total = pagination.totals.get_or_compute(total_key, query.order_by(None).count)
+        result = {"items": None, "limit": limit, "next_cursor": next_cursor}
+        if total is not None:
+            result["total"] = total
+    else:
         # Get total count
-        total = query.count()
-        pages = max(1, (total + limit - 1) // limit)
-        if page > pages:
+        total = query.count() if include_total is not False else None
+        pages = max(1, (total + limit - 1) // limit) if total is not None else None
+        if pages is not None and page > pages:
             page = pages
         
         # Apply pagination
         offset = (page - 1) * limit
-        arts = query.offset(offset).limit(limit).all()
-        
-        items = [_article_to_dict(a, session=session, check_bookmark=True) for a in arts]
-        
-        logger.info("api:articles", extra={
-            "count": len(items), "page": page, "limit": limit, "total": total,
-            "has_search": bool(q), "has_source": bool(source)
-        })
-        return {"items": items, "page": page, "limit": limit, "total": total, "pages": pages}
-    finally:
-        session.close()
+        arts = query.offset(offset).limit(limit + 1).all()
+        more = len(arts) > limit
+        arts = arts[:limit]
+        next_cursor = None
+        if more and arts:
+            next_cursor = pagination.encode_cursor(
+                {"s": sort_key, "k": pagination.article_key(arts[-1])} if keyset else {"s": sort_key, "o": offset + limit}
+            )
+        result = {"items": None, "page": page, "limit": limit, "total": total, "pages": pages, "next_cursor": next_cursor}
+    
+    items = _cards_to_dicts(session, arts, fields=fields)
+    if q and q.strip() and search.fts_enabled():
+        marks = search.snippets(session, q, [a.id for a in arts])
+        for item in items:
+            hl = marks.get(item["id"])
+            if hl:
+                item.update(hl)
+    result["items"] = items
+    
+    logger.info("api:articles", extra={
+        "count": len(items), "page": page, "limit": limit, "total": total,
+        "has_search": bool(q), "has_source": bool(source), "cursor": bool(cursor)
+    })
+    return result
 
 
 @app.get("/api/articles/sources")
-def api_articles_sources():
-    """Get list of unique article sources."""
-    session = SessionLocal()
-    try:
-        sources = session.query(Article.source_name)\
-            .filter(Article.source_name.isnot(None))\
-            .distinct()\
-            .order_by(Article.source_name)\
-            .all()
-        source_list = [s[0] for s in sources if s[0]]
-        return {"sources": source_list}
-    finally:
-        session.close()
+async def api_articles_sources(location_id: Optional[int] = None, counts: bool = False):
+    """Get list of unique article sources.
+
+    Read from the maintained `sources` summary, not the articles table;
+    `counts=true` adds per-source article counts and extraction rates.
+    """
+    return await run_read(lambda session: sources.list_sources(session, location_id, counts))
 
 
 @app.post("/api/articles/{article_id}/bookmark")
@@ -495,6 +688,7 @@ def api_article_bookmark_toggle(article_id: int):
             # Remove bookmark
             session.delete(bookmark)
             session.commit()
+            response_cache.bump("bookmark")
             logger.info("api:bookmark:removed", extra={"article_id": article_id})
             return {"bookmarked": False, "action": "removed"}
         else:
@@ -502,6 +696,7 @@ def api_article_bookmark_toggle(article_id: int):
             bookmark = Bookmark(article_id=article_id)
             session.add(bookmark)
             session.commit()
+            response_cache.bump("bookmark")
             logger.info("api:bookmark:added", extra={"article_id": article_id})
             return {"bookmarked": True, "action": "added"}
     except Exception as e:
@@ -513,34 +708,57 @@ def api_article_bookmark_toggle(article_id: int):
 
 
 @app.get("/api/articles/bookmarked")
-def api_articles_bookmarked(page: int = 1, limit: int = 10):
-    """Get list of bookmarked articles."""
-    session = SessionLocal()
+async def api_articles_bookmarked(request: Request, page: int = 1, limit: int = 10, cursor: Optional[str] = None,
+                                  view: Optional[str] = None, fields: Optional[str] = None):
+    """Get list of bookmarked articles (page mode, or cursor mode via `cursor`).
+
+    `view` and `fields` select item keys as for `/api/articles`. Responses
+    are cached and carry an ETag like `/api/articles`.
+    """
     try:
-        page = max(1, int(page or 1))
-        limit = max(1, min(100, int(limit or 10)))
-        
-        # Query bookmarked articles with pagination
-        query = session.query(Article)\
-            .join(Bookmark, Article.id == Bookmark.article_id)\
-            .order_by(Bookmark.created_at.desc())
-        
-        total = query.count()
-        pages = max(1, (total + limit - 1) // limit)
-        if page > pages:
-            page = pages
-        
-        offset = (page - 1) * limit
-        arts = query.offset(offset).limit(limit).all()
-        
-        items = [_article_to_dict(a, session=session, check_bookmark=True) for a in arts]
-        
-        logger.info("api:articles:bookmarked", extra={
-            "count": len(items), "page": page, "limit": limit, "total": total
-        })
-        return {"items": items, "page": page, "limit": limit, "total": total, "pages": pages}
-    finally:
-        session.close()
+        item_fields = _list_fields(view, fields)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    return await response_cache.respond(request, lambda: run_read(lambda session: _bookmarked_page(
+        session, page=page, limit=limit, cursor=cursor, fields=item_fields,
+    )))
+
+
+def _bookmarked_page(session, *, page: int, limit: int, cursor: Optional[str], fields: tuple):
+    page = max(1, int(page or 1))
+    limit = max(1, min(100, int(limit or 10)))
+
+    # Query bookmarked articles with pagination
+    query = session.query(ArticleCard)\
+        .join(Bookmark, ArticleCard.id == Bookmark.article_id)\
+        .order_by(Bookmark.created_at.desc(), Bookmark.id.desc())
+
+    if cursor:
+        try:
+            cur = pagination.decode_cursor(cursor)
+            if cur.get("s") != "bookmarks":
+                raise pagination.CursorError("invalid cursor")
+            arts, next_cursor = pagination.keyset_bookmarks(query, cur, limit)
+        except pagination.CursorError:
+            return JSONResponse(status_code=400, content={"error": "invalid cursor"})
+        items = _cards_to_dicts(session, arts, bookmarked={a.id for a in arts}, fields=fields)
+        logger.info("api:articles:bookmarked", extra={"count": len(items), "limit": limit, "cursor": True})
+        return {"items": items, "limit": limit, "next_cursor": next_cursor}
+
+    total = query.count()
+    pages = max(1, (total + limit - 1) // limit)
+    if page > pages:
+        page = pages
+
+    offset = (page - 1) * limit
+    arts, next_cursor = pagination.keyset_bookmarks(query, None, limit, offset=offset)
+
+    items = _cards_to_dicts(session, arts, bookmarked={a.id for a in arts}, fields=fields)
+
+    logger.info("api:articles:bookmarked", extra={
+        "count": len(items), "page": page, "limit": limit, "total": total
+    })
+    return {"items": items, "page": page, "limit": limit, "total": total, "pages": pages, "next_cursor": next_cursor}
 
 
 @app.get("/api/articles/{article_id}/chat")
@@ -597,10 +815,10 @@ def api_article_chat(article_id: int, payload: dict, request: Request):
         # Build author name similar to list API
         author_name = _funny_author_for(a) if (a.ai_body and not (a.ai_model or "").startswith("fallback:")) else "Local Desk"
         # Load AI settings
-        aset = session.query(AppSettings).filter_by(id=1).one_or_none()
-        base_url = aset.ollama_base_url if aset and aset.ollama_base_url else os.environ.get("OLLAMA_BASE_URL")
-        model = aset.ollama_model if aset and aset.ollama_model else os.environ.get("OLLAMA_MODEL")
-        cfg = session.query(AppConfig).filter_by(id=1).one_or_none()
+        aset = config_cache.ai()
+        base_url = aset.base_url
+        model = aset.model
+        cfg = config_cache.location()
         location = cfg.location_name if cfg else os.environ.get("LOCATION_NAME", "Local")
         # Persist user's message
         um = ChatMessage(article_id=article_id, role="user", content=message)
@@ -611,7 +829,7 @@ def api_article_chat(article_id: int, payload: dict, request: Request):
 
     # Rate limit per IP + article
     ip = request.client.host if request.client else "-"
-    if _rate_limited(ip, article_id):
+    if chat_limiter.hit(f"{ip}:{article_id}"):
         return JSONResponse(status_code=429, content={"error": "rate_limited"})
 
     # Include recent persisted history (plus provided) capped to 6 turns
@@ -670,7 +888,7 @@ async def api_logs_upload(
     log: UploadFile = File(...),
 ):
     ip = request.client.host if request.client else "-"
-    if _logs_rate_limited(ip):
+    if logs_limiter.hit(ip):
         return JSONResponse(status_code=429, content={"error": "rate_limited"})
     # Guard filename and content type
     fname = (log.filename or "app.log").lower()
@@ -847,81 +1065,142 @@ def api_logs_delete(log_id: str):
 
 
 @app.get("/api/weather")
-def api_weather():
-    session = SessionLocal()
-    try:
-        wr = _latest_weather(session)
-        cfg = session.query(AppConfig).filter_by(id=1).one_or_none()
-        forecast = {}
-        if wr and wr.forecast_json:
-            try:
-                forecast = json.loads(wr.forecast_json)
-            except Exception:
-                forecast = {}
-        tz_name = (cfg.timezone if cfg else os.environ.get("TZ", "America/New_York"))
-        
-        # Use ai_generated_at if available, otherwise fall back to fetched_at
-        # Keep as UTC ISO - frontend will convert to location timezone
-        updated_at = None
-        if wr:
-            dt = wr.ai_generated_at if (wr.ai_generated_at and wr.ai_report) else wr.fetched_at
-            if dt:
-                # Ensure UTC timezone for consistent handling
-                if dt.tzinfo is None:
-                    dt = dt.replace(tzinfo=timezone.utc)
-                updated_at = dt.isoformat()
-        
-        result = {
-            "location": (cfg.location_name if cfg else os.environ.get("LOCATION_NAME", "Local")),
-            "timezone": tz_name,
-            "latitude": (cfg.latitude if cfg else None),
-            "longitude": (cfg.longitude if cfg else None),
-            "report": (wr.ai_report if wr else None),
-            "forecast": forecast,
-            "updated_at": updated_at,
-        }
-        if wr and (wr.ai_model or "").startswith("fallback:"):
-            result["report_note"] = "AI report unavailable — showing raw forecast data."
-        elif not (wr and wr.ai_report):
-            result["report_note"] = "AI report pending…"
-        logger.info("api:weather", extra={"has_report": bool(result["report"])})
-        return result
-    finally:
-        session.close()
+async def api_weather(request: Request, location_id: Optional[int] = None):
+    # Cached with an ETag like /api/articles; forecast_json is parsed once per update
+    return await response_cache.respond(request, lambda: run_read(lambda session: _weather_payload(session, location_id)))
 
 
-@app.get("/api/config")
-def api_config():
-    session = SessionLocal()
-    try:
-        cfg = session.query(AppConfig).filter_by(id=1).one_or_none()
-        tz_name = cfg.timezone if cfg and cfg.timezone else os.environ.get("TZ", "America/New_York")
-        # Get current time in location's timezone
+def _weather_payload(session, location_id: Optional[int]) -> dict:
+    wr = _latest_weather(session, location_id)
+    cfg = config_cache.location(location_id or 1)
+    forecast = {}
+    if wr and wr.forecast_json:
         try:
-            import pytz
-            tz = pytz.timezone(tz_name)
-            local_time = datetime.now(tz)
-            current_datetime = local_time.isoformat()
-            current_date = local_time.strftime("%Y-%m-%d")
-            current_time = local_time.strftime("%H:%M:%S")
+            forecast = json.loads(wr.forecast_json)
         except Exception:
-            # Fallback to UTC if timezone fails
-            local_time = datetime.now(timezone.utc)
-            current_datetime = local_time.isoformat()
-            current_date = local_time.strftime("%Y-%m-%d")
-            current_time = local_time.strftime("%H:%M:%S")
-        data = {
-            "location": (cfg.location_name if cfg else None),
-            "timezone": tz_name,
-            "min_articles": int(os.environ.get("MIN_ARTICLES_PER_RUN", "10")),
-            "current_datetime": current_datetime,
-            "current_date": current_date,
-            "current_time": current_time,
+            forecast = {}
+    tz_name = (cfg.timezone if cfg else os.environ.get("TZ", "America/New_York"))
+    
+    # Use ai_generated_at if available, otherwise fall back to fetched_at
+    # Keep as UTC ISO - frontend will convert to location timezone
+    updated_at = None
+    if wr:
+        dt = wr.ai_generated_at if (wr.ai_generated_at and wr.ai_report) else wr.fetched_at
+        if dt:
+            # Ensure UTC timezone for consistent handling
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            updated_at = dt.isoformat()
+    
+    result = {
+        "location_id": (cfg.id if cfg else (location_id or 1)),
+        "location": (cfg.location_name if cfg else os.environ.get("LOCATION_NAME", "Local")),
+        "timezone": tz_name,
+        "latitude": (cfg.latitude if cfg else None),
+        "longitude": (cfg.longitude if cfg else None),
+        "report": (wr.ai_report if wr else None),
+        "forecast": forecast,
+        "updated_at": updated_at,
+    }
+    if wr and (wr.ai_model or "").startswith("fallback:"):
+        result["report_note"] = "AI report unavailable — showing raw forecast data."
+    elif not (wr and wr.ai_report):
+        result["report_note"] = "AI report pending…"
+    logger.info("api:weather", extra={"has_report": bool(result["report"])})
+    return result
+
+
+@app.get("/api/config")
+async def api_config():
+    # Served from the in-process settings cache; no database round trip
+    cfg = config_cache.location()
+    tz_name = cfg.timezone if cfg and cfg.timezone else os.environ.get("TZ", "America/New_York")
+    # Get current time in location's timezone
+    try:
+        import pytz
+        tz = pytz.timezone(tz_name)
+        local_time = datetime.now(tz)
+        current_datetime = local_time.isoformat()
+        current_date = local_time.strftime("%Y-%m-%d")
+        current_time = local_time.strftime("%H:%M:%S")
+    except Exception:
+        # Fallback to UTC if timezone fails
+        local_time = datetime.now(timezone.utc)
+        current_datetime = local_time.isoformat()
+        current_date = local_time.strftime("%Y-%m-%d")
+        current_time = local_time.strftime("%H:%M:%S")
+    data = {
+        "location": (cfg.location_name if cfg else None),
+        "timezone": tz_name,
+        "min_articles": int(os.environ.get("MIN_ARTICLES_PER_RUN", "10")),
+        "current_datetime": current_datetime,
+        "current_date": current_date,
+        "current_time": current_time,
+    }
+    logger.info("api:config", extra={"location": data["location"], "timezone": data["timezone"], "min_articles": data["min_articles"]})
+    return data
+
+
+# Item keys the Android news widget shows
+WIDGET_ARTICLE_FIELDS = ("id", "title", "source", "image_url", "published_at", "fetched_at", "sort_ts")
+# Forecast keys (and days) the Android weather widget reads
+WIDGET_DAILY_KEYS = ("time", "temperature_2m_max", "temperature_2m_min", "weathercode")
+WIDGET_FORECAST_DAYS = 5
+
+
+@app.get("/api/bootstrap")
+async def api_bootstrap(request: Request, location_id: Optional[int] = None, limit: int = 10, variant: str = "app"):
+    """Everything the first screen needs, in one response.
+
+    `variant=app` bundles config, AI and TTS settings, weather, the first
+    page of article cards and the source list; `variant=widget` only the
+    weather and article fields the Android widgets show. Built from the
+    same cached projections as the individual endpoints, and cached with
+    one ETag for the whole bundle. Time-of-day fields from /api/config are
+    left out so the tag only changes with the data.
+    """
+    if variant not in ("app", "widget"):
+        return JSONResponse(status_code=400, content={"error": "variant must be 'app' or 'widget'"})
+    return await response_cache.respond(
+        request, lambda: run_read(lambda session: _bootstrap_payload(session, location_id, limit, variant))
+    )
+
+
+def _bootstrap_payload(session, location_id: Optional[int], limit: int, variant: str) -> dict:
+    widget = variant == "widget"
+    articles = _articles_page(
+        session, page=1, limit=limit, q=None, source=None, date_from=None, date_to=None, sort_by=None,
+        location_id=location_id, cursor=None, include_total=False,
+        fields=WIDGET_ARTICLE_FIELDS if widget else ARTICLE_VIEWS["card"],
+    )
+    weather = _weather_payload(session, location_id)
+    if widget:
+        forecast = weather.get("forecast") or {}
+        daily = forecast.get("daily") or {}
+        weather["forecast"] = {
+            "current_weather": forecast.get("current_weather"),
+            "daily": {k: (daily.get(k) or [])[:WIDGET_FORECAST_DAYS] for k in WIDGET_DAILY_KEYS},
         }
-        logger.info("api:config", extra={"location": data["location"], "timezone": data["timezone"], "min_articles": data["min_articles"]})
-        return data
-    finally:
-        session.close()
+        return {
+            "variant": variant,
+            "weather": weather,
+            "articles": {"items": articles["items"], "next_cursor": articles["next_cursor"]},
+        }
+    cfg = config_cache.location(location_id or 1)
+    return {
+        "variant": variant,
+        "config": {
+            "location_id": cfg.id if cfg else (location_id or 1),
+            "location": cfg.location_name if cfg else None,
+            "timezone": (cfg.timezone if cfg and cfg.timezone else os.environ.get("TZ", "America/New_York")),
+            "min_articles": int(os.environ.get("MIN_ARTICLES_PER_RUN", "10")),
+        },
+        "settings": api_get_settings(),
+        "tts": api_tts_get_settings(),
+        "weather": weather,
+        "articles": articles,
+        "sources": sources.list_sources(session, location_id)["sources"],
+    }
 
 
 @app.post("/api/location-disabled")
@@ -953,15 +1232,9 @@ async def api_set_location_new(payload: dict):
         logger.exception("scheduler_restart_failed_after_location_change")
     def _bg_refresh():
         try:
-            session = SessionLocal()
-            try:
-                aset = session.query(AppSettings).filter_by(id=1).one_or_none()
-                base_url = aset.ollama_base_url if aset and aset.ollama_base_url else None
-                model = aset.ollama_model if aset and aset.ollama_model else None
-                temp_unit = aset.temp_unit if aset and aset.temp_unit else None
-                wind_speed_unit = aset.wind_speed_unit if aset and aset.wind_speed_unit else None
-            finally:
-                session.close()
+            aset = config_cache.ai()
+            base_url, model = aset.ollama_base_url, aset.ollama_model
+            temp_unit, wind_speed_unit = aset.temp_unit, aset.wind_speed_unit
             scheduler_mod.progress.phase('weather_fetch', 'Updating due to location change')
             scheduler_mod._gen_weather_report(cfg.location_name, base_url=base_url, model=model, temp_unit=temp_unit, wind_speed_unit=wind_speed_unit)
         except Exception:
@@ -985,15 +1258,9 @@ def api_auto_location():
         logger.exception("scheduler_restart_failed_after_auto_location")
     def _bg_refresh():
         try:
-            session = SessionLocal()
-            try:
-                aset = session.query(AppSettings).filter_by(id=1).one_or_none()
-                base_url = aset.ollama_base_url if aset and aset.ollama_base_url else None
-                model = aset.ollama_model if aset and aset.ollama_model else None
-                temp_unit = aset.temp_unit if aset and aset.temp_unit else None
-                wind_speed_unit = aset.wind_speed_unit if aset and aset.wind_speed_unit else None
-            finally:
-                session.close()
+            aset = config_cache.ai()
+            base_url, model = aset.ollama_base_url, aset.ollama_model
+            temp_unit, wind_speed_unit = aset.temp_unit, aset.wind_speed_unit
             scheduler_mod.progress.phase('weather_fetch', 'Updating due to auto location')
             scheduler_mod._gen_weather_report(cfg.location_name, base_url=base_url, model=model, temp_unit=temp_unit, wind_speed_unit=wind_speed_unit)
         except Exception:
@@ -1001,19 +1268,70 @@ def api_auto_location():
     threading.Thread(target=_bg_refresh, daemon=True).start()
     return {"ok": True}
 
+def _location_to_dict(cfg: AppConfig) -> dict:
+    return {
+        "id": cfg.id,
+        "location": cfg.location_name,
+        "timezone": cfg.timezone,
+        "latitude": cfg.latitude,
+        "longitude": cfg.longitude,
+        "source": cfg.source,
+        "feeds": location_feed_urls(cfg),
+        "enabled": cfg.enabled is not False,
+        "primary": cfg.id == 1,
+    }
+
+
+@app.get("/api/locations")
+def api_locations():
+    return {"items": [_location_to_dict(c) for c in list_locations()]}
+
+
+@app.post("/api/locations")
+def api_add_location(payload: dict):
+    name = (payload or {}).get("location") or (payload or {}).get("name")
+    if not name or not isinstance(name, str) or len(name.strip()) < 2:
+        return JSONResponse(status_code=400, content={"error": "location string required"})
+    cfg = set_location(name.strip(), loc_id=None)
+    feeds = (payload or {}).get("feeds")
+    if isinstance(feeds, list):
+        cfg = update_location(cfg.id, feed_urls=[str(f) for f in feeds]) or cfg
+    logger.info("api:locations:added", extra={"location_id": cfg.id, "location": cfg.location_name})
+    return _location_to_dict(cfg)
+
+
+@app.post("/api/locations/{location_id}")
+def api_update_location(location_id: int, payload: dict):
+    payload = payload or {}
+    feeds = payload.get("feeds")
+    cfg = update_location(
+        location_id,
+        feed_urls=[str(f) for f in feeds] if isinstance(feeds, list) else None,
+        enabled=(bool(payload["enabled"]) if "enabled" in payload else None),
+    )
+    if not cfg:
+        return JSONResponse(status_code=404, content={"error": "location not found"})
+    return _location_to_dict(cfg)
+
+
+@app.delete("/api/locations/{location_id}")
+def api_delete_location(location_id: int):
+    if location_id == 1:
+        return JSONResponse(status_code=400, content={"error": "cannot delete primary location"})
+    if not delete_location(location_id):
+        return JSONResponse(status_code=404, content={"error": "location not found"})
+    return {"status": "deleted"}
+
+
 @app.get("/api/settings")
 def api_get_settings():
-    session = SessionLocal()
-    try:
-        s = session.query(AppSettings).filter_by(id=1).one_or_none()
-        return {
-            "ollama_base_url": s.ollama_base_url if s else None,
-            "ollama_model": s.ollama_model if s else None,
-            "temp_unit": s.temp_unit if s else "F",
-            "wind_speed_unit": s.wind_speed_unit if s else "mph",
-        }
-    finally:
-        session.close()
+    s = config_cache.ai()
+    return {
+        "ollama_base_url": s.ollama_base_url,
+        "ollama_model": s.ollama_model,
+        "temp_unit": s.temp_unit or "F",
+        "wind_speed_unit": s.wind_speed_unit or "mph",
+    }
 
 @app.post("/api/settings")
 def api_set_settings(payload: dict):
@@ -1044,19 +1362,14 @@ def api_set_settings(payload: dict):
         session.commit()
     finally:
         session.close()
+    config_cache.invalidate("ai")
     if changed_unit:
         def _bg_refresh_unit():
             try:
-                cfg_session = SessionLocal()
-                try:
-                    cfg = cfg_session.query(AppConfig).filter_by(id=1).one_or_none()
-                    aset = cfg_session.query(AppSettings).filter_by(id=1).one_or_none()
-                    base_url = aset.ollama_base_url if aset and aset.ollama_base_url else None
-                    model = aset.ollama_model if aset and aset.ollama_model else None
-                    temp_unit = aset.temp_unit if aset and aset.temp_unit else None
-                    wind_speed_unit = aset.wind_speed_unit if aset and aset.wind_speed_unit else None
-                finally:
-                    cfg_session.close()
+                cfg = config_cache.location()
+                aset = config_cache.ai()
+                base_url, model = aset.ollama_base_url, aset.ollama_model
+                temp_unit, wind_speed_unit = aset.temp_unit, aset.wind_speed_unit
                 loc = cfg.location_name if cfg else os.environ.get("LOCATION_NAME", "Local")
                 scheduler_mod.progress.phase('weather_fetch', 'Updating due to unit change')
                 scheduler_mod._gen_weather_report(loc, base_url=base_url, model=model, temp_unit=temp_unit, wind_speed_unit=wind_speed_unit)
@@ -1066,21 +1379,17 @@ def api_set_settings(payload: dict):
     return {"status": "ok"}
 
 @app.post("/api/weather/refresh")
-def api_refresh_weather():
-    cfg = resolve_location()
+def api_refresh_weather(location_id: Optional[int] = None):
+    cfg = config_cache.location(location_id or 1)
+    if cfg is None:
+        return JSONResponse(status_code=404, content={"error": "location not found"})
     def _bg():
         try:
-            session = SessionLocal()
-            try:
-                aset = session.query(AppSettings).filter_by(id=1).one_or_none()
-                base_url = aset.ollama_base_url if aset and aset.ollama_base_url else None
-                model = aset.ollama_model if aset and aset.ollama_model else None
-                temp_unit = aset.temp_unit if aset and aset.temp_unit else None
-                wind_speed_unit = aset.wind_speed_unit if aset and aset.wind_speed_unit else None
-            finally:
-                session.close()
+            aset = config_cache.ai()
+            base_url, model = aset.ollama_base_url, aset.ollama_model
+            temp_unit, wind_speed_unit = aset.temp_unit, aset.wind_speed_unit
             scheduler_mod.progress.phase('weather_fetch', 'Manual refresh')
-            scheduler_mod._gen_weather_report(cfg.location_name, base_url=base_url, model=model, temp_unit=temp_unit, wind_speed_unit=wind_speed_unit)
+            scheduler_mod._gen_weather_report(cfg.location_name, base_url=base_url, model=model, temp_unit=temp_unit, wind_speed_unit=wind_speed_unit, cfg=cfg)
         except Exception:
             logger.exception("weather_manual_refresh_failed")
     threading.Thread(target=_bg, daemon=True).start()
@@ -1114,17 +1423,13 @@ def api_ollama_models(base_url: Optional[str] = None):
 
 @app.get("/api/tts/settings")
 def api_tts_get_settings():
-    session = SessionLocal()
-    try:
-        s = session.query(TTSSettings).filter_by(id=1).one_or_none()
-        return {
-            "enabled": bool(s.enabled) if s else False,
-            "base_url": s.base_url if s and s.base_url else DEFAULT_TTS_BASE,
-            "voice": s.voice if s else None,
-            "speed": s.speed if s and s.speed else 1.0,
-        }
-    finally:
-        session.close()
+    s = config_cache.tts()
+    return {
+        "enabled": s.enabled,
+        "base_url": s.base_url or DEFAULT_TTS_BASE,
+        "voice": s.voice,
+        "speed": s.speed or 1.0,
+    }
 
 
 @app.post("/api/tts/settings")
@@ -1150,6 +1455,7 @@ def api_tts_set_settings(payload: dict):
                 pass
         session.merge(s)
         session.commit()
+        config_cache.invalidate("tts")
         return {"status": "ok"}
     finally:
         session.close()
@@ -1158,12 +1464,8 @@ def api_tts_set_settings(payload: dict):
 @app.get("/api/tts/voices")
 def api_tts_voices(base_url: Optional[str] = None):
     # Prefer explicit base_url arg; fall back to settings; then env default
-    session = SessionLocal()
-    try:
-        s = session.query(TTSSettings).filter_by(id=1).one_or_none()
-        b = _normalize_tts_base(base_url) or (s.base_url if s and s.base_url else DEFAULT_TTS_BASE)
-    finally:
-        session.close()
+    s = config_cache.tts()
+    b = _normalize_tts_base(base_url) or s.base_url or DEFAULT_TTS_BASE
     client = TTSClient(base_url=b)
     voices = client.list_voices()
     if voices is None:
@@ -1190,8 +1492,8 @@ def api_tts_article(article_id: int, voice: Optional[str] = None):
     # Load TTS settings
     session = SessionLocal()
     try:
-        tset = session.query(TTSSettings).filter_by(id=1).one_or_none()
-        if not tset or not tset.enabled:
+        tset = config_cache.tts()
+        if not tset.enabled:
             return JSONResponse(status_code=400, content={"error": "tts not enabled"})
         a = session.query(Article).filter_by(id=article_id).one_or_none()
         if not a or not a.ai_body:
@@ -1212,15 +1514,10 @@ def api_tts_article(article_id: int, voice: Optional[str] = None):
 def api_tts_weather(voice: Optional[str] = None):
     session = SessionLocal()
     try:
-        tset = session.query(TTSSettings).filter_by(id=1).one_or_none()
-        if not tset or not tset.enabled:
+        tset = config_cache.tts()
+        if not tset.enabled:
             return JSONResponse(status_code=400, content={"error": "tts not enabled"})
-        w = (
-            session.query(WeatherReport)
-            .order_by(WeatherReport.fetched_at.desc())
-            .limit(1)
-            .one_or_none()
-        )
+        w = _latest_weather(session)
         if not w or not w.ai_report:
             return JSONResponse(status_code=404, content={"error": "weather report not found or empty"})
         txt = w.ai_report
@@ -1244,15 +1541,11 @@ def api_tts_preview(payload: dict):
         return JSONResponse(status_code=400, content={"error": "text required"})
     voice = (payload.get("voice") or None)
     base_url = _normalize_tts_base((payload.get("base_url") or None))
-    session = SessionLocal()
-    try:
-        tset = session.query(TTSSettings).filter_by(id=1).one_or_none()
-        if not (tset and tset.enabled):
-            return JSONResponse(status_code=400, content={"error": "tts not enabled"})
-        base = base_url or (tset.base_url or DEFAULT_TTS_BASE)
-        vv = voice or (tset.voice or None)
-    finally:
-        session.close()
+    tset = config_cache.tts()
+    if not tset.enabled:
+        return JSONResponse(status_code=400, content={"error": "tts not enabled"})
+    base = base_url or (tset.base_url or DEFAULT_TTS_BASE)
+    vv = voice or (tset.voice or None)
     client = TTSClient(base_url=base)
     wav = client.synthesize_wav(text, voice=vv)
     if wav is None:
@@ -1283,14 +1576,60 @@ def api_maintenance_rewrite_missing(limit: int | None = None):
     threading.Thread(target=_bg, daemon=True).start()
     return {"status": "queued"}
 
+@app.post("/api/maintenance/reindex-search")
+def api_maintenance_reindex_search():
+    """Rebuild the article full-text index from the articles table."""
+    try:
+        if not search.fts_enabled():
+            return JSONResponse(status_code=409, content={"status": "error", "detail": "full-text search unavailable"})
+        n = search.rebuild_index()
+        return {"status": "ok", "indexed": n}
+    except Exception as e:
+        logger.exception("maintenance_reindex_search_failed")
+        return JSONResponse(status_code=500, content={"status": "error", "detail": str(e)})
+
+
+@app.post("/api/maintenance/rebuild-cards")
+def api_maintenance_rebuild_cards():
+    """Rewrite every article card (list projection) from the articles table."""
+    try:
+        n = cards.rebuild_cards()
+        response_cache.bump("cards_rebuilt")
+        return {"status": "ok", "cards": n}
+    except Exception as e:
+        logger.exception("maintenance_rebuild_cards_failed")
+        return JSONResponse(status_code=500, content={"status": "error", "detail": str(e)})
+
+@app.post("/api/maintenance/retention")
+def api_maintenance_retention(dry_run: bool = False):
+    """Prune old weather reports, archive old articles and vacuum (see RETENTION_* env)."""
+    try:
+        res = maintenance.apply_retention(dry_run=dry_run)
+        return {"status": "ok", **res}
+    except Exception as e:
+        logger.exception("maintenance_retention_failed")
+        return JSONResponse(status_code=500, content={"status": "error", "detail": str(e)})
+
+
+@app.get("/api/maintenance/archive/{article_id}")
+def api_maintenance_archived_article(article_id: int):
+    """Read back an article moved to the archive by the retention job."""
+    session = SessionLocal()
+    try:
+        row = session.get(ArchivedArticle, article_id)
+        if row is None:
+            return JSONResponse(status_code=404, content={"error": "Archived article not found"})
+        return maintenance.read_archived(row)
+    finally:
+        session.close()
+
 # SPA fallback for client-side routes (avoids 404/blank on refresh)
 @app.get("/{full_path:path}", response_class=HTMLResponse, include_in_schema=False)
-def spa_fallback(full_path: str):
+def spa_fallback(full_path: str, request: Request):
     # Do not shadow API routes
     if full_path.startswith("api/") or full_path == "health":
         return JSONResponse(status_code=404, content={"detail": "Not found"})
-    static_index = os.path.join(static_dir, "index.html")
-    if os.path.exists(static_index):
+    if spa_index.available:
         logger.info("serve:spa_fallback", extra={"path": full_path})
-        return FileResponse(static_index)
+        return spa_index.response(request)
     return HTMLResponse("<html><body><h1>App not built</h1></body></html>", status_code=200)
@@ -1,12 +1,21 @@
 from __future__ import annotations
 
+import json
 import logging
-from typing import Dict, List, Tuple
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
 import re
+import sys
+import zlib
 from urllib.parse import urlsplit
 
-from .database import SessionLocal
-from .models import Article, AppSettings
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from .database import DB_PATH, SessionLocal, engine
+from .models import Article, ArchivedArticle, Bookmark, ChatMessage, WeatherReport
+from .config_cache import config_cache
+from .response_cache import response_cache
 from . import scheduler as scheduler_mod
 
 logger = logging.getLogger("app.maintenance")
@@ -169,6 +178,8 @@ def purge_duplicate_articles() -> dict:
                     )
                     deleted_ids.extend(dup_ids)
         session.commit()
+        if deleted_ids:
+            response_cache.bump("dedup")
         logger.info(
             "maintenance:dedup",
             extra={"deleted": len(deleted_ids), "groups": len(groups)},
@@ -194,9 +205,9 @@ def rewrite_missing_articles(limit: int | None = None) -> dict:
         to_fix: List[Article] = q.all()
 
         # Load current AI settings
-        aset = session.query(AppSettings).filter_by(id=1).one_or_none()
-        base_url = aset.ollama_base_url if aset and aset.ollama_base_url else None
-        model = aset.ollama_model if aset and aset.ollama_model else None
+        aset = config_cache.ai()
+        base_url = aset.ollama_base_url
+        model = aset.ollama_model
 
         # Report progress totals
         scheduler_mod.progress.phase('rewrite', f'Rewriting missing/fallback articles')
@@ -209,3 +220,223 @@ def rewrite_missing_articles(limit: int | None = None) -> dict:
         return {"rewritten": len(to_fix)}
     finally:
         session.close()
+
+
+# --- Retention -------------------------------------------------------------
+
+def _env_num(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.environ.get(name, str(default))))
+    except Exception:
+        return default
+
+
+def retention_settings() -> Dict[str, int]:
+    """Retention policy from env. A zero disables that step."""
+    return {
+        "weather_keep": _env_num("RETENTION_WEATHER_KEEP", 48),
+        "article_days": _env_num("RETENTION_ARTICLE_DAYS", 90),
+        "vacuum_pages": _env_num("RETENTION_VACUUM_PAGES", 0),
+    }
+
+
+def prune_weather_reports(keep: int, dry_run: bool = False) -> int:
+    """Delete all but the newest `keep` weather reports of each location."""
+    if keep <= 0:
+        return 0
+    session = SessionLocal()
+    try:
+        removed = 0
+        loc_ids = [r[0] for r in session.query(WeatherReport.location_id).distinct().all()]
+        for loc_id in loc_ids:
+            loc_filter = WeatherReport.location_id.is_(None) if loc_id is None else WeatherReport.location_id == loc_id
+            keep_ids = [
+                r[0] for r in session.query(WeatherReport.id)
+                .filter(loc_filter)
+                .order_by(WeatherReport.fetched_at.desc(), WeatherReport.id.desc())
+                .limit(keep)
+                .all()
+            ]
+            q = session.query(WeatherReport).filter(loc_filter, WeatherReport.id.notin_(keep_ids))
+            removed += q.count() if dry_run else q.delete(synchronize_session=False)
+        if not dry_run:
+            session.commit()
+        return removed
+    finally:
+        session.close()
+
+
+def _archive_payload(a: Article) -> bytes:
+    doc = {
+        "source_title": a.source_title,
+        "ai_title": a.ai_title,
+        "ai_body": a.ai_body,
+        "ai_model": a.ai_model,
+        "ai_generated_at": a.ai_generated_at.isoformat() if a.ai_generated_at else None,
+        "location": a.location,
+    }
+    return zlib.compress(json.dumps(doc, separators=(",", ":")).encode("utf-8"))
+
+
+def read_archived(row: ArchivedArticle) -> Dict[str, Any]:
+    """Decoded archive row: listing columns plus the compressed text fields."""
+    doc = json.loads(zlib.decompress(row.payload).decode("utf-8")) if row.payload else {}
+    return {
+        "id": row.id,
+        "source_url": row.source_url,
+        "source_name": row.source_name,
+        "title": row.title,
+        "image_url": row.image_url,
+        "location_id": row.location_id,
+        "published_at": row.published_at.isoformat() if row.published_at else None,
+        "fetched_at": row.fetched_at.isoformat() if row.fetched_at else None,
+        "archived_at": row.archived_at.isoformat() if row.archived_at else None,
+        **doc,
+    }
+
+
+def archive_old_articles(days: int, dry_run: bool = False, batch: int = 500) -> int:
+    """Move articles fetched more than `days` ago into `articles_archive`.
+
+    Bookmarked articles and articles with chat history stay in place.
+    """
+    if days <= 0:
+        return 0
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    session = SessionLocal()
+    try:
+        q = session.query(Article).filter(
+            Article.fetched_at < cutoff,
+            ~Article.id.in_(session.query(Bookmark.article_id)),
+            ~Article.id.in_(session.query(ChatMessage.article_id)),
+        )
+        if dry_run:
+            return q.count()
+        moved = 0
+        while True:
+            arts = q.order_by(Article.id).limit(batch).all()
+            if not arts:
+                return moved
+            # Archive rows are matched by URL. Article ids can be reused after a
+            # delete, so the article id is only kept when no other row has it.
+            ids = [a.id for a in arts]
+            taken = {r[0] for r in session.query(ArchivedArticle.id).filter(ArchivedArticle.id.in_(ids))}
+            for a in arts:
+                values = {
+                    "source_url": a.source_url,
+                    "source_name": a.source_name,
+                    "title": a.ai_title or a.source_title,
+                    "image_url": a.image_url,
+                    "location_id": a.location_id,
+                    "published_at": a.published_at,
+                    "fetched_at": a.fetched_at,
+                    "archived_at": datetime.utcnow(),
+                    "payload": _archive_payload(a),
+                }
+                stmt = sqlite_insert(ArchivedArticle).values(id=None if a.id in taken else a.id, **values)
+                session.execute(stmt.on_conflict_do_update(
+                    index_elements=[ArchivedArticle.source_url],
+                    set_={k: v for k, v in values.items() if k != "source_url"},
+                ))
+            session.query(Article).filter(Article.id.in_([a.id for a in arts])).delete(synchronize_session=False)
+            session.commit()
+            response_cache.bump("archive")
+            moved += len(arts)
+    finally:
+        session.close()
+
+
+def _file_bytes() -> int:
+    total = 0
+    for path in (DB_PATH, DB_PATH + "-wal"):
+        try:
+            total += os.path.getsize(path)
+        except OSError:
+            pass
+    return total
+
+
+def convert_to_incremental() -> Dict[str, Any]:
+    """Switch an older database to auto_vacuum=INCREMENTAL with a full VACUUM.
+
+    The VACUUM rewrites the whole file under an exclusive lock, so this is
+    only run offline: `python -m app.maintenance convert-vacuum`, or at
+    startup with SQLITE_CONVERT_AUTO_VACUUM=1. Does nothing when the
+    database is already incremental.
+    """
+    file_before = _file_bytes()
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if int(conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() or 0) == 2:
+            return {"converted_to_incremental": False, "file_bytes_before": file_before, "file_bytes_after": file_before}
+        conn.exec_driver_sql("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.exec_driver_sql("VACUUM")
+        conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    res = {"converted_to_incremental": True, "file_bytes_before": file_before, "file_bytes_after": _file_bytes()}
+    logger.info("auto_vacuum_converted", extra=res)
+    return res
+
+
+def incremental_vacuum(pages: int = 0) -> Dict[str, Any]:
+    """Return free pages to the filesystem and report what was reclaimed.
+
+    Only databases with auto_vacuum=INCREMENTAL can release pages this way;
+    older ones are reported with `incremental: false` until they are
+    converted (see `convert_to_incremental`). `pages=0` releases all of them.
+    """
+    file_before = _file_bytes()
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        page_size = int(conn.exec_driver_sql("PRAGMA page_size").scalar() or 4096)
+        pages_before = int(conn.exec_driver_sql("PRAGMA page_count").scalar() or 0)
+        free_before = int(conn.exec_driver_sql("PRAGMA freelist_count").scalar() or 0)
+        incremental = int(conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() or 0) == 2
+        if incremental:
+            conn.exec_driver_sql(f"PRAGMA incremental_vacuum({int(pages)})" if pages > 0 else "PRAGMA incremental_vacuum")
+        else:
+            logger.warning("auto_vacuum_not_incremental", extra={"hint": "python -m app.maintenance convert-vacuum"})
+        conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+        pages_after = int(conn.exec_driver_sql("PRAGMA page_count").scalar() or 0)
+    return {
+        "incremental": incremental,
+        "free_pages_before": free_before,
+        "pages_released": max(0, pages_before - pages_after),
+        "bytes_reclaimed": max(0, pages_before - pages_after) * page_size,
+        "file_bytes_before": file_before,
+        "file_bytes_after": _file_bytes(),
+    }
+
+
+def apply_retention(dry_run: bool = False) -> Dict[str, Any]:
+    """Run the retention policy: prune weather reports, archive old articles, vacuum.
+
+    With `dry_run` nothing is changed; the counts are what would be removed.
+    """
+    cfg = retention_settings()
+    res: Dict[str, Any] = {"dry_run": dry_run, **cfg}
+    res["weather_reports_deleted"] = prune_weather_reports(cfg["weather_keep"], dry_run=dry_run)
+    res["articles_archived"] = archive_old_articles(cfg["article_days"], dry_run=dry_run)
+    if not dry_run:
+        res.update(incremental_vacuum(cfg["vacuum_pages"]))
+    logger.info("retention_done", extra=res)
+    return res
+
+
+def _main(argv: List[str]) -> int:
+    import argparse
+    from .database import init_db
+
+    ap = argparse.ArgumentParser(prog="python -m app.maintenance", description="Database maintenance tools")
+    ap.add_argument(
+        "command", choices=["convert-vacuum"],
+        help="convert-vacuum: switch an older database to incremental auto-vacuum (full VACUUM; stop the app first)",
+    )
+    args = ap.parse_args(argv)
+    if args.command == "convert-vacuum":
+        init_db()
+        res = convert_to_incremental()
+        print("converted" if res["converted_to_incremental"] else "already incremental",
+              f"({res['file_bytes_before']:,} -> {res['file_bytes_after']:,} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
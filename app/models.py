@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from datetime import datetime
-from sqlalchemy import Integer, String, DateTime, Text, Boolean, Float, ForeignKey
+from datetime import datetime, timezone
+from sqlalchemy import BigInteger, LargeBinary, Integer, String, DateTime, Text, Boolean, Float, ForeignKey, Index, event, inspect
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .database import Base
@@ -17,6 +17,9 @@ class AppConfig(Base):
     timezone: Mapped[str | None] = mapped_column(String(100), nullable=True)
     source: Mapped[str | None] = mapped_column(String(100), nullable=True)
     resolved_at: Mapped[DateTime | None] = mapped_column(DateTime, nullable=True)
+    # Extra RSS feeds for this location (comma-separated); id=1 also uses FEED_EXTRA_URLS
+    feed_urls: Mapped[str | None] = mapped_column(Text, nullable=True)
+    enabled: Mapped[bool | None] = mapped_column(Boolean, nullable=True, default=True)
 
 
 class AppSettings(Base):
@@ -40,8 +43,49 @@ class TTSSettings(Base):
     speed: Mapped[float | None] = mapped_column(Float, nullable=True)  # 0.5-2.0
 
 
+# Undated articles sort after every dated one: their key is fetched_at shifted
+# far below any real timestamp (2**52 ms is ~140k years).
+UNDATED_SORT_OFFSET = 1 << 52
+# Every sort key below this belongs to an undated article
+UNDATED_SORT_BELOW = -(UNDATED_SORT_OFFSET >> 1)
+
+
+def epoch_ms(dt: datetime) -> int:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() * 1000)
+
+
+def article_sort_key(published_at: datetime | None, fetched_at: datetime | None) -> int | None:
+    """Feed order as one integer: published_at when known, else fetched_at placed below all dated rows."""
+    if published_at is not None:
+        return epoch_ms(published_at)
+    if fetched_at is not None:
+        return epoch_ms(fetched_at) - UNDATED_SORT_OFFSET
+    return None
+
+
+def sort_ts_from_key(sort_key: int | None) -> int | None:
+    """Epoch ms of published_at (or fetched_at for undated rows) from a sort key."""
+    if sort_key is None:
+        return None
+    return sort_key + UNDATED_SORT_OFFSET if sort_key < UNDATED_SORT_BELOW else sort_key
+
+
+def _sort_key_default(context) -> int | None:
+    params = context.get_current_parameters()
+    return article_sort_key(params.get("published_at"), params.get("fetched_at"))
+
+
 class Article(Base):
     __tablename__ = "articles"
+    __table_args__ = (
+        # Feed order and keyset pagination (see app/pagination.py); the
+        # location/source variants serve the filtered feeds without a sort.
+        Index("ix_articles_sort_key_id", "sort_key", "id"),
+        Index("ix_articles_location_sort_key", "location_id", "sort_key", "id"),
+        Index("ix_articles_source_sort_key", "source_name", "sort_key", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     source_url: Mapped[str] = mapped_column(String(1000), unique=True, index=True)
@@ -49,6 +93,7 @@ class Article(Base):
     source_title: Mapped[str | None] = mapped_column(String(500), nullable=True)
     image_url: Mapped[str | None] = mapped_column(String(1000), nullable=True)
     location: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    location_id: Mapped[int | None] = mapped_column(Integer, nullable=True, index=True)  # app_config.id
     published_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     fetched_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
@@ -59,13 +104,98 @@ class Article(Base):
     ai_generated_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
     is_published: Mapped[bool] = mapped_column(Boolean, default=True)
+    # article_sort_key(published_at, fetched_at); set on insert and whenever either changes
+    sort_key: Mapped[int | None] = mapped_column(BigInteger, nullable=True, default=_sort_key_default)
+
+
+@event.listens_for(Article, "before_update")
+def _refresh_sort_key(mapper, connection, target: Article) -> None:
+    state = inspect(target)
+    if state.attrs.published_at.history.has_changes() or state.attrs.fetched_at.history.has_changes():
+        target.sort_key = article_sort_key(target.published_at, target.fetched_at)
+
+
+class ArticleCard(Base):
+    """List-ready projection of an article, one row per `articles` row.
+
+    Kept by triggers on `articles`, with the excerpt and byline filled in
+    from Python (see app/cards.py), so it holds exactly what the list
+    endpoints return, already formatted. Dates are
+    ISO strings as the API sends them.
+    """
+
+    __tablename__ = "article_cards"
+    __table_args__ = (
+        Index("ix_article_cards_sort_key_id", "sort_key", "id"),
+        Index("ix_article_cards_location_sort_key", "location_id", "sort_key", "id"),
+        Index("ix_article_cards_source_sort_key", "source_name", "sort_key", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)  # articles.id
+    location_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    source_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    sort_key: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    title: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    source_url: Mapped[str | None] = mapped_column(String(1000), nullable=True)
+    image_url: Mapped[str | None] = mapped_column(String(1000), nullable=True)
+    published_at: Mapped[str | None] = mapped_column(String(40), nullable=True)
+    fetched_at: Mapped[str | None] = mapped_column(String(40), nullable=True)
+    sort_ts: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    ai_model: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    excerpt: Mapped[str | None] = mapped_column(Text, nullable=True)
+    byline: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    rewrite_note: Mapped[str | None] = mapped_column(String(255), nullable=True)
+
+
+class Source(Base):
+    """Per-location summary of one news source, kept current by triggers on `articles`.
+
+    `location_id` 0 stands for articles without a location. Extraction
+    counters come from the fetcher (app/sources.py) and survive a rebuild.
+    """
+
+    __tablename__ = "sources"
+
+    location_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(255), primary_key=True)
+    article_count: Mapped[int] = mapped_column(Integer, default=0)
+    # Highest articles.sort_key from this source (see sort_ts_from_key)
+    latest_sort_key: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    extract_attempts: Mapped[int] = mapped_column(Integer, default=0)
+    extract_ok: Mapped[int] = mapped_column(Integer, default=0)
+    last_extracted_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
+class ArchivedArticle(Base):
+    """Article moved out of `articles` by the retention job.
+
+    Listing fields stay as columns; the rewritten text is kept as
+    zlib-compressed JSON in `payload`. `raw_content` is dropped.
+    """
+
+    __tablename__ = "articles_archive"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)  # original articles.id
+    source_url: Mapped[str] = mapped_column(String(1000), unique=True, index=True)
+    source_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    title: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    image_url: Mapped[str | None] = mapped_column(String(1000), nullable=True)
+    location_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    published_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    fetched_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    payload: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
 
 
 class WeatherReport(Base):
     __tablename__ = "weather_reports"
+    __table_args__ = (
+        Index("ix_weather_reports_location_fetched", "location_id", "fetched_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     location: Mapped[str] = mapped_column(String(255), index=True)
+    location_id: Mapped[int | None] = mapped_column(Integer, nullable=True)  # app_config.id
     latitude: Mapped[float | None] = mapped_column(Float, nullable=True)
     longitude: Mapped[float | None] = mapped_column(Float, nullable=True)
     fetched_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -105,3 +235,92 @@ class Bookmark(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     article_id: Mapped[int] = mapped_column(Integer, ForeignKey("articles.id"), index=True, unique=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+
+
+class GeocodeCache(Base):
+    """Memoized geocoder answers keyed by normalized query. Misses have NULL coordinates."""
+
+    __tablename__ = "geocode_cache"
+
+    query: Mapped[str] = mapped_column(String(255), primary_key=True)
+    name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    admin1: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    latitude: Mapped[float | None] = mapped_column(Float, nullable=True)
+    longitude: Mapped[float | None] = mapped_column(Float, nullable=True)
+    timezone: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    source: Mapped[str | None] = mapped_column(String(20), nullable=True)  # 'gazetteer', 'openmeteo', 'miss'
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class HarvestRun(Base):
+    __tablename__ = "harvest_runs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    job_id: Mapped[str | None] = mapped_column(String(32), nullable=True, index=True)
+    trigger: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    status: Mapped[str] = mapped_column(String(20))
+    started_at: Mapped[datetime] = mapped_column(DateTime, index=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    ai_model: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # Phase durations in seconds
+    total_s: Mapped[float | None] = mapped_column(Float, nullable=True)
+    fetch_s: Mapped[float | None] = mapped_column(Float, nullable=True)
+    rewrite_s: Mapped[float | None] = mapped_column(Float, nullable=True)
+    rewrite_busy_s: Mapped[float | None] = mapped_column(Float, nullable=True)  # time spent inside rewrites
+    dedup_s: Mapped[float | None] = mapped_column(Float, nullable=True)
+    weather_s: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # Counts
+    feeds: Mapped[int] = mapped_column(Integer, default=0)
+    candidates: Mapped[int] = mapped_column(Integer, default=0)
+    fetched: Mapped[int] = mapped_column(Integer, default=0)
+    rewrites_ok: Mapped[int] = mapped_column(Integer, default=0)
+    rewrites_fallback: Mapped[int] = mapped_column(Integer, default=0)
+    dedup_deleted: Mapped[int] = mapped_column(Integer, default=0)
+    errors: Mapped[int] = mapped_column(Integer, default=0)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+
+class LeaderLease(Base):
+    """Which worker process owns the scheduler (see app/cluster.py)."""
+
+    __tablename__ = "leader_lease"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    holder: Mapped[str] = mapped_column(String(255))
+    expires_at: Mapped[float] = mapped_column(Float)  # epoch seconds
+    acquired_at: Mapped[float] = mapped_column(Float)
+
+
+class ClusterEvent(Base):
+    """Events relayed between worker processes: stream events and control messages."""
+
+    __tablename__ = "cluster_events"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    origin: Mapped[str] = mapped_column(String(255))
+    kind: Mapped[str] = mapped_column(String(10))  # 'bus' or 'ctl'
+    type: Mapped[str] = mapped_column(String(50))
+    data: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[float] = mapped_column(Float, index=True)
+
+
+class ClusterState(Base):
+    """Snapshots the leader publishes for other workers (status, jobs, command results)."""
+
+    __tablename__ = "cluster_state"
+
+    key: Mapped[str] = mapped_column(String(100), primary_key=True)
+    data: Mapped[str | None] = mapped_column(Text, nullable=True)
+    updated_at: Mapped[float] = mapped_column(Float, index=True)
+
+
+
+class RateLimitBucket(Base):
+    """Token bucket shared by worker processes (see app/ratelimit.py)."""
+
+    __tablename__ = "rate_limits"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)  # limiter, e.g. 'chat'
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)  # client, e.g. 'ip:article_id'
+    tokens: Mapped[float] = mapped_column(Float)
+    updated_at: Mapped[float] = mapped_column(Float, index=True)  # epoch seconds
@@ -2,19 +2,26 @@ from __future__ import annotations
 
 import os
 import re
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Tuple, Optional, Dict
+from typing import Callable, List, Tuple, Optional, Dict
 
 import feedparser
 import requests
 from bs4 import BeautifulSoup
 from dateutil import parser as dateparser
 from readability import Document
+from sqlalchemy.exc import IntegrityError
 
 from .database import SessionLocal
-from .models import Article
-from .geo import location_keywords
+from .models import Article, ArchivedArticle
+from .geo import location_keywords, location_feed_urls
+from .config_cache import LocationConfig
+from .pools import fetch_slots
 from .progress import progress
+from .response_cache import response_cache
+from .sources import record_extraction
 import logging
 
 logger = logging.getLogger("app.fetcher")
@@ -53,11 +60,11 @@ def normalize_url(url: str) -> str:
         return url
 
 
-def build_google_news_feeds(location: str) -> List[str]:
+def build_google_news_feeds(location: str, cfg: Optional[LocationConfig] = None) -> List[str]:
     from urllib.parse import quote_plus
 
     # Generate seeds from resolved location automatically
-    seeds = location_keywords()
+    seeds = location_keywords(cfg)
     feeds = []
     suffixes = ["", " local news", " breaking", " news"]
     for q in seeds[:6]:
@@ -81,9 +88,9 @@ def build_google_news_feeds(location: str) -> List[str]:
     return uniq[:10]
 
 
-def build_bing_news_feeds(location: str) -> List[str]:
+def build_bing_news_feeds(location: str, cfg: Optional[LocationConfig] = None) -> List[str]:
     from urllib.parse import quote_plus
-    seeds = location_keywords()
+    seeds = location_keywords(cfg)
     feeds: List[str] = []
     for q in seeds[:6]:
         q2 = quote_plus(f"{q} local news")
@@ -162,7 +169,9 @@ def _extract_image_url(html: str) -> Optional[str]:
 
 def fetch_article_content(url: str) -> Tuple[Optional[str], Optional[str]]:
     try:
-        resp = requests.get(url, headers=_headers(), timeout=20)
+        # Shared across locations so concurrent harvests respect HARVEST_FETCH_WORKERS
+        with fetch_slots:
+            resp = requests.get(url, headers=_headers(), timeout=20)
         if resp.status_code != 200:
             return None, None
         html = resp.text
@@ -189,21 +198,110 @@ def fetch_article_content(url: str) -> Tuple[Optional[str], Optional[str]]:
         return None, None
 
 
-def gather_candidates(location: str) -> List[Dict]:
+# Conditional GET validators per feed URL and a bounded set of feed entries
+# already seen, so adaptive polls can count genuinely new items cheaply.
+_FEED_LOCK = threading.Lock()
+_FEED_VALIDATORS: Dict[str, Dict[str, str]] = {}
+_SEEN_ENTRIES: "OrderedDict[str, None]" = OrderedDict()
+_SEEN_MAX = 5000
+MAX_FEEDS = 12
+
+
+def feed_urls_for(location: str, cfg: Optional[LocationConfig] = None) -> List[str]:
+    """Feeds to harvest and poll for a location: its own feeds first, then search feeds.
+
+    MAX_FEEDS caps only the generated Bing/Google search feeds; feeds a
+    user configured (per-location `feed_urls`, FEED_EXTRA_URLS) are always
+    included.
+    """
+    custom = location_feed_urls(cfg) if cfg is not None else []
+    # FEED_EXTRA_URLS belongs to the primary location
+    if cfg is None or cfg.id in (None, 1):
+        custom += extra_feed_urls()
     # Prefer Bing (less likely to 503) before Google
-    feeds = build_bing_news_feeds(location) + build_google_news_feeds(location) + extra_feed_urls()
+    generated = (build_bing_news_feeds(location, cfg) + build_google_news_feeds(location, cfg))[:MAX_FEEDS]
+    return list(dict.fromkeys(custom + generated))
+
+
+def _fetch_feed(feed_url: str, *, conditional: bool = False):
+    """GET and parse a feed, remembering ETag/Last-Modified.
+
+    With `conditional=True` the stored validators are sent and None is
+    returned on 304 Not Modified (or any failure).
+    """
+    headers = {"User-Agent": USER_AGENT}
+    if conditional:
+        with _FEED_LOCK:
+            v = dict(_FEED_VALIDATORS.get(feed_url) or {})
+        if v.get("etag"):
+            headers["If-None-Match"] = v["etag"]
+        if v.get("last_modified"):
+            headers["If-Modified-Since"] = v["last_modified"]
+    with fetch_slots:
+        r = requests.get(feed_url, headers=headers, timeout=6)
+    if r.status_code == 304:
+        return None
+    if r.status_code != 200:
+        logger.warning("feed_http_status", extra={"url": feed_url, "status": r.status_code})
+        return None
+    validators = {}
+    if r.headers.get("ETag"):
+        validators["etag"] = r.headers["ETag"]
+    if r.headers.get("Last-Modified"):
+        validators["last_modified"] = r.headers["Last-Modified"]
+    with _FEED_LOCK:
+        _FEED_VALIDATORS[feed_url] = validators
+    return feedparser.parse(r.content)
+
+
+def _entry_key(e) -> Optional[str]:
+    return e.get("id") or e.get("link")
+
+
+def _mark_seen(keys: List[str]) -> int:
+    """Record entry keys; returns how many were not seen before."""
+    fresh = 0
+    with _FEED_LOCK:
+        for k in keys:
+            if k in _SEEN_ENTRIES:
+                _SEEN_ENTRIES.move_to_end(k)
+                continue
+            _SEEN_ENTRIES[k] = None
+            fresh += 1
+        while len(_SEEN_ENTRIES) > _SEEN_MAX:
+            _SEEN_ENTRIES.popitem(last=False)
+    return fresh
+
+
+def poll_new_entries(location: str, cfg: Optional[LocationConfig] = None) -> int:
+    """Lightweight feed-only poll: conditional GETs, no article fetches or redirects.
+
+    Returns the number of feed entries not seen by any earlier poll or
+    harvest. Unchanged feeds answer 304 and cost almost nothing.
+    """
+    fresh = 0
+    for feed_url in feed_urls_for(location, cfg):
+        try:
+            parsed = _fetch_feed(feed_url, conditional=True)
+        except Exception as e:
+            logger.warning("feed_poll_error", extra={"url": feed_url, "error": str(e)})
+            continue
+        if parsed is None:
+            continue
+        fresh += _mark_seen([k for k in (_entry_key(e) for e in parsed.entries) if k])
+    return fresh
+
+
+def gather_candidates(location: str, cfg: Optional[LocationConfig] = None) -> List[Dict]:
+    feeds = feed_urls_for(location, cfg)
     items: List[Dict] = []
     logger.info("feeds_start", extra={"count": len(feeds)})
-    max_feeds = 12
-    for i, feed_url in enumerate(feeds):
-        if i >= max_feeds:
-            break
+    progress.stage_inc('fetch', 'feeds', len(feeds))
+    for feed_url in feeds:
         try:
-            r = requests.get(feed_url, headers={"User-Agent": USER_AGENT}, timeout=6)
-            if r.status_code != 200:
-                logger.warning("feed_http_status", extra={"url": feed_url, "status": r.status_code})
+            parsed = _fetch_feed(feed_url)
+            if parsed is None:
                 continue
-            parsed = feedparser.parse(r.content)
             try:
                 logger.info("feed_ok", extra={"url": feed_url, "entries": len(parsed.entries)})
             except Exception:
@@ -211,6 +309,7 @@ def gather_candidates(location: str) -> List[Dict]:
         except Exception as e:
             logger.warning("feed_error", extra={"url": feed_url, "error": str(e)})
             continue
+        _mark_seen([k for k in (_entry_key(e) for e in parsed.entries) if k])
         for e in parsed.entries:
             url = normalize_url(_extract_final_url_from_entry(e))
             if not url:
@@ -242,26 +341,53 @@ def gather_candidates(location: str) -> List[Dict]:
     return out
 
 
-def fetch_new_articles(min_count: int, location: str) -> List[Article]:
+def fetch_new_articles(
+    min_count: int,
+    location: str,
+    on_created: Optional[Callable[[Article], None]] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+    cfg: Optional[LocationConfig] = None,
+) -> List[Article]:
+    """Fetch and store new articles for the location.
+
+    When `on_created` is given it is called with each article (detached from
+    this session) right after it is stored, so a consumer can start rewriting
+    while fetching continues. `should_stop` is polled between articles so a
+    cancelled harvest stops fetching early. `cfg` selects the location (seeds,
+    per-location feeds, location_id); the primary location is used when omitted.
+    """
     session = SessionLocal()
     created: List[Article] = []
+    # Per source name: [content fetches, usable extractions], for the sources summary
+    extraction: Dict[str, List[int]] = {}
     try:
         progress.phase('fetch', 'Gathering RSS candidates')
-        candidates = gather_candidates(location)
+        candidates = gather_candidates(location, cfg)
         progress.phase('fetch', f'Found {len(candidates)} candidates')
         # Filter out URLs we already have (consider normalized forms)
         existing_raw = [u for (u,) in session.query(Article.source_url).all()]
+        existing_raw += [u for (u,) in session.query(ArchivedArticle.source_url).all()]
         existing_norm = { normalize_url(u) for u in existing_raw }
         existing_all = set(existing_raw) | existing_norm
         new_items = [c for c in candidates if normalize_url(c["url"]) not in existing_all]
         logger.info("new_items", extra={"count": len(new_items)})
+        progress.stage_inc('fetch', 'candidates', len(candidates))
+        progress.stage_inc('fetch', 'new', len(new_items))
 
         for idx, item in enumerate(new_items, start=1):
             if len(created) >= min_count:
                 break
+            if should_stop is not None and should_stop():
+                logger.info("fetch_stopped", extra={"count": len(created)})
+                break
             progress.phase('fetch', f'Fetching content {idx}/{len(new_items)}')
             content, image_url = fetch_article_content(item["url"])
-            if not content or len(content) < 120:
+            ok = bool(content) and len(content) >= 120
+            if item.get("source_name"):
+                counts = extraction.setdefault(item["source_name"], [0, 0])
+                counts[0] += 1
+                counts[1] += int(ok)
+            if not ok:
                 continue
             art = Article(
                 source_url=item["url"],
@@ -269,14 +395,30 @@ def fetch_new_articles(min_count: int, location: str) -> List[Article]:
                 source_name=item.get("source_name"),
                 published_at=item.get("published"),
                 location=location,
+                location_id=(cfg.id if cfg is not None else 1),
                 raw_content=content,
                 image_url=image_url,
             )
             session.add(art)
-            session.commit()
+            try:
+                session.commit()
+            except IntegrityError:
+                # Another location's producer stored the same URL first
+                session.rollback()
+                continue
             session.refresh(art)
+            response_cache.bump("article_created")
+            # Detach so the rewrite consumer can attach it to its own session
+            session.expunge(art)
             created.append(art)
+            progress.stage_inc('fetch', 'fetched')
+            if on_created is not None:
+                on_created(art)
         logger.info("created_articles", extra={"count": len(created)})
         return created
     finally:
         session.close()
+        try:
+            record_extraction(cfg.id if cfg is not None else 1, {k: (v[0], v[1]) for k, v in extraction.items()})
+        except Exception:
+            logger.exception("record_extraction_failed")
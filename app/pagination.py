@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import base64
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from sqlalchemy import BigInteger, DateTime, Integer, literal, tuple_
+
+from .models import Article, Bookmark, UNDATED_SORT_BELOW
+
+
+class CursorError(ValueError):
+    """Raised for a cursor that cannot be decoded or belongs to another sort order."""
+
+
+def encode_cursor(data: Dict[str, Any]) -> str:
+    raw = json.dumps(data, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        pad = "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(cursor + pad))
+        if not isinstance(data, dict):
+            raise ValueError
+        return data
+    except Exception:
+        raise CursorError("invalid cursor")
+
+
+def _dt(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def article_key(a) -> Dict[str, Any]:
+    return {"k": a.sort_key, "i": a.id}
+
+
+def _row(*values):
+    return tuple_(*values)
+
+
+def keyset_articles(query, sort_by: str, cursor: Optional[Dict[str, Any]], limit: int,
+                    model=Article) -> Tuple[list, Optional[str]]:
+    """One page of articles in date order after `cursor`, plus the next cursor.
+
+    Seeks on (sort_key, id) over the (sort_key, id) index of `model`
+    (`Article` or `ArticleCard`), so deep pages cost the same as page 1.
+    Newest-first is a single range; oldest-first still lists undated
+    articles last, so it walks the dated range and then the undated one.
+    """
+    desc = sort_by != "date_asc"
+    base = query.order_by(None)
+    pos = (cursor or {}).get("k")
+    if pos is not None:
+        try:
+            pos = (int(pos["k"]), int(pos["i"]))
+        except (KeyError, TypeError, ValueError):
+            raise CursorError("invalid cursor")
+    lhs = _row(model.sort_key, model.id)
+
+    def _page(q, n: int) -> list:
+        if pos is not None:
+            rhs = _row(literal(pos[0], BigInteger), literal(pos[1], Integer))
+            q = q.filter(lhs < rhs if desc else lhs > rhs)
+        order = (model.sort_key.desc(), model.id.desc()) if desc else (model.sort_key.asc(), model.id.asc())
+        return q.order_by(*order).limit(n).all()
+
+    if desc:
+        rows = _page(base, limit + 1)
+    else:
+        rows = []
+        if pos is None or pos[0] >= UNDATED_SORT_BELOW:
+            rows = _page(base.filter(model.sort_key >= UNDATED_SORT_BELOW), limit + 1)
+            pos = None
+        if len(rows) <= limit:
+            rows += _page(base.filter(model.sort_key < UNDATED_SORT_BELOW), limit + 1 - len(rows))
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor({"s": sort_by, "k": article_key(rows[-1])})
+    return rows, None
+
+
+def keyset_bookmarks(query, cursor: Optional[Dict[str, Any]], limit: int, offset: int = 0) -> Tuple[list, Optional[str]]:
+    """Bookmarked articles, newest bookmark first, after `cursor`.
+
+    `query` must select Article (or ArticleCard) joined to Bookmark. Ordered by
+    (bookmarks.created_at, bookmarks.id), which the created_at index covers.
+    `offset` is only for page mode, which still hands out a cursor.
+    """
+    q = query.order_by(None).add_columns(Bookmark.created_at, Bookmark.id)
+    pos = (cursor or {}).get("k")
+    if pos is not None:
+        try:
+            created, bid = _dt(pos["c"]), int(pos["b"])
+        except (KeyError, TypeError, ValueError):
+            raise CursorError("invalid cursor")
+        q = q.filter(
+            _row(Bookmark.created_at, Bookmark.id)
+            < _row(literal(created, DateTime), literal(bid, Integer))
+        )
+    rows = q.order_by(Bookmark.created_at.desc(), Bookmark.id.desc()).offset(offset or None).limit(limit + 1).all()
+    nxt = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        _, created, bid = rows[-1]
+        nxt = encode_cursor({"s": "bookmarks", "k": {"c": created.isoformat() if created else None, "b": bid}})
+    return [r[0] for r in rows], nxt
+
+
+def offset_page(query, sort_by: str, cursor: Optional[Dict[str, Any]], limit: int) -> Tuple[list, Optional[str]]:
+    """Cursor paging for orders without a keyset (source, title, relevance)."""
+    try:
+        offset = max(0, int((cursor or {}).get("o") or 0))
+    except (TypeError, ValueError):
+        raise CursorError("invalid cursor")
+    rows = query.offset(offset).limit(limit + 1).all()
+    if len(rows) > limit:
+        return rows[:limit], encode_cursor({"s": sort_by, "o": offset + limit})
+    return rows, None
+
+
+class TotalCache:
+    """Short-lived cache of `count()` results keyed by filter parameters.
+
+    Infinite scroll asks for the same total on every page; an exact count is
+    linear in table size, so it is reused for ARTICLES_TOTAL_TTL_S seconds.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self._lock = threading.Lock()
+        self._data: Dict[Hashable, Tuple[float, int]] = {}
+        self._max = max_entries
+
+    @staticmethod
+    def ttl_s() -> float:
+        try:
+            return max(0.0, float(os.environ.get("ARTICLES_TOTAL_TTL_S", "30")))
+        except Exception:
+            return 30.0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], int]) -> int:
+        ttl = self.ttl_s()
+        now = time.monotonic()
+        with self._lock:
+            hit = self._data.get(key)
+            if hit and now - hit[0] < ttl:
+                return hit[1]
+        value = int(compute())
+        with self._lock:
+            if len(self._data) >= self._max:
+                # Drop the oldest entry
+                oldest = min(self._data, key=lambda k: self._data[k][0])
+                self._data.pop(oldest, None)
+            self._data[key] = (now, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+totals = TotalCache()
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Deque, Hashable, Optional
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ.get(name, str(default))))
+    except Exception:
+        return default
+
+
+# Shared across all locations in a harvest so adding towns does not multiply
+# outbound connections or Ollama load.
+FETCH_WORKERS = _env_int("HARVEST_FETCH_WORKERS", 4)
+LLM_WORKERS = _env_int("HARVEST_LLM_WORKERS", 1)
+
+# Slots for outbound feed/article requests. Waiters are woken in FIFO order,
+# so per-location producers take turns when the pool is saturated.
+fetch_slots = threading.BoundedSemaphore(FETCH_WORKERS)
+
+
+class FairQueue:
+    """Blocking multi-producer queue that serves keys round-robin.
+
+    Each key (a location) has its own FIFO; `get` rotates across keys so one
+    busy town cannot starve the others of LLM time. `get` returns None once
+    the queue is closed and drained.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._queues: "OrderedDict[Hashable, Deque[Any]]" = OrderedDict()
+        self._closed = False
+
+    def put(self, key: Hashable, item: Any) -> None:
+        with self._cond:
+            self._queues.setdefault(key, deque()).append(item)
+            self._cond.notify()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def get(self) -> Optional[Any]:
+        with self._cond:
+            while True:
+                for key in list(self._queues.keys()):
+                    q = self._queues[key]
+                    if q:
+                        item = q.popleft()
+                        # Move the served key to the back for round-robin order
+                        self._queues.move_to_end(key)
+                        return item
+                if self._closed:
+                    return None
+                self._cond.wait()
+
+    def pending(self) -> int:
+        with self._cond:
+            return sum(len(q) for q in self._queues.values())
@@ -21,6 +21,8 @@ class RunStatus:
     current_id: Optional[int] = None
     current_title: Optional[str] = None
     current_url: Optional[str] = None
+    # Per-stage counters for the pipelined harvest, e.g. {'fetch': {'fetched': 3}, 'rewrite': {'done': 2}}
+    stages: Optional[Dict[str, Dict[str, int]]] = None
 
 
 class Progress:
@@ -41,20 +43,31 @@ class Progress:
     def _get_timezone(self) -> str | None:
         """Get the configured location timezone."""
         try:
-            from .geo import resolve_location
-            cfg = resolve_location()
+            from .config_cache import config_cache
+            cfg = config_cache.location()
             return cfg.timezone if cfg and cfg.timezone else None
         except Exception:
             return None
 
+    def _publish(self) -> None:
+        """Push the current snapshot to event stream clients (call outside the lock)."""
+        try:
+            from .events import bus
+            bus.publish("progress", self.snapshot())
+        except Exception:
+            pass
+
     def reset(self) -> None:
         with self._lock:
             self._state = RunStatus()
+        self._publish()
 
     def start(self) -> None:
+        # Resolve timezone before taking the lock; it may hit the database
+        tz = self._get_timezone()
         with self._lock:
-            tz = self._get_timezone()
             self._state = RunStatus(running=True, started_at=self._now(tz))
+        self._publish()
 
     def phase(self, name: str, detail: Optional[str] = None) -> None:
         with self._lock:
@@ -64,22 +77,49 @@ class Progress:
             if name != 'rewrite':
                 self._state.total = self._state.total if name == 'rewrite' else self._state.total
                 self._state.completed = self._state.completed if name == 'rewrite' else self._state.completed
+        self._publish()
 
     def set_rewrite_total(self, total: int) -> None:
         with self._lock:
             self._state.total = int(total)
             self._state.completed = 0
+        self._publish()
+
+    def add_rewrite_total(self, n: int = 1) -> None:
+        """Grow the rewrite total as articles are queued while fetching continues."""
+        with self._lock:
+            self._state.total = (self._state.total or 0) + int(n)
+            if self._state.completed is None:
+                self._state.completed = 0
+        self._publish()
 
     def inc_rewrite(self, n: int = 1) -> None:
         with self._lock:
             if self._state.completed is None:
                 self._state.completed = 0
             self._state.completed += int(n)
+        self._publish()
+
+    def stage(self, name: str, **counts: int) -> None:
+        """Set counters for a pipeline stage (fetch, rewrite, weather)."""
+        with self._lock:
+            stages = self._state.stages if self._state.stages is not None else {}
+            stages.setdefault(name, {}).update({k: int(v) for k, v in counts.items()})
+            self._state.stages = stages
+        self._publish()
+
+    def stage_inc(self, name: str, key: str, n: int = 1) -> None:
+        with self._lock:
+            stages = self._state.stages if self._state.stages is not None else {}
+            st = stages.setdefault(name, {})
+            st[key] = st.get(key, 0) + int(n)
+            self._state.stages = stages
+        self._publish()
 
     def finish(self, error: Optional[str] = None) -> None:
+        tz = self._get_timezone()
         with self._lock:
             self._state.running = False
-            tz = self._get_timezone()
             self._state.finished_at = self._now(tz)
             if error:
                 self._state.error = error
@@ -87,12 +127,14 @@ class Progress:
             self._state.current_id = None
             self._state.current_title = None
             self._state.current_url = None
+        self._publish()
 
     def set_current(self, *, art_id: Optional[int], title: Optional[str], url: Optional[str]) -> None:
         with self._lock:
             self._state.current_id = art_id
             self._state.current_title = title
             self._state.current_url = url
+        self._publish()
 
     def snapshot(self) -> Dict[str, Any]:
         with self._lock:
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+import logging
+
+from sqlalchemy import text
+
+from .database import engine
+
+logger = logging.getLogger("app.ratelimit")
+
+
+def _env_int(name: str, default: int, low: int = 1) -> int:
+    try:
+        return max(low, int(os.environ.get(name, str(default))))
+    except Exception:
+        return default
+
+
+def backend_name() -> str:
+    """RATE_LIMIT_BACKEND=memory/sqlite forces one; 'auto' (default) shares buckets when leader election is on."""
+    mode = (os.environ.get("RATE_LIMIT_BACKEND", "auto") or "auto").strip().lower()
+    if mode in ("memory", "sqlite"):
+        return mode
+    from .cluster import election_enabled
+    return "sqlite" if election_enabled() else "memory"
+
+
+class TokenBucketLimiter:
+    """Token buckets per client key, e.g. `ip` or `ip:article_id`.
+
+    A bucket holds up to `per_minute` tokens and refills continuously at
+    `per_minute` per 60 s; each allowed request takes one. With the memory
+    backend buckets live in a bounded LRU (RATE_LIMIT_MAX_KEYS) and full
+    ones are swept every RATE_LIMIT_SWEEP_S, since a full bucket is the same
+    as no bucket. The sqlite backend keeps them in `rate_limits`, updated in
+    one UPSERT per request, so every worker process draws from the same
+    bucket. If the database is unavailable the memory backend answers.
+    """
+
+    def __init__(self, name: str, per_minute: int) -> None:
+        self.name = name
+        self.capacity = float(max(1, per_minute))
+        self.rate = self.capacity / 60.0  # tokens per second
+        self._lock = threading.Lock()
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()  # key -> (tokens, updated)
+        self._next_sweep = 0.0
+
+    @property
+    def refill_s(self) -> float:
+        """Seconds an empty bucket takes to fill up again."""
+        return self.capacity / self.rate
+
+    def hit(self, key: str) -> bool:
+        """Take a token for `key`. Returns True when the request is over the limit."""
+        key = key or "-"
+        now = time.time()
+        limited: Optional[bool] = None
+        if backend_name() == "sqlite":
+            try:
+                limited = self._hit_sqlite(key, now)
+            except Exception:
+                logger.warning("rate_limit_db_failed", extra={"limiter": self.name}, exc_info=True)
+        if limited is None:
+            limited = self._hit_memory(key, now)
+        self._maybe_sweep(now)
+        return limited
+
+    def _hit_memory(self, key: str, now: float) -> bool:
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+            limited = tokens < 1.0
+            if not limited:
+                tokens -= 1.0
+            self._buckets[key] = (tokens, now)
+            limit = _env_int("RATE_LIMIT_MAX_KEYS", 10000)
+            # The least recently seen bucket is the most refilled one, so dropping it errs towards allowing
+            while len(self._buckets) > limit:
+                self._buckets.popitem(last=False)
+        return limited
+
+    def _hit_sqlite(self, key: str, now: float) -> bool:
+        params = {"name": self.name, "key": key, "now": now, "cap": self.capacity, "rate": self.rate}
+        with engine.begin() as conn:
+            # Refill and take in one statement; the DO UPDATE only applies while a token is left
+            res = conn.execute(text(
+                "INSERT INTO rate_limits (name, key, tokens, updated_at) VALUES (:name, :key, :cap - 1, :now) "
+                "ON CONFLICT (name, key) DO UPDATE SET "
+                "tokens = min(:cap, tokens + (:now - updated_at) * :rate) - 1, updated_at = :now "
+                "WHERE min(:cap, tokens + (:now - updated_at) * :rate) >= 1"
+            ), params)
+        return res.rowcount == 0
+
+    def _maybe_sweep(self, now: float) -> None:
+        with self._lock:
+            if now < self._next_sweep:
+                return
+            self._next_sweep = now + _env_int("RATE_LIMIT_SWEEP_S", 60)
+        try:
+            self.sweep(now)
+        except Exception:
+            logger.warning("rate_limit_sweep_failed", extra={"limiter": self.name}, exc_info=True)
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Drop buckets that have refilled completely. Returns how many were dropped."""
+        now = time.time() if now is None else now
+        cutoff = now - self.refill_s
+        with self._lock:
+            idle = [k for k, (_, updated) in self._buckets.items() if updated <= cutoff]
+            for k in idle:
+                del self._buckets[k]
+        dropped = len(idle)
+        if backend_name() == "sqlite":
+            with engine.begin() as conn:
+                dropped += conn.execute(
+                    text("DELETE FROM rate_limits WHERE name = :name AND updated_at <= :cutoff"),
+                    {"name": self.name, "cutoff": cutoff},
+                ).rowcount
+                conn.execute(text(
+                    "DELETE FROM rate_limits WHERE name = :name AND key IN ("
+                    "SELECT key FROM rate_limits WHERE name = :name ORDER BY updated_at DESC LIMIT -1 OFFSET :keep)"
+                ), {"name": self.name, "keep": _env_int("RATE_LIMIT_MAX_KEYS", 10000)})
+        return dropped
+
+
+chat_limiter = TokenBucketLimiter("chat", _env_int("CHAT_RATE_LIMIT_PER_MIN", 10))
+logs_limiter = TokenBucketLimiter("logs", _env_int("LOGS_RATE_LIMIT_PER_MIN", 10))
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, NamedTuple, Optional
+import logging
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+
+logger = logging.getLogger("app.response_cache")
+
+
+class _Entry(NamedTuple):
+    generation: int
+    etag: str
+    body: bytes
+
+
+def _etag(body: bytes) -> str:
+    # Strong validator from the bytes themselves, so every worker hands out
+    # the same tag for the same payload whatever its local generation is
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 asks for GET)."""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """Serialized JSON responses keyed by endpoint and query parameters.
+
+    Entries are tagged with the data generation they were built at. Anything
+    that changes what the cached endpoints return (harvest writes, dedup,
+    retention, bookmarks, settings and location writes) calls `bump`, which
+    makes every older entry stale at once instead of tracking which keys it
+    touched.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._not_modified = 0
+
+    @staticmethod
+    def enabled() -> bool:
+        return os.environ.get("RESPONSE_CACHE", "1").lower() not in ("0", "false", "no", "off")
+
+    @staticmethod
+    def max_entries() -> int:
+        try:
+            return max(1, int(os.environ.get("RESPONSE_CACHE_SIZE", "256")))
+        except Exception:
+            return 256
+
+    @property
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def bump(self, reason: str = "", broadcast: bool = True) -> int:
+        """Mark all cached responses stale. Returns the new generation.
+
+        Other worker processes bump theirs too unless `broadcast` is False
+        (used when applying such a message).
+        """
+        if broadcast:
+            from .cluster import cluster
+            cluster.broadcast("data_changed", {"reason": reason})
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+            gen = self._generation
+        logger.debug("response_cache_bump", extra={"reason": reason, "generation": gen})
+        return gen
+
+    def get(self, key: Hashable) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry.generation != self._generation:
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return entry
+
+    def put(self, key: Hashable, generation: int, body: bytes) -> _Entry:
+        entry = _Entry(generation, _etag(body), body)
+        with self._lock:
+            # Built from data older than the latest bump: serve it, don't keep it
+            if generation != self._generation:
+                return entry
+            self._data[key] = entry
+            self._data.move_to_end(key)
+            limit = self.max_entries()
+            while len(self._data) > limit:
+                self._data.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled(),
+                "generation": self._generation,
+                "entries": len(self._data),
+                "bytes": sum(len(e.body) for e in self._data.values()),
+                "hits": self._hits,
+                "misses": self._misses,
+                "not_modified": self._not_modified,
+            }
+
+    def _respond(self, request, entry: _Entry, state: str) -> Response:
+        headers = {"ETag": entry.etag, "Cache-Control": "no-cache", "X-Cache": state}
+        if _matches(request.headers.get("if-none-match"), entry.etag):
+            with self._lock:
+                self._not_modified += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    async def respond(self, request, produce: Callable[[], Awaitable[Any]]) -> Response:
+        """Serve `request` from the cache, or build it with `produce` and cache the JSON.
+
+        `produce` returns the payload (anything FastAPI can encode) or a
+        ready `Response`, which is passed through uncached (errors). Either
+        way a matching `If-None-Match` gets a bodiless 304.
+        """
+        key = (request.url.path, tuple(sorted(request.query_params.multi_items())))
+        use_cache = self.enabled()
+        if use_cache:
+            entry = self.get(key)
+            if entry is not None:
+                return self._respond(request, entry, "hit")
+        generation = self.generation
+        payload = await produce()
+        if isinstance(payload, Response):
+            return payload
+        body = JSONResponse(content=jsonable_encoder(payload)).body
+        if use_cache:
+            entry = self.put(key, generation, body)
+        else:
+            entry = _Entry(generation, _etag(body), body)
+        return self._respond(request, entry, "miss")
+
+
+response_cache = ResponseCache()
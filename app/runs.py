@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from datetime import datetime
+from statistics import median
+from typing import Any, Dict, List, Optional
+import logging
+
+from .database import SessionLocal
+from .models import HarvestRun
+
+logger = logging.getLogger("app.runs")
+
+PHASES = ("fetch", "rewrite", "dedup", "weather")
+
+
+def _parse_iso(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except Exception:
+        return None
+
+
+def record_run(job) -> Optional[int]:
+    """Persist a finished `jobs.HarvestJob` as a HarvestRun row."""
+    d = job.to_dict()
+    res = d.get("result") or {}
+    phases = d.get("phases") or {}
+    started = _parse_iso(d.get("started_at")) or datetime.utcnow()
+    finished = _parse_iso(d.get("finished_at"))
+    session = SessionLocal()
+    try:
+        run = HarvestRun(
+            job_id=d.get("id"),
+            trigger=d.get("trigger"),
+            status=d.get("status") or "unknown",
+            started_at=started,
+            finished_at=finished,
+            ai_model=res.get("ai_model"),
+            total_s=round((finished - started).total_seconds(), 3) if finished else None,
+            fetch_s=phases.get("fetch"),
+            rewrite_s=phases.get("rewrite"),
+            rewrite_busy_s=res.get("rewrite_busy_s"),
+            dedup_s=phases.get("dedup"),
+            weather_s=phases.get("weather"),
+            feeds=int(res.get("feeds") or 0),
+            candidates=int(res.get("candidates") or 0),
+            fetched=int(res.get("fetched") or 0),
+            rewrites_ok=int(res.get("rewrites_ok") or 0),
+            rewrites_fallback=int(res.get("rewrites_fallback") or 0),
+            dedup_deleted=int(res.get("dedup_deleted") or 0),
+            errors=int(res.get("errors") or 0) + (1 if d.get("status") == "failed" else 0),
+            error=d.get("error"),
+        )
+        session.add(run)
+        session.commit()
+        return run.id
+    finally:
+        session.close()
+
+
+def _run_to_dict(r: HarvestRun) -> Dict[str, Any]:
+    rewrites = (r.rewrites_ok or 0) + (r.rewrites_fallback or 0)
+    return {
+        "id": r.id,
+        "job_id": r.job_id,
+        "trigger": r.trigger,
+        "status": r.status,
+        "started_at": r.started_at.isoformat() if r.started_at else None,
+        "finished_at": r.finished_at.isoformat() if r.finished_at else None,
+        "ai_model": r.ai_model,
+        "total_s": r.total_s,
+        "phases": {
+            "fetch": r.fetch_s,
+            "rewrite": r.rewrite_s,
+            "dedup": r.dedup_s,
+            "weather": r.weather_s,
+        },
+        "rewrite_busy_s": r.rewrite_busy_s,
+        "rewrite_s_per_article": round(r.rewrite_busy_s / rewrites, 3) if (r.rewrite_busy_s and rewrites) else None,
+        "feeds": r.feeds,
+        "candidates": r.candidates,
+        "fetched": r.fetched,
+        "rewrites_ok": r.rewrites_ok,
+        "rewrites_fallback": r.rewrites_fallback,
+        "dedup_deleted": r.dedup_deleted,
+        "errors": r.errors,
+        "error": r.error,
+    }
+
+
+def _stats(values: List[float]) -> Optional[Dict[str, float]]:
+    vals = sorted(v for v in values if v is not None)
+    if not vals:
+        return None
+    p95 = vals[min(len(vals) - 1, int(round(0.95 * (len(vals) - 1))))]
+    return {
+        "n": len(vals),
+        "avg": round(sum(vals) / len(vals), 3),
+        "p50": round(median(vals), 3),
+        "p95": round(p95, 3),
+        "min": round(vals[0], 3),
+        "max": round(vals[-1], 3),
+    }
+
+
+def run_trends(limit: int = 20) -> Dict[str, Any]:
+    """Return the last `limit` runs (newest first) plus duration trends.
+
+    `trends` summarizes each phase over the window and compares the latest
+    run against the median of the runs before it (`latest_vs_median`, a
+    ratio; >1 means slower). `by_model` breaks rewrite cost down per model.
+    """
+    session = SessionLocal()
+    try:
+        rows = (
+            session.query(HarvestRun)
+            .order_by(HarvestRun.started_at.desc(), HarvestRun.id.desc())
+            .limit(int(limit))
+            .all()
+        )
+    finally:
+        session.close()
+    items = [_run_to_dict(r) for r in rows]
+    completed = [it for it in items if it["status"] == "succeeded"]
+
+    series: Dict[str, List[Optional[float]]] = {p: [it["phases"][p] for it in completed] for p in PHASES}
+    series["total"] = [it["total_s"] for it in completed]
+    series["rewrite_s_per_article"] = [it["rewrite_s_per_article"] for it in completed]
+
+    trends: Dict[str, Any] = {}
+    for name, vals in series.items():
+        st = _stats([v for v in vals if v is not None])
+        if st is None:
+            continue
+        latest = vals[0] if vals else None
+        prev = [v for v in vals[1:] if v is not None]
+        if latest is not None and prev and median(prev) > 0:
+            st["latest"] = latest
+            st["latest_vs_median"] = round(latest / median(prev), 3)
+        trends[name] = st
+
+    by_model: Dict[str, Dict[str, Any]] = {}
+    for it in completed:
+        key = it["ai_model"] or "unknown"
+        m = by_model.setdefault(key, {"runs": 0, "rewrites_ok": 0, "rewrites_fallback": 0, "_busy": 0.0})
+        m["runs"] += 1
+        m["rewrites_ok"] += it["rewrites_ok"] or 0
+        m["rewrites_fallback"] += it["rewrites_fallback"] or 0
+        m["_busy"] += it["rewrite_busy_s"] or 0.0
+    for m in by_model.values():
+        done = m["rewrites_ok"] + m["rewrites_fallback"]
+        busy = m.pop("_busy")
+        m["rewrite_s_per_article"] = round(busy / done, 3) if done else None
+        m["fallback_rate"] = round(m["rewrites_fallback"] / done, 3) if done else None
+
+    return {"items": items, "count": len(items), "trends": trends, "by_model": by_model}
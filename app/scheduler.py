@@ -3,21 +3,27 @@ from __future__ import annotations
 import os
 from datetime import datetime
 import threading
+import time
 from typing import Optional
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 import pytz
 import logging
 from typing import List, Dict
 
 from .database import SessionLocal
-from .models import Article, WeatherReport, AppSettings
+from .models import Article, WeatherReport
 from .news_fetcher import fetch_new_articles
 from .ai import rewrite_article, generate_weather_report
 from .weather import update_weather
-from .geo import resolve_location
+from .config_cache import config_cache, LocationConfig
+from .pools import FairQueue, LLM_WORKERS
 from .progress import progress
+from .jobs import HarvestCancelled
+from .events import bus
+from .response_cache import response_cache
 
 logger = logging.getLogger("app.scheduler")
 REWRITE_LOCK = threading.Lock()
@@ -31,7 +37,7 @@ def _get_env_time(name: str, default: str) -> tuple[int, int]:
 def _tz_name() -> str:
     # Prefer resolved location timezone
     try:
-        cfg = resolve_location()
+        cfg = config_cache.location()
         if cfg.timezone:
             return cfg.timezone
     except Exception:
@@ -41,7 +47,7 @@ def _tz_name() -> str:
 
 def _location() -> str:
     try:
-        cfg = resolve_location()
+        cfg = config_cache.location()
         if cfg.location_name:
             return cfg.location_name
     except Exception:
@@ -56,66 +62,169 @@ def _min_articles() -> int:
         return 10
 
 
+def _article_label(art) -> str:
+    from urllib.parse import urlparse
+    label = (art.source_title or urlparse(art.source_url or '').netloc or 'article').strip()
+    return (label[:80] + '…') if len(label) > 80 else label
+
+
+def _needs_rewrite(art) -> bool:
+    # Rewrite when missing AI or previously fell back to source
+    return (art.raw_content is not None) and (
+        (not art.ai_body) or ((art.ai_model or "").startswith("fallback:"))
+    )
+
+
+def _rewrite_one(session, art, *, base_url: str | None, model: str | None) -> bool:
+    """Rewrite a single article and commit it. Returns False when it fell back to source."""
+    # Retry up to 3 times, 10 minute timeout per attempt
+    res = None
+    for _attempt in range(3):
+        res = rewrite_article(art.raw_content, art.source_title, art.location or _location(), base_url=base_url, model=model, timeout_s=600)
+        if res and (res.get("title") or res.get("body")):
+            break
+    ok = bool(res and (res.get("title") or res.get("body")))
+    if ok:
+        art.ai_title = (res.get("title") or art.source_title or "").strip()[:500]
+        art.ai_body = (res.get("body") or "").strip()
+        art.ai_model = (model or os.environ.get("OLLAMA_MODEL", "llama3.2"))
+        art.ai_generated_at = datetime.utcnow()
+    else:
+        # Fallback to source content
+        art.ai_title = (art.source_title or "").strip()[:500]
+        art.ai_body = (art.raw_content or "").strip()
+        art.ai_model = "fallback:source"
+        art.ai_generated_at = datetime.utcnow()
+    session.add(art)
+    session.commit()
+    response_cache.bump("article_rewritten")
+    return ok
+
+
 def _rewrite_and_store(articles, *, base_url: str | None, model: str | None):
     session = SessionLocal()
     try:
         processed = 0
         total = len(articles)
         for i, art in enumerate(articles, start=1):
-            # Rewrite when missing AI or previously fell back to source
-            needs_rewrite = (art.raw_content is not None) and (
-                (not art.ai_body) or ((art.ai_model or "").startswith("fallback:"))
-            )
-            if needs_rewrite:
+            if _needs_rewrite(art):
                 # Update progress detail with current item
                 try:
-                    from urllib.parse import urlparse
-                    label = (art.source_title or urlparse(art.source_url or '').netloc or 'article').strip()
-                    label = (label[:80] + '…') if len(label) > 80 else label
-                    progress.phase('rewrite', f'Rewriting ({i}/{total}): {label}')
+                    progress.phase('rewrite', f'Rewriting ({i}/{total}): {_article_label(art)}')
                 except Exception:
                     progress.phase('rewrite', f'Rewriting ({i}/{total})')
-                # Retry up to 3 times, 10 minute timeout per attempt
-                res = None
-                for _attempt in range(3):
-                    res = rewrite_article(art.raw_content, art.source_title, art.location or _location(), base_url=base_url, model=model, timeout_s=600)
-                    if res and (res.get("title") or res.get("body")):
-                        break
-                if res and (res.get("title") or res.get("body")):
-                    art.ai_title = (res.get("title") or art.source_title or "").strip()[:500]
-                    art.ai_body = (res.get("body") or "").strip()
-                    art.ai_model = (model or os.environ.get("OLLAMA_MODEL", "llama3.2"))
-                    art.ai_generated_at = datetime.utcnow()
-                else:
-                    # Fallback to source content
-                    art.ai_title = (art.source_title or "").strip()[:500]
-                    art.ai_body = (art.raw_content or "").strip()
-                    art.ai_model = "fallback:source"
-                    art.ai_generated_at = datetime.utcnow()
-                session.add(art)
-                session.commit()
+                ok = _rewrite_one(session, art, base_url=base_url, model=model)
                 processed += 1
                 progress.inc_rewrite(1)
+                progress.stage_inc('rewrite', 'ai' if ok else 'fallback')
         logger.info("rewrite_completed", extra={"processed": processed})
     finally:
         session.close()
 
 
-def _gen_weather_report(location: str, *, base_url: str | None, model: str | None, temp_unit: str | None, wind_speed_unit: str | None = None):
-    tz = _tz_name()
+def _rewrite_loop(queue: FairQueue, fetch_done: threading.Event, *, base_url: str | None, model: str | None, should_stop=None) -> int:
+    """Consume articles from `queue` until it is closed and drained."""
+    processed = 0
+    session = SessionLocal()
+    try:
+        while True:
+            art = queue.get()
+            if art is None:
+                break
+            if not _needs_rewrite(art):
+                progress.inc_rewrite(1)
+                continue
+            if should_stop is not None and should_stop():
+                # Left for rewrite-missing; still counted so completed reaches total
+                progress.inc_rewrite(1)
+                progress.stage_inc('rewrite', 'skipped')
+                continue
+            label = _article_label(art)
+            progress.set_current(art_id=art.id, title=label, url=art.source_url)
+            # While fetching is still running the fetch stage owns phase/detail
+            if fetch_done.is_set():
+                snap = progress.snapshot()
+                progress.phase('rewrite', f'Rewriting ({(snap.get("completed") or 0) + 1}/{snap.get("total") or 0}): {label}')
+            t0 = time.perf_counter()
+            try:
+                ok = _rewrite_one(session, art, base_url=base_url, model=model)
+                progress.stage_inc('rewrite', 'ai' if ok else 'fallback')
+                bus.publish("article", {"id": art.id, "title": art.ai_title, "ai_model": art.ai_model, "location_id": art.location_id})
+            except Exception:
+                session.rollback()
+                logger.exception("rewrite_failed", extra={"article_id": art.id})
+                progress.stage_inc('rewrite', 'errors')
+            progress.stage_inc('rewrite', 'busy_ms', int((time.perf_counter() - t0) * 1000))
+            processed += 1
+            progress.inc_rewrite(1)
+            progress.stage_inc('rewrite', 'done')
+    finally:
+        session.close()
+    return processed
+
+
+def _rewrite_worker(queue: FairQueue, fetch_done: threading.Event, *, base_url: str | None, model: str | None, should_stop=None, workers: int = 1) -> None:
+    """Drain `queue` with `workers` LLM threads until it is closed.
+
+    Runs alongside fetching so the LLM starts on the first stored article
+    instead of waiting for the whole fetch phase. The queue serves locations
+    round-robin, so each town gets a fair share of the LLM pool. Holds
+    REWRITE_LOCK for its lifetime so it never overlaps a maintenance rewrite.
+    Once `should_stop` returns True the remaining articles are left for
+    rewrite-missing.
+    """
+    counts: List[int] = []
+
+    def _loop():
+        counts.append(_rewrite_loop(queue, fetch_done, base_url=base_url, model=model, should_stop=should_stop))
+
+    with REWRITE_LOCK:
+        helpers = [
+            threading.Thread(target=_loop, name=f"harvest-llm-{i}", daemon=True)
+            for i in range(1, max(1, workers))
+        ]
+        for t in helpers:
+            t.start()
+        _loop()
+        for t in helpers:
+            t.join()
+    logger.info("rewrite_completed", extra={"processed": sum(counts), "workers": max(1, workers)})
+
+
+def _ai_settings() -> tuple[str | None, str | None, str | None, str | None]:
+    """Return (base_url, model, temp_unit, wind_speed_unit) from AppSettings with env fallbacks."""
+    aset = config_cache.ai()
+    return aset.base_url, aset.model, aset.temp_unit, aset.wind_speed_unit
+
+
+def _fetch_weather(location: str, *, temp_unit: str | None, wind_speed_unit: str | None = None, report_phase: bool = True, cfg: Optional[LocationConfig] = None) -> Optional[WeatherReport]:
     # Refresh forecast record based on resolved coordinates when available
     lat = None
     lon = None
+    tz = None
     try:
-        cfg = resolve_location()
+        cfg = cfg or config_cache.location()
         lat = cfg.latitude
         lon = cfg.longitude
+        tz = cfg.timezone
     except Exception:
         pass
-    progress.phase('weather_fetch', 'Updating weather forecast')
-    wr = update_weather(location=location, tz=tz, lat=lat, lon=lon, temp_unit=temp_unit, wind_speed_unit=wind_speed_unit)
+    tz = tz or _tz_name()
+    if report_phase:
+        progress.phase('weather_fetch', 'Updating weather forecast')
+    wr = update_weather(
+        location=location, tz=tz, lat=lat, lon=lon, temp_unit=temp_unit, wind_speed_unit=wind_speed_unit,
+        location_id=(cfg.id if cfg is not None and cfg.id else 1),
+    )
     if not wr:
         logger.warning("weather_update_failed", extra={"location": location})
+    return wr
+
+
+def _write_weather_report(wr: WeatherReport, location: str, *, base_url: str | None, model: str | None, wind_speed_unit: str | None = None) -> None:
+    if wr.ai_report and not (wr.ai_model or "").startswith("fallback:"):
+        # Cached forecast row that already has a report; nothing to regenerate
+        logger.info("weather_report_reused", extra={"location": location, "report_id": wr.id})
         return
     # Generate readable report from latest forecast
     try:
@@ -141,6 +250,8 @@ def _gen_weather_report(location: str, *, base_url: str | None, model: str | Non
             logger.info("weather_report_generated", extra={"location": location})
         finally:
             session.close()
+        response_cache.bump("weather_report")
+        bus.publish("weather", {"location": location, "location_id": wr.location_id, "updated_at": wr.ai_generated_at.isoformat()})
     else:
         logger.warning("weather_report_generation_failed", extra={"location": location})
         session = SessionLocal()
@@ -152,42 +263,356 @@ def _gen_weather_report(location: str, *, base_url: str | None, model: str | Non
             session.commit()
         finally:
             session.close()
+        response_cache.bump("weather_report")
+
+
+def _gen_weather_report(location: str, *, base_url: str | None, model: str | None, temp_unit: str | None, wind_speed_unit: str | None = None, cfg: Optional[LocationConfig] = None):
+    wr = _fetch_weather(location, temp_unit=temp_unit, wind_speed_unit=wind_speed_unit, cfg=cfg)
+    if not wr:
+        return
+    _write_weather_report(wr, location, base_url=base_url, model=model, wind_speed_unit=wind_speed_unit)
+
 
+def _enter_phase(job, name: str) -> None:
+    if job is not None:
+        job.enter_phase(name)
+        job.check()
 
-def run_harvest_once():
-    location = _location()
+
+def run_harvest_once(job=None) -> Dict[str, int]:
+    """Run one harvest across all enabled locations as a pipeline.
+
+    Each location gets a producer that fetches articles (sharing the
+    `pools.fetch_slots` connection budget) and queues them into a FairQueue,
+    which the LLM worker pool drains round-robin by location while fetching
+    continues. Forecast fetches run in parallel with both. Wall time approaches
+    max(fetch, rewrite) instead of their sum. Weather reports are generated
+    once rewriting is done so they do not compete for the LLM.
+
+    When run from a `jobs.HarvestJob`, phase durations are recorded on the job
+    and cancellation/deadline is honoured between articles and phases
+    (raising `HarvestCancelled`).
+    """
+    locations = config_cache.locations(enabled_only=True)
     count = _min_articles()
-    logger.info("harvest_start", extra={"location": location, "min_articles": count})
+    names = [c.location_name or _location() for c in locations]
+    logger.info("harvest_start", extra={"locations": names, "min_articles": count})
     progress.start()
-    progress.phase('fetch', 'Fetching news sources')
-    # Fetch new raw articles
-    new_arts = fetch_new_articles(min_count=count, location=location)
-    # Rewrite via Ollama
-    progress.phase('rewrite', f'Rewriting articles')
-    progress.set_rewrite_total(len(new_arts) if new_arts else 0)
-    # Load AI settings
+    should_stop = job.should_stop if job is not None else None
+    base_url, model, temp_unit, wind_speed_unit = _ai_settings()
+    new_arts: List[Article] = []
+    try:
+        progress.stage('fetch', locations=len(locations))
+        # Forecast fetches only need the network, so start them right away
+        weather_box: Dict[int, Optional[WeatherReport]] = {}
+
+        def _weather_fetch(cfg: LocationConfig, name: str):
+            try:
+                wr = _fetch_weather(name, temp_unit=temp_unit, wind_speed_unit=wind_speed_unit, report_phase=False, cfg=cfg)
+                weather_box[cfg.id] = wr
+                if wr:
+                    progress.stage_inc('weather', 'fetched')
+            except Exception:
+                logger.exception("weather_fetch_failed", extra={"location": name})
+
+        weather_threads = [
+            threading.Thread(target=_weather_fetch, args=(cfg, name), name=f"harvest-weather-{cfg.id}", daemon=True)
+            for cfg, name in zip(locations, names)
+        ]
+        for t in weather_threads:
+            t.start()
+
+        # Rewrite consumers: each stored article is queued as soon as it exists
+        queue = FairQueue()
+        fetch_done = threading.Event()
+        progress.set_rewrite_total(0)
+        progress.stage('rewrite', queued=0, done=0, ai=0, fallback=0)
+        rewrite_thread = threading.Thread(
+            target=_rewrite_worker,
+            args=(queue, fetch_done),
+            kwargs={"base_url": base_url, "model": model, "should_stop": should_stop, "workers": LLM_WORKERS},
+            name="harvest-rewrite",
+            daemon=True,
+        )
+        rewrite_thread.start()
+
+        created_lock = threading.Lock()
+
+        def _produce(cfg: LocationConfig, name: str):
+            def _enqueue(art):
+                progress.add_rewrite_total(1)
+                progress.stage_inc('rewrite', 'queued')
+                queue.put(cfg.id, art)
+            try:
+                arts = fetch_new_articles(min_count=count, location=name, on_created=_enqueue, should_stop=should_stop, cfg=cfg)
+                with created_lock:
+                    new_arts.extend(arts)
+            except Exception:
+                logger.exception("fetch_failed", extra={"location": name})
+                progress.stage_inc('fetch', 'errors')
+
+        try:
+            _enter_phase(job, 'fetch')
+            progress.phase('fetch', 'Fetching news sources')
+            producers = [
+                threading.Thread(target=_produce, args=(cfg, name), name=f"harvest-fetch-{cfg.id}", daemon=True)
+                for cfg, name in zip(locations, names)
+            ]
+            for t in producers:
+                t.start()
+            for t in producers:
+                t.join()
+        finally:
+            fetch_done.set()
+            queue.close()
+            if job is not None:
+                job.enter_phase('rewrite')
+            progress.phase('rewrite', 'Rewriting articles')
+            rewrite_thread.join()
+        _enter_phase(job, 'dedup')
+        # Enforce deduplication after each run to eliminate lookalikes
+        try:
+            from .maintenance import purge_duplicate_articles
+            res = purge_duplicate_articles()
+            progress.stage('dedup', deleted=int((res or {}).get("deleted") or 0))
+        except Exception:
+            logger.exception("post_run_dedup_failed")
+            progress.stage_inc('dedup', 'errors')
+        # Wait for the forecasts, then generate the reports
+        _enter_phase(job, 'weather')
+        progress.phase('weather_fetch', 'Updating weather forecast')
+        for t in weather_threads:
+            t.join()
+        for cfg, name in zip(locations, names):
+            wr = weather_box.get(cfg.id)
+            if wr:
+                _write_weather_report(wr, name, base_url=base_url, model=model, wind_speed_unit=wind_speed_unit)
+            else:
+                progress.stage_inc('weather', 'errors')
+            if job is not None:
+                job.check()
+    except HarvestCancelled as e:
+        logger.warning("harvest_cancelled", extra={"locations": names, "reason": str(e)})
+        progress.finish(error=str(e))
+        raise
+    except Exception as e:
+        progress.finish(error=str(e) or e.__class__.__name__)
+        raise
+    finally:
+        if job is not None:
+            job.result.update(_harvest_counts(model=model))
+    fetched = len(new_arts)
+    logger.info("harvest_complete", extra={"locations": names, "fetched": fetched})
+    progress.finish()
+    if fetched:
+        bus.publish("articles_added", {
+            "count": fetched,
+            "ids": [a.id for a in new_arts],
+            "location_ids": sorted({a.location_id for a in new_arts if a.location_id is not None}),
+        })
+    return {"fetched": fetched}
+
+
+def _harvest_counts(*, model: str | None) -> Dict[str, object]:
+    """Summarize the current run's progress stages for the run history."""
+    stages = progress.snapshot().get("stages") or {}
+    fetch = stages.get("fetch") or {}
+    rewrite = stages.get("rewrite") or {}
+    return {
+        "ai_model": model or os.environ.get("OLLAMA_MODEL", "llama3.2"),
+        "feeds": fetch.get("feeds", 0),
+        "candidates": fetch.get("candidates", 0),
+        "fetched": fetch.get("fetched", 0),
+        "rewrites_ok": rewrite.get("ai", 0),
+        "rewrites_fallback": rewrite.get("fallback", 0),
+        "rewrite_busy_s": round(rewrite.get("busy_ms", 0) / 1000.0, 3),
+        "dedup_deleted": (stages.get("dedup") or {}).get("deleted", 0),
+        "errors": sum(int((stages.get(k) or {}).get("errors", 0)) for k in ("rewrite", "dedup", "weather")),
+    }
+
+
+def _scheduled_harvest() -> None:
+    """Cron entry point: go through the job manager so runs never overlap."""
+    from .jobs import jobs
+    jobs.submit("cron")
+
+
+def _retention_enabled() -> bool:
+    return os.environ.get("RETENTION_ENABLED", "1").lower() not in ("0", "false", "no", "off")
+
+
+def _scheduled_retention() -> None:
+    """Nightly retention pass; skipped while a harvest is writing."""
+    from .jobs import jobs
+    from .maintenance import apply_retention
+    if jobs.current() is not None:
+        logger.info("retention_skipped", extra={"reason": "harvest_running"})
+        return
+    try:
+        apply_retention()
+    except Exception:
+        logger.exception("retention_failed")
+
+
+def _schedule_mode() -> str:
+    mode = (os.environ.get("SCHEDULE_MODE", "cron") or "cron").strip().lower()
+    return mode if mode in ("cron", "adaptive") else "cron"
+
+
+def _env_minutes(name: str, default: float) -> float:
+    try:
+        return max(1.0, float(os.environ.get(name, str(default))))
+    except Exception:
+        return float(default)
+
+
+def _adaptive_settings() -> Dict[str, float]:
+    poll_min = _env_minutes("ADAPTIVE_POLL_MIN_MINUTES", 5)
+    harvest_min = _env_minutes("ADAPTIVE_HARVEST_MIN_MINUTES", 30)
+    try:
+        min_new = max(1, int(os.environ.get("ADAPTIVE_MIN_NEW_ENTRIES", "8")))
+    except Exception:
+        min_new = 8
+    try:
+        max_per_day = max(1, int(os.environ.get("ADAPTIVE_MAX_HARVESTS_PER_DAY", "12")))
+    except Exception:
+        max_per_day = 12
+    return {
+        "poll_min_s": poll_min * 60,
+        "poll_max_s": max(poll_min, _env_minutes("ADAPTIVE_POLL_MAX_MINUTES", 60)) * 60,
+        "harvest_min_s": harvest_min * 60,
+        "harvest_max_s": max(harvest_min, _env_minutes("ADAPTIVE_HARVEST_MAX_MINUTES", 480)) * 60,
+        "min_new": min_new,
+        "max_per_day": max_per_day,
+    }
+
+
+class _AdaptiveState:
+    """Bookkeeping for the adaptive schedule (feed polls + harvest decisions)."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.poll_interval_s: Optional[float] = None
+        self.next_poll_at = 0.0  # epoch seconds
+        self.pending_new = 0
+        self.last_poll_at: Optional[float] = None
+        self.last_poll_new = 0
+        self.last_harvest_at: Optional[float] = None
+        self.last_decision: Optional[str] = None
+
+
+_ADAPTIVE = _AdaptiveState()
+
+
+def _harvest_history(now: float) -> tuple[Optional[float], int]:
+    """Return (epoch of the latest recorded harvest, scheduled harvests in the last 24h).
+
+    Manual runs (trigger 'api') count towards "latest" so a button press
+    postpones the next automatic harvest, but not towards the daily budget.
+    """
+    from .models import HarvestRun
+
+    since = datetime.utcfromtimestamp(now - 86400)
     session = SessionLocal()
     try:
-        aset = session.query(AppSettings).filter_by(id=1).one_or_none()
-        base_url = (aset.ollama_base_url if aset and aset.ollama_base_url else os.environ.get("OLLAMA_BASE_URL"))
-        model = (aset.ollama_model if aset and aset.ollama_model else os.environ.get("OLLAMA_MODEL"))
-        temp_unit = (aset.temp_unit if aset and aset.temp_unit else None)
-        wind_speed_unit = (aset.wind_speed_unit if aset and aset.wind_speed_unit else None)
+        latest = session.query(HarvestRun.started_at).order_by(HarvestRun.started_at.desc()).limit(1).scalar()
+        used = (
+            session.query(HarvestRun.id)
+            .filter(HarvestRun.started_at >= since, HarvestRun.trigger != "api")
+            .count()
+        )
     finally:
         session.close()
-    # Ensure only a single rewrite runs at a time
-    with REWRITE_LOCK:
-        _rewrite_and_store(new_arts, base_url=base_url, model=model)
-    # Enforce deduplication after each run to eliminate lookalikes
+    latest_ts = (latest - datetime(1970, 1, 1)).total_seconds() if latest else None
+    return latest_ts, used
+
+
+def _adaptive_tick() -> None:
+    """Poll feeds when due and start a harvest once enough new entries have piled up.
+
+    Polls use conditional GETs only, so a quiet feed costs a 304. The poll
+    interval doubles while nothing new shows up (up to the max) and drops
+    back to the minimum as soon as something does. A heavy harvest starts
+    when the pending count reaches the threshold, or when the max harvest
+    interval has elapsed regardless; never sooner than the min harvest
+    interval and never more than the daily budget allows.
+    """
+    from .news_fetcher import poll_new_entries
+    from .jobs import jobs
+
+    st = _adaptive_settings()
+    now = time.time()
+    with _ADAPTIVE.lock:
+        if now < _ADAPTIVE.next_poll_at:
+            return
+        interval = _ADAPTIVE.poll_interval_s or st["poll_min_s"]
+
+    new = 0
+    for cfg in config_cache.locations(enabled_only=True):
+        try:
+            new += poll_new_entries(cfg.location_name, cfg)
+        except Exception:
+            logger.exception("adaptive_poll_failed", extra={"location": cfg.location_name})
+
     try:
-        from .maintenance import purge_duplicate_articles
-        purge_duplicate_articles()
+        latest_ts, used = _harvest_history(now)
     except Exception:
-        logger.exception("post_run_dedup_failed")
-    # Update weather and generate report
-    _gen_weather_report(location, base_url=base_url, model=model, temp_unit=temp_unit, wind_speed_unit=wind_speed_unit)
-    logger.info("harvest_complete", extra={"location": location, "fetched": len(new_arts) if new_arts else 0})
-    progress.finish()
+        logger.exception("adaptive_history_failed")
+        latest_ts, used = None, 0
+
+    with _ADAPTIVE.lock:
+        interval = st["poll_min_s"] if new else min(st["poll_max_s"], interval * 2)
+        _ADAPTIVE.poll_interval_s = interval
+        _ADAPTIVE.next_poll_at = now + interval
+        _ADAPTIVE.last_poll_at = now
+        _ADAPTIVE.last_poll_new = new
+        _ADAPTIVE.pending_new += new
+        if latest_ts is not None and (_ADAPTIVE.last_harvest_at is None or latest_ts > _ADAPTIVE.last_harvest_at):
+            _ADAPTIVE.last_harvest_at = latest_ts
+        since = now - _ADAPTIVE.last_harvest_at if _ADAPTIVE.last_harvest_at is not None else None
+        pending = _ADAPTIVE.pending_new
+
+        if since is not None and since < st["harvest_min_s"]:
+            decision = "too_soon"
+        elif used >= st["max_per_day"]:
+            decision = "budget_exhausted"
+        elif pending >= st["min_new"]:
+            decision = "harvest_new_entries"
+        elif since is None or since >= st["harvest_max_s"]:
+            decision = "harvest_max_interval"
+        else:
+            decision = "waiting"
+        if decision.startswith("harvest"):
+            _ADAPTIVE.pending_new = 0
+            _ADAPTIVE.last_harvest_at = now
+        _ADAPTIVE.last_decision = decision
+
+    logger.info("adaptive_tick", extra={"new": new, "pending": pending, "decision": decision, "next_poll_s": interval, "used_today": used})
+    if decision.startswith("harvest"):
+        jobs.submit("adaptive")
+
+
+def adaptive_state() -> Optional[Dict[str, object]]:
+    """Current adaptive-schedule state for /api/status (None in cron mode)."""
+    if _schedule_mode() != "adaptive":
+        return None
+
+    def _iso(ts: Optional[float]) -> Optional[str]:
+        return datetime.utcfromtimestamp(ts).isoformat() if ts else None
+
+    st = _adaptive_settings()
+    with _ADAPTIVE.lock:
+        return {
+            "pending_new": _ADAPTIVE.pending_new,
+            "min_new": st["min_new"],
+            "poll_interval_s": _ADAPTIVE.poll_interval_s or st["poll_min_s"],
+            "last_poll_at": _iso(_ADAPTIVE.last_poll_at),
+            "last_poll_new": _ADAPTIVE.last_poll_new,
+            "next_poll_at": _iso(_ADAPTIVE.next_poll_at),
+            "last_harvest_at": _iso(_ADAPTIVE.last_harvest_at),
+            "last_decision": _ADAPTIVE.last_decision,
+            "max_harvests_per_day": st["max_per_day"],
+        }
 
 
 SCHEDULER: Optional[BackgroundScheduler] = None
@@ -204,31 +629,62 @@ def start_scheduler() -> BackgroundScheduler:
     tz = pytz.timezone(tzname)
     sched = BackgroundScheduler(timezone=tz)
 
-    h1, m1 = _get_env_time("SCHEDULE_MORNING", "07:30")
-    h2, m2 = _get_env_time("SCHEDULE_NOON", "12:00")
-    h3, m3 = _get_env_time("SCHEDULE_EVENING", "19:30")
+    mode = _schedule_mode()
+    if mode == "adaptive":
+        # Tick at the minimum poll interval; the tick itself skips polls
+        # that are not yet due after backing off.
+        poll_min = _adaptive_settings()["poll_min_s"]
+        trigger = IntervalTrigger(seconds=poll_min, timezone=tz)
+        sched.add_job(_adaptive_tick, trigger=trigger, id="adaptive_poll", coalesce=True, max_instances=1)
+        logger.info("scheduler_job_added", extra={"job": "adaptive_poll", "interval_s": poll_min, "tz": tzname})
+    else:
+        h1, m1 = _get_env_time("SCHEDULE_MORNING", "07:30")
+        h2, m2 = _get_env_time("SCHEDULE_NOON", "12:00")
+        h3, m3 = _get_env_time("SCHEDULE_EVENING", "19:30")
+
+        for hh, mm, name in [
+            (h1, m1, "morning"),
+            (h2, m2, "noon"),
+            (h3, m3, "evening"),
+        ]:
+            trigger = CronTrigger(hour=hh, minute=mm, timezone=tz)
+            sched.add_job(_scheduled_harvest, trigger=trigger, id=f"harvest_{name}", coalesce=True, max_instances=1)
+            logger.info("scheduler_job_added", extra={"job": name, "hour": hh, "minute": mm, "tz": tzname})
 
-    for hh, mm, name in [
-        (h1, m1, "morning"),
-        (h2, m2, "noon"),
-        (h3, m3, "evening"),
-    ]:
-        trigger = CronTrigger(hour=hh, minute=mm, timezone=tz)
-        sched.add_job(run_harvest_once, trigger=trigger, id=f"harvest_{name}", coalesce=True, max_instances=1)
-        logger.info("scheduler_job_added", extra={"job": name, "hour": hh, "minute": mm, "tz": tzname})
+    if _retention_enabled():
+        rh, rm = _get_env_time("RETENTION_SCHEDULE", "03:30")
+        trigger = CronTrigger(hour=rh, minute=rm, timezone=tz)
+        sched.add_job(_scheduled_retention, trigger=trigger, id="retention", coalesce=True, max_instances=1)
+        logger.info("scheduler_job_added", extra={"job": "retention", "hour": rh, "minute": rm, "tz": tzname})
 
     sched.start()
-    logger.info("scheduler_started", extra={"tz": tzname})
+    logger.info("scheduler_started", extra={"tz": tzname, "mode": mode})
     SCHEDULER = sched
     return sched
 
 
-def restart_scheduler() -> BackgroundScheduler:
-    """Restart the scheduler with the current timezone from the database."""
+def restart_scheduler() -> Optional[BackgroundScheduler]:
+    """Restart the scheduler with the current timezone from the database.
+
+    On a worker that is not the leader this asks the leader to do it.
+    """
+    from .cluster import cluster
     logger.info("scheduler_restart_requested")
+    if not cluster.is_leader():
+        cluster.broadcast("scheduler_restart")
+        return None
     return start_scheduler()
 
 
+def stop_scheduler() -> None:
+    """Shut the scheduler down (this worker lost leadership)."""
+    global SCHEDULER
+    if SCHEDULER is not None and SCHEDULER.running:
+        SCHEDULER.shutdown(wait=False)
+        logger.info("scheduler_stopped")
+    SCHEDULER = None
+
+
 def next_runs() -> List[Dict[str, str]]:
     out: List[Dict[str, str]] = []
     try:
@@ -236,6 +692,9 @@ def next_runs() -> List[Dict[str, str]]:
             return out
         jobs = SCHEDULER.get_jobs()
         for j in jobs:
+            # Harvest timings only; the nightly retention pass is not a run
+            if j.id == "retention":
+                continue
             if j.next_run_time is not None:
                 out.append({"id": j.id, "next_run": j.next_run_time.isoformat()})
         out.sort(key=lambda x: x["next_run"])
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import html
+import os
+import re
+import sys
+from typing import Dict, List, Optional
+import logging
+
+from sqlalchemy import Float, Integer, text
+
+from .database import engine
+
+logger = logging.getLogger("app.search")
+
+FTS_TABLE = "articles_fts"
+# Indexed columns, in FTS column order; names match `articles` so the
+# external-content table can read them back for snippets.
+FTS_COLUMNS = ("ai_title", "source_title", "ai_body", "source_name")
+# BM25 weights per column: titles count more than body text
+BM25_WEIGHTS = (10.0, 8.0, 1.0, 2.0)
+
+# Private-use markers swapped for <mark> after HTML-escaping the snippet
+_HL_OPEN = "\ue000"
+_HL_CLOSE = "\ue001"
+
+_fts_ok: Optional[bool] = None
+
+
+def fts_enabled() -> bool:
+    """True when the FTS index exists and SEARCH_FTS is not turned off."""
+    global _fts_ok
+    if os.environ.get("SEARCH_FTS", "1").lower() in ("0", "false", "no", "off"):
+        return False
+    if _fts_ok is None:
+        try:
+            with engine.connect() as conn:
+                _fts_ok = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type='table' AND name=:n"), {"n": FTS_TABLE}
+                ).first() is not None
+        except Exception:
+            _fts_ok = False
+    return _fts_ok
+
+
+def ensure_fts_index(conn) -> bool:
+    """Create the FTS5 table and sync triggers if missing. Returns True when created.
+
+    Triggers keep the index in step with every insert, rewrite (update) and
+    delete on `articles`, whichever code path makes the change.
+    """
+    global _fts_ok
+    exists = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type='table' AND name=:n"), {"n": FTS_TABLE}
+    ).first() is not None
+    cols = ", ".join(FTS_COLUMNS)
+    new_cols = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+    old_cols = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+    try:
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            f"{cols}, content='articles', content_rowid='id', "
+            "tokenize='porter unicode61 remove_diacritics 2')"
+        ))
+    except Exception:
+        # SQLite built without FTS5; search falls back to LIKE
+        logger.warning("fts_unavailable")
+        _fts_ok = False
+        return False
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON articles BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, {cols}) VALUES (new.id, {new_cols}); END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON articles BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {cols} ON articles BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); "
+        f"INSERT INTO {FTS_TABLE}(rowid, {cols}) VALUES (new.id, {new_cols}); END"
+    ))
+    if not exists:
+        rebuild_index(conn)
+    _fts_ok = True
+    return not exists
+
+
+def rebuild_index(conn=None) -> int:
+    """Re-index every article from the `articles` table. Returns the row count."""
+    def _run(c) -> int:
+        c.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+        return int(c.execute(text("SELECT count(*) FROM articles")).scalar() or 0)
+
+    if conn is not None:
+        n = _run(conn)
+    else:
+        with engine.begin() as c:
+            n = _run(c)
+    logger.info("fts_rebuilt", extra={"articles": n})
+    return n
+
+
+def match_expression(q: str) -> Optional[str]:
+    """Turn free text into a safe FTS5 query: every word must match, the last as a prefix."""
+    words = re.findall(r"\w+", q or "", flags=re.UNICODE)
+    if not words:
+        return None
+    terms = [f'"{w}"' for w in words[:-1]]
+    terms.append(f'"{words[-1]}"*')
+    return " ".join(terms)
+
+
+def match_subquery(q: str):
+    """(rowid, rank) rows matching `q`; lower rank is more relevant. None if `q` has no words."""
+    expr = match_expression(q)
+    if expr is None:
+        return None
+    weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+    return (
+        text(f"SELECT rowid AS rid, bm25({FTS_TABLE}, {weights}) AS rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :fts_q")
+        .bindparams(fts_q=expr)
+        .columns(rid=Integer, rank=Float)
+        .subquery("fts")
+    )
+
+
+def _render(fragment: Optional[str]) -> Optional[str]:
+    if not fragment:
+        return None
+    return html.escape(fragment).replace(_HL_OPEN, "<mark>").replace(_HL_CLOSE, "</mark>")
+
+
+def snippets(session, q: str, ids: List[int], tokens: int = 16) -> Dict[int, Dict[str, Optional[str]]]:
+    """Highlighted title and body snippet for each article id matching `q`.
+
+    Text is HTML-escaped; only the `<mark>` tags around matches are markup.
+    """
+    expr = match_expression(q)
+    if expr is None or not ids:
+        return {}
+    id_list = ",".join(str(int(i)) for i in ids)
+    rows = session.execute(
+        text(
+            f"SELECT rowid, "
+            f"highlight({FTS_TABLE}, 0, :o, :c), highlight({FTS_TABLE}, 1, :o, :c), "
+            f"snippet({FTS_TABLE}, 2, :o, :c, '…', :n) "
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :fts_q AND rowid IN ({id_list})"
+        ),
+        {"o": _HL_OPEN, "c": _HL_CLOSE, "n": max(4, min(64, int(tokens))), "fts_q": expr},
+    ).all()
+    out: Dict[int, Dict[str, Optional[str]]] = {}
+    for rid, ai_title, source_title, body in rows:
+        out[int(rid)] = {"title_html": _render(ai_title or source_title), "snippet_html": _render(body)}
+    return out
+
+
+def _main(argv: List[str]) -> int:
+    import argparse
+    from .database import init_db
+
+    ap = argparse.ArgumentParser(prog="python -m app.search", description="Article full-text index tools")
+    ap.add_argument("command", choices=["rebuild"], help="rebuild: create the index if needed and re-index all articles")
+    args = ap.parse_args(argv)
+    if args.command == "rebuild":
+        init_db()
+        n = rebuild_index()
+        print(f"indexed {n} articles")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
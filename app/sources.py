@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from sqlalchemy import func, text
+
+from .database import engine
+from .models import Source, sort_ts_from_key
+
+logger = logging.getLogger("app.sources")
+
+SOURCES_TABLE = "sources"
+
+# Trigger bodies, with `{p}` the articles row alias (`new` or `old`)
+_ADD = (
+    f"INSERT INTO {SOURCES_TABLE} (location_id, name, article_count, latest_sort_key, extract_attempts, extract_ok) "
+    "SELECT coalesce({p}.location_id, 0), {p}.source_name, 1, {p}.sort_key, 0, 0 WHERE {p}.source_name IS NOT NULL "
+    "ON CONFLICT (location_id, name) DO UPDATE SET article_count = article_count + 1, "
+    "latest_sort_key = CASE WHEN latest_sort_key IS NULL OR excluded.latest_sort_key > latest_sort_key "
+    "THEN excluded.latest_sort_key ELSE latest_sort_key END;"
+)
+# Only a removed newest article needs the latest key looked up again; the
+# (source_name, sort_key, id) index answers that from its far end
+_REMOVE = (
+    f"UPDATE {SOURCES_TABLE} SET article_count = max(article_count - 1, 0) "
+    "WHERE location_id = coalesce({p}.location_id, 0) AND name = {p}.source_name; "
+    f"UPDATE {SOURCES_TABLE} SET latest_sort_key = ("
+    "SELECT a.sort_key FROM articles a WHERE a.source_name = {p}.source_name AND a.location_id IS {p}.location_id "
+    "ORDER BY a.sort_key DESC LIMIT 1) "
+    "WHERE location_id = coalesce({p}.location_id, 0) AND name = {p}.source_name AND latest_sort_key <= {p}.sort_key;"
+)
+
+
+def ensure_sources(conn) -> bool:
+    """(Re)create the sync triggers; fill the table when it is new. Returns True when filled.
+
+    Inserts and deletes on `articles` (ingest, dedup, retention) adjust the
+    counts in O(1), so listing sources never scans the articles table.
+    """
+    conn.execute(text(f"DROP TRIGGER IF EXISTS {SOURCES_TABLE}_ai"))
+    conn.execute(text(f"DROP TRIGGER IF EXISTS {SOURCES_TABLE}_au"))
+    conn.execute(text(f"DROP TRIGGER IF EXISTS {SOURCES_TABLE}_ad"))
+    conn.execute(text(
+        f"CREATE TRIGGER {SOURCES_TABLE}_ai AFTER INSERT ON articles WHEN new.source_name IS NOT NULL BEGIN "
+        f"{_ADD.format(p='new')} END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER {SOURCES_TABLE}_ad AFTER DELETE ON articles WHEN old.source_name IS NOT NULL BEGIN "
+        f"{_REMOVE.format(p='old')} END"
+    ))
+    # A moved or re-dated article leaves its old summary and joins the new one
+    conn.execute(text(
+        f"CREATE TRIGGER {SOURCES_TABLE}_au AFTER UPDATE OF source_name, location_id, sort_key ON articles BEGIN "
+        f"{_REMOVE.format(p='old')} {_ADD.format(p='new')} END"
+    ))
+    empty = conn.execute(text(f"SELECT 1 FROM {SOURCES_TABLE} LIMIT 1")).first() is None
+    if empty and conn.execute(text("SELECT 1 FROM articles LIMIT 1")).first() is not None:
+        rebuild_sources(conn)
+        return True
+    return False
+
+
+def rebuild_sources(conn=None) -> int:
+    """Recount every source from `articles`, keeping extraction counters. Returns the source count."""
+    def _run(c) -> int:
+        c.execute(text(f"UPDATE {SOURCES_TABLE} SET article_count = 0, latest_sort_key = NULL"))
+        c.execute(text(
+            f"INSERT INTO {SOURCES_TABLE} (location_id, name, article_count, latest_sort_key, extract_attempts, extract_ok) "
+            "SELECT coalesce(location_id, 0), source_name, count(*), max(sort_key), 0, 0 FROM articles "
+            "WHERE source_name IS NOT NULL GROUP BY coalesce(location_id, 0), source_name "
+            "ON CONFLICT (location_id, name) DO UPDATE SET "
+            "article_count = excluded.article_count, latest_sort_key = excluded.latest_sort_key"
+        ))
+        return int(c.execute(text(f"SELECT count(*) FROM {SOURCES_TABLE} WHERE article_count > 0")).scalar() or 0)
+
+    if conn is not None:
+        n = _run(conn)
+    else:
+        with engine.begin() as c:
+            n = _run(c)
+    logger.info("sources_rebuilt", extra={"sources": n})
+    return n
+
+
+def record_extraction(location_id: Optional[int], outcomes: Dict[str, Tuple[int, int]]) -> None:
+    """Add one fetch run's (attempts, extracted) per source name to the summary."""
+    if not outcomes:
+        return
+    now = datetime.utcnow()
+    params = [
+        {"loc": location_id or 0, "name": name, "n": n, "ok": ok, "now": now}
+        for name, (n, ok) in outcomes.items() if name and n
+    ]
+    if not params:
+        return
+    with engine.begin() as conn:
+        conn.execute(text(
+            f"INSERT INTO {SOURCES_TABLE} (location_id, name, article_count, extract_attempts, extract_ok, last_extracted_at) "
+            "VALUES (:loc, :name, 0, :n, :ok, :now) "
+            "ON CONFLICT (location_id, name) DO UPDATE SET extract_attempts = extract_attempts + excluded.extract_attempts, "
+            "extract_ok = extract_ok + excluded.extract_ok, last_extracted_at = excluded.last_extracted_at"
+        ), params)
+
+
+def list_sources(session, location_id: Optional[int] = None, counts: bool = False) -> Dict[str, Any]:
+    """Source names with articles, A-Z; with `counts`, per-source details as well.
+
+    All locations are summed when `location_id` is not given. The summary
+    has one row per source and location, so this does not grow with the
+    number of articles.
+    """
+    q = session.query(
+        Source.name,
+        func.sum(Source.article_count),
+        func.max(Source.latest_sort_key),
+        func.sum(Source.extract_attempts),
+        func.sum(Source.extract_ok),
+        func.max(Source.last_extracted_at),
+    )
+    if location_id:
+        q = q.filter(Source.location_id == int(location_id))
+    rows = q.group_by(Source.name).order_by(Source.name).all()
+    result: Dict[str, Any] = {"sources": [r[0] for r in rows if (r[1] or 0) > 0]}
+    if counts:
+        details: List[Dict[str, Any]] = []
+        for name, n, latest, attempts, ok, extracted_at in rows:
+            details.append({
+                "name": name,
+                "articles": int(n or 0),
+                "latest_ts": sort_ts_from_key(latest),
+                "extract_attempts": int(attempts or 0),
+                "extract_success_rate": round(ok / attempts, 3) if attempts else None,
+                "last_extracted_at": extracted_at.isoformat() if extracted_at else None,
+            })
+        result["details"] = details
+    return result
+
+
+def _main(argv: List[str]) -> int:
+    import argparse
+    from .database import init_db
+
+    ap = argparse.ArgumentParser(prog="python -m app.sources", description="Source summary tools")
+    ap.add_argument("command", choices=["rebuild"], help="rebuild: recount every source from the articles table")
+    args = ap.parse_args(argv)
+    if args.command == "rebuild":
+        init_db()
+        n = rebuild_sources()
+        print(f"counted {n} sources")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import sys
+from typing import Dict, List, Optional, Tuple
+import logging
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+from .compression import choose_encoding
+
+try:
+    import brotli  # optional; .br siblings are only written and served with it
+except ImportError:  # pragma: no cover
+    brotli = None
+
+logger = logging.getLogger("app.static")
+
+# Vite build output: `name-<8+ char content hash>.ext`; the URL changes whenever the content does
+HASHED_NAME = re.compile(r"-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+PRECOMPRESS_EXTENSIONS = (".js", ".mjs", ".css", ".html", ".svg", ".json", ".webmanifest", ".txt", ".map", ".ico")
+ENCODING_SUFFIX = {"br": ".br", "gzip": ".gz"}
+
+
+class _FileRange(FileResponse):
+    """206 response with bytes `start`..`end` (inclusive) of a file."""
+
+    def __init__(self, path: str, stat_result: os.stat_result, start: int, end: int) -> None:
+        super().__init__(path, status_code=206, stat_result=stat_result)
+        self.start, self.end = start, end
+        self.headers["content-length"] = str(end - start + 1)
+        self.headers["content-range"] = f"bytes {start}-{end}/{stat_result.st_size}"
+
+    async def __call__(self, scope, receive, send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"].upper() == "HEAD":
+            await send({"type": "http.response.body", "body": b""})
+            return
+        remaining = self.end - self.start + 1
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.start)
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:  # file shrank underneath us
+            await send({"type": "http.response.body", "body": b""})
+
+
+def parse_range(value: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """A single `bytes=` range as (start, end), end inclusive.
+
+    Returns None when the header should be ignored (absent, malformed, or
+    several ranges, which RFC 9110 lets a server answer with the full body).
+    Raises ValueError when the range lies outside the file (416).
+    """
+    if not value or not value.startswith("bytes=") or "," in value:
+        return None
+    first, _, last = value[6:].strip().partition("-")
+    first, last = first.strip(), last.strip()
+    if not (first or last) or (first and not first.isdigit()) or (last and not last.isdigit()):
+        return None
+    if not first:  # suffix range: the last N bytes
+        if int(last) == 0 or size == 0:
+            raise ValueError("range not satisfiable")
+        return max(0, size - int(last)), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size:
+        raise ValueError("range not satisfiable")
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+class SiteStatic(StaticFiles):
+    """StaticFiles with precompressed siblings, immutable caching and range requests.
+
+    - `app.js.br` / `app.js.gz` next to `app.js` are served in its place to
+      clients that accept them (see `python -m app.static_files precompress`).
+    - Content-hashed build files under `immutable_prefix` are cached for a
+      year; everything else (index, service worker, manifest, APK) is
+      revalidated with its ETag on every use.
+    - Uncompressed responses honour a single `Range` (resumable APK
+      downloads).
+    """
+
+    def __init__(self, *args, immutable_prefix: str = "assets/", **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.immutable_prefix = immutable_prefix
+        # (path, mtime) -> encodings with a sibling file; the static tree only changes with a new image
+        self._siblings: Dict[Tuple[str, float], Tuple[str, ...]] = {}
+
+    async def get_response(self, path: str, scope) -> Response:
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 206, 304):
+            rel = path.replace(os.sep, "/")
+            immutable = rel.startswith(self.immutable_prefix) and HASHED_NAME.search(rel)
+            response.headers["cache-control"] = IMMUTABLE if immutable else "no-cache"
+        return response
+
+    def _sibling_encodings(self, full_path: str, stat_result: os.stat_result) -> Tuple[str, ...]:
+        key = (full_path, stat_result.st_mtime)
+        found = self._siblings.get(key)
+        if found is None:
+            found = tuple(enc for enc, suffix in ENCODING_SUFFIX.items() if os.path.isfile(full_path + suffix))
+            self._siblings[key] = found
+        return found
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200) -> Response:
+        full_path = str(full_path)
+        request_headers = Headers(scope=scope)
+        available = self._sibling_encodings(full_path, stat_result) if status_code == 200 else ()
+        if available:
+            encoding = choose_encoding(request_headers.get("accept-encoding", ""))
+            if encoding in available:
+                variant = full_path + ENCODING_SUFFIX[encoding]
+                media_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+                response = FileResponse(variant, stat_result=os.stat(variant), media_type=media_type)
+                response.headers["content-encoding"] = encoding
+                response.headers["vary"] = "Accept-Encoding"
+                if self.is_not_modified(response.headers, request_headers):
+                    return NotModifiedResponse(response.headers)
+                return response
+
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        if available:
+            response.headers["vary"] = "Accept-Encoding"
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        if status_code != 200:
+            return response
+        response.headers["accept-ranges"] = "bytes"
+        if_range = request_headers.get("if-range")
+        if if_range and if_range not in (response.headers.get("etag"), response.headers.get("last-modified")):
+            return response
+        try:
+            byte_range = parse_range(request_headers.get("range"), stat_result.st_size)
+        except ValueError:
+            return Response(status_code=416, headers={"content-range": f"bytes */{stat_result.st_size}"})
+        if byte_range is None or byte_range == (0, stat_result.st_size - 1):
+            return response
+        ranged = _FileRange(full_path, stat_result, *byte_range)
+        ranged.headers["accept-ranges"] = "bytes"
+        return ranged
+
+
+class SpaIndex:
+    """The built `index.html`, read once and served from memory with an ETag.
+
+    Every client-side route returns this page, so navigations cost no disk
+    access. It is small and changes only with a new image; the compression
+    middleware compresses it and keeps the result per ETag.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.body: Optional[bytes] = None
+        self.etag = ""
+        self.load()
+
+    def load(self) -> bool:
+        try:
+            with open(self.path, "rb") as fh:
+                self.body = fh.read()
+        except OSError:
+            self.body = None
+            return False
+        self.etag = '"' + hashlib.blake2b(self.body, digest_size=12).hexdigest() + '"'
+        return True
+
+    @property
+    def available(self) -> bool:
+        return self.body is not None
+
+    def response(self, request) -> Response:
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache"}
+        # Weak comparison (RFC 9110 13.1.2): the W/ prefix does not matter
+        tags = [tag.strip() for tag in (request.headers.get("if-none-match") or "").split(",")]
+        if "*" in tags or self.etag in [tag.removeprefix("W/") for tag in tags]:
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, media_type="text/html", headers=headers)
+
+
+def precompress(directory: str, min_bytes: int = 256) -> Dict[str, int]:
+    """Write `.gz` (and `.br`) siblings for text files in `directory`. Returns counts and bytes.
+
+    Meant for image builds, so it uses the slowest, smallest settings. A
+    sibling is only kept when it saves at least a tenth of the size.
+    """
+    totals = {"files": 0, "gzip": 0, "br": 0, "bytes_in": 0, "bytes_gzip": 0, "bytes_br": 0}
+    for root, _dirs, names in os.walk(directory):
+        for name in names:
+            if not name.lower().endswith(PRECOMPRESS_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            with open(path, "rb") as fh:
+                data = fh.read()
+            if len(data) < min_bytes:
+                continue
+            totals["files"] += 1
+            totals["bytes_in"] += len(data)
+            variants: List[Tuple[str, bytes]] = [("gzip", gzip.compress(data, compresslevel=9, mtime=0))]
+            if brotli is not None:
+                variants.append(("br", brotli.compress(data, quality=11)))
+            for encoding, packed in variants:
+                target = path + ENCODING_SUFFIX[encoding]
+                if len(packed) > len(data) * 0.9:
+                    if os.path.exists(target):
+                        os.remove(target)
+                    continue
+                with open(target, "wb") as fh:
+                    fh.write(packed)
+                # Same mtime as the original, so both share Last-Modified
+                st = os.stat(path)
+                os.utime(target, (st.st_atime, st.st_mtime))
+                totals[encoding] += 1
+                totals[f"bytes_{encoding}"] += len(packed)
+    return totals
+
+
+def _main(argv: List[str]) -> int:
+    import argparse
+
+    ap = argparse.ArgumentParser(prog="python -m app.static_files", description="Static file tools")
+    ap.add_argument("command", choices=["precompress"], help="precompress: write .gz/.br siblings for text assets")
+    ap.add_argument("directory", nargs="?", default=os.path.join(os.path.dirname(__file__), "static"))
+    args = ap.parse_args(argv)
+    if args.command == "precompress":
+        t = precompress(args.directory)
+        print(
+            f"{t['files']} files, {t['bytes_in']:,} bytes -> gzip {t['gzip']} files {t['bytes_gzip']:,} bytes, "
+            f"br {t['br']} files {t['bytes_br']:,} bytes"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
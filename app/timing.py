@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import bisect
+import contextlib
+import contextvars
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger("app.request")
+
+# Upper bounds (ms) of the latency buckets; the last bucket is open-ended
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+SPANS = ("db", "upstream")
+
+# Span totals of the request being served: {name: [seconds, count]}. The dict
+# itself is shared, so work in threadpool threads and greenlets that copied
+# the context still adds to it.
+_current: contextvars.ContextVar[Optional[Dict[str, List[float]]]] = contextvars.ContextVar("request_timing", default=None)
+
+
+def server_timing_enabled() -> bool:
+    return os.environ.get("SERVER_TIMING", "1").lower() not in ("0", "false", "no", "off")
+
+
+def add(name: str, seconds: float) -> None:
+    """Add `seconds` of `name` ('db', 'upstream') to the current request, if any."""
+    spans = _current.get()
+    if spans is None:
+        return
+    entry = spans.setdefault(name, [0.0, 0])
+    entry[0] += seconds
+    entry[1] += 1
+
+
+@contextlib.contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the block as `name`, e.g. `with timing.span("upstream"): requests.get(...)`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add(name, time.perf_counter() - start)
+
+
+def install_db_timing(sync_engine) -> None:
+    """Count statement time on `sync_engine` (an AsyncEngine's `.sync_engine` too) as 'db'."""
+    from sqlalchemy import event
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("timing_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("timing_start")
+        if starts:
+            add("db", time.perf_counter() - starts.pop())
+
+
+class _RouteStats:
+    __slots__ = ("count", "errors", "total_ms", "max_ms", "buckets", "span_ms")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.span_ms: Dict[str, float] = {}
+
+    def add(self, ms: float, error: bool, spans: Dict[str, List[float]]) -> None:
+        self.count += 1
+        self.errors += int(error)
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.buckets[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        for name, (seconds, _) in spans.items():
+            self.span_ms[name] = self.span_ms.get(name, 0.0) + seconds * 1000
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Estimate from the buckets, interpolating linearly inside the one that holds the rank."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            if n and seen + n >= rank:
+                low = BUCKETS_MS[i - 1] if i > 0 else 0.0
+                high = BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max_ms
+                return round(min(low + (high - low) * (rank - seen) / n, self.max_ms), 1)
+            seen += n
+        return round(self.max_ms, 1)
+
+
+class RequestMetrics:
+    """Latency histograms per (method, route template), kept in memory per worker."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str], _RouteStats] = {}
+        self._since = datetime.now(timezone.utc)
+
+    def record(self, method: str, route: str, ms: float, status: int, spans: Dict[str, List[float]]) -> None:
+        with self._lock:
+            stats = self._routes.get((method, route))
+            if stats is None:
+                stats = self._routes[(method, route)] = _RouteStats()
+            stats.add(ms, status >= 500, spans)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+            self._since = datetime.now(timezone.utc)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            items = list(self._routes.items())
+            since = self._since
+        routes = []
+        for (method, route), s in items:
+            routes.append({
+                "method": method,
+                "route": route,
+                "count": s.count,
+                "errors": s.errors,
+                "mean_ms": round(s.total_ms / s.count, 1),
+                "p50_ms": s.percentile(0.50),
+                "p90_ms": s.percentile(0.90),
+                "p99_ms": s.percentile(0.99),
+                "max_ms": round(s.max_ms, 1),
+                **{f"{name}_mean_ms": round(s.span_ms.get(name, 0.0) / s.count, 1) for name in SPANS},
+                "buckets": {
+                    (f"le_{b}" if i < len(BUCKETS_MS) else "inf"): n
+                    for i, (b, n) in enumerate(zip(BUCKETS_MS + (None,), s.buckets)) if n
+                },
+            })
+        routes.sort(key=lambda r: r["mean_ms"] * r["count"], reverse=True)
+        return {"since": since.isoformat(), "routes": routes}
+
+
+metrics = RequestMetrics()
+
+
+def _route_of(scope) -> str:
+    # The router leaves the matched route in the scope; templates keep the key set small
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path:
+        return path
+    mount = scope.get("root_path") or ""  # StaticFiles mounts set no route
+    return f"{mount}/*" if mount else "(unmatched)"
+
+
+def _server_timing(total_s: float, spans: Dict[str, List[float]]) -> bytes:
+    parts = []
+    for name in SPANS:
+        if name in spans:
+            seconds, n = spans[name]
+            parts.append(f'{name};dur={seconds * 1000:.1f};desc="{int(n)} call{"" if n == 1 else "s"}"')
+    parts.append(f"app;dur={total_s * 1000:.1f}")
+    return ", ".join(parts).encode("latin-1")
+
+
+class TimingMiddleware:
+    """Pure ASGI middleware: request log line, latency histograms and Server-Timing.
+
+    Unlike a BaseHTTPMiddleware it does not run the endpoint in a separate
+    task or re-stream the body, so streamed audio and SSE pass straight
+    through. `Server-Timing` reports the DB and upstream (Ollama, TTS,
+    Open-Meteo) time spent before the response started.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        spans: Dict[str, List[float]] = {}
+        token = _current.set(spans)
+        status = 500
+        add_header = server_timing_enabled()
+
+        async def _send(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message.get("status", 200)
+                if add_header:
+                    headers = list(message.get("headers") or ())
+                    headers.append((b"server-timing", _server_timing(time.perf_counter() - start, spans)))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        client = scope.get("client")
+        client = client[0] if client else "-"
+        try:
+            await self.app(scope, receive, _send)
+        except Exception:
+            logger.exception("unhandled_exception", extra={"path": scope.get("path"), "method": scope.get("method"), "client": client})
+            raise
+        finally:
+            _current.reset(token)
+            ms = (time.perf_counter() - start) * 1000
+            metrics.record(scope.get("method", "-"), _route_of(scope), ms, status, spans)
+            logger.info(
+                "request",
+                extra={
+                    "method": scope.get("method"),
+                    "path": scope.get("path"),
+                    "status": status,
+                    "duration_ms": int(ms),
+                    "client": client,
+                },
+            )
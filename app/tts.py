@@ -6,6 +6,8 @@ from typing import Optional, Any
 
 import requests
 
+from . import timing
+
 
 DEFAULT_TTS_BASE = os.environ.get("TTS_BASE_URL", "http://tts:5500")
 
@@ -16,7 +18,8 @@ class TTSClient:
 
     def list_voices(self) -> list[dict[str, Any]] | None:
         try:
-            r = requests.get(f"{self.base_url}/api/voices", timeout=10)
+            with timing.span("upstream"):
+                r = requests.get(f"{self.base_url}/api/voices", timeout=10)
             r.raise_for_status()
             data = r.json()
             # OpenTTS variants:
@@ -58,7 +61,7 @@ class TTSClient:
         # Prefer wav for broad browser support
         params["format"] = "wav"
         try:
-            with requests.get(
+            with timing.span("upstream"), requests.get(
                 f"{self.base_url}/api/tts", params=params, stream=True, timeout=60
             ) as r:
                 r.raise_for_status()
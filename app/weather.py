@@ -2,38 +2,31 @@ from __future__ import annotations
 
 import json
 import os
+import threading
+import time
 from datetime import datetime
 from typing import Optional, Dict, Any
+import logging
 
 import requests
 
 from .database import SessionLocal
 from .models import WeatherReport
+from .geo import geocode
+from .response_cache import response_cache
+from . import timing
 
 
-OPEN_METEO_GEOCODE = "https://geocoding-api.open-meteo.com/v1/search"
 OPEN_METEO_FORECAST = "https://api.open-meteo.com/v1/forecast"
 
+logger = logging.getLogger("app.weather")
+
 
 def geocode_location(location: str) -> Optional[tuple[float, float]]:
-    try:
-        resp = requests.get(
-            OPEN_METEO_GEOCODE,
-            params={"name": location, "count": 1, "language": "en", "format": "json"},
-            timeout=15,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        results = data.get("results") or []
-        if not results:
-            return None
-        lat = results[0].get("latitude")
-        lon = results[0].get("longitude")
-        if lat is None or lon is None:
-            return None
-        return float(lat), float(lon)
-    except Exception:
+    res = geocode(location)
+    if not res:
         return None
+    return float(res["latitude"]), float(res["longitude"])
 
 
 def fetch_forecast(lat: float, lon: float, tz: str, temp_unit: str | None = None, wind_speed_unit: str | None = None) -> Optional[Dict[str, Any]]:
@@ -48,7 +41,8 @@ def fetch_forecast(lat: float, lon: float, tz: str, temp_unit: str | None = None
         if temp_unit:
             # temp_unit expected 'F' or 'C'
             params["temperature_unit"] = "fahrenheit" if temp_unit.upper() == "F" else "celsius"
-        resp = requests.get(OPEN_METEO_FORECAST, params=params, timeout=20)
+        with timing.span("upstream"):
+            resp = requests.get(OPEN_METEO_FORECAST, params=params, timeout=20)
         resp.raise_for_status()
         data = resp.json()
         
@@ -84,27 +78,103 @@ def fetch_forecast(lat: float, lon: float, tz: str, temp_unit: str | None = None
         return None
 
 
-def update_weather(location: str, tz: str, ai_report: Optional[str] = None, lat: float | None = None, lon: float | None = None, temp_unit: str | None = None, wind_speed_unit: str | None = None) -> Optional[WeatherReport]:
+def _cache_ttl_s() -> float:
+    try:
+        return max(0.0, float(os.environ.get("WEATHER_CACHE_TTL_S", "600")))
+    except Exception:
+        return 600.0
+
+
+class _Flight:
+    """One in-progress forecast fetch that concurrent callers wait on."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.report_id: Optional[int] = None
+
+
+_CACHE_LOCK = threading.Lock()
+# (location_id, lat, lon, tz, temp_unit, wind_speed_unit) -> (monotonic fetch time, WeatherReport.id)
+_FORECAST_CACHE: Dict[tuple, tuple[float, int]] = {}
+_INFLIGHT: Dict[tuple, _Flight] = {}
+
+
+def _load_report(report_id: Optional[int]) -> Optional[WeatherReport]:
+    if report_id is None:
+        return None
     session = SessionLocal()
     try:
-        coords = (lat, lon) if (lat is not None and lon is not None) else geocode_location(location)
-        if not coords:
-            return None
-        lat2, lon2 = coords
+        return session.get(WeatherReport, report_id)
+    finally:
+        session.close()
+
+
+def update_weather(location: str, tz: str, ai_report: Optional[str] = None, lat: float | None = None, lon: float | None = None, temp_unit: str | None = None, wind_speed_unit: str | None = None, location_id: int | None = 1) -> Optional[WeatherReport]:
+    """Fetch the forecast and store it as a WeatherReport row.
+
+    Results are cached for WEATHER_CACHE_TTL_S per (location, coordinates,
+    timezone, units): a hit returns the existing row instead of inserting a
+    new one. Concurrent callers for the same key wait for a single fetch.
+    """
+    coords = (lat, lon) if (lat is not None and lon is not None) else geocode_location(location)
+    if not coords:
+        return None
+    lat2, lon2 = coords
+    key = (
+        location_id, round(float(lat2), 4), round(float(lon2), 4), tz,
+        (temp_unit or "").upper() or None, (wind_speed_unit or "").lower() or None,
+    )
+    ttl = _cache_ttl_s()
+    with _CACHE_LOCK:
+        hit = _FORECAST_CACHE.get(key)
+        if hit and ttl > 0 and time.monotonic() - hit[0] < ttl:
+            cached_id: Optional[int] = hit[1]
+        else:
+            cached_id = None
+            flight = _INFLIGHT.get(key)
+            leader = flight is None
+            if leader:
+                flight = _INFLIGHT[key] = _Flight()
+    if cached_id is not None:
+        wr = _load_report(cached_id)
+        if wr is not None:
+            logger.info("weather_cache_hit", extra={"location": location, "report_id": cached_id})
+            return wr
+        # Row was removed since it was cached; fetch again
+        with _CACHE_LOCK:
+            _FORECAST_CACHE.pop(key, None)
+        return update_weather(location, tz, ai_report, lat2, lon2, temp_unit, wind_speed_unit, location_id)
+    if not leader:
+        logger.info("weather_fetch_coalesced", extra={"location": location})
+        flight.done.wait(timeout=60)
+        return _load_report(flight.report_id)
+
+    try:
         forecast = fetch_forecast(lat2, lon2, tz, temp_unit=temp_unit, wind_speed_unit=wind_speed_unit)
         if not forecast:
             return None
-        wr = WeatherReport(
-            location=location,
-            latitude=lat2,
-            longitude=lon2,
-            fetched_at=datetime.utcnow(),
-            forecast_json=json.dumps(forecast),
-            ai_report=ai_report,
-        )
-        session.add(wr)
-        session.commit()
-        session.refresh(wr)
+        session = SessionLocal()
+        try:
+            wr = WeatherReport(
+                location=location,
+                location_id=location_id,
+                latitude=lat2,
+                longitude=lon2,
+                fetched_at=datetime.utcnow(),
+                forecast_json=json.dumps(forecast),
+                ai_report=ai_report,
+            )
+            session.add(wr)
+            session.commit()
+            session.refresh(wr)
+        finally:
+            session.close()
+        response_cache.bump("forecast")
+        flight.report_id = wr.id
+        with _CACHE_LOCK:
+            _FORECAST_CACHE[key] = (time.monotonic(), wr.id)
         return wr
     finally:
-        session.close()
+        with _CACHE_LOCK:
+            _INFLIGHT.pop(key, None)
+        flight.done.set()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Load test: hot read endpoints while slow chat calls hold the threadpool.
+
+Starts a fake Ollama that takes `--slow-s` seconds per reply, then a real
+uvicorn server (lifespan off, so no scheduler or harvest) with ASYNC_DB=0
+and ASYNC_DB=1. For each, it first opens `--chats` chat requests, enough to
+occupy Starlette's 40 worker threads, and then sends `--requests` GETs to
+/api/articles, /api/weather, /api/articles/sources and /api/config at
+`--concurrency`. It prints read latency percentiles and throughput.
+
+    python scripts/bench_async.py
+    python scripts/bench_async.py --concurrency 200 --requests 4000 --chats 80
+
+Run from the repository root. Needs httpx and aiosqlite.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from statistics import median
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+READ_PATHS = ["/api/articles?page=1&limit=20", "/api/weather", "/api/articles/sources", "/api/config"]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _slow_ollama(port: int, delay_s: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            time.sleep(delay_s)
+            body = json.dumps({"response": "Interesting point."}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    srv = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    srv.daemon_threads = True
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv
+
+
+def _seed(db_path: str, n: int) -> None:
+    os.environ["DB_PATH"] = db_path
+    sys.path.insert(0, ROOT)
+    from app.database import SessionLocal, init_db
+    from app.models import Article, WeatherReport
+
+    init_db()
+    now = datetime.utcnow()
+    session = SessionLocal()
+    try:
+        for i in range(n):
+            session.add(Article(
+                source_url=f"https://example.com/{i}",
+                source_name=f"Source {i % 25}",
+                source_title=f"Article {i}",
+                published_at=now - timedelta(minutes=i),
+                fetched_at=now - timedelta(minutes=i),
+                ai_title=f"Article {i}",
+                ai_body="lorem ipsum dolor sit amet " * 60,
+                ai_model="bench",
+            ))
+        session.add(WeatherReport(location="Bench", location_id=1, forecast_json=json.dumps({"daily": {"t": list(range(200))}}), ai_report="Sunny."))
+        session.commit()
+    finally:
+        session.close()
+
+
+def _pct(vals, p):
+    vals = sorted(vals)
+    return vals[min(len(vals) - 1, int(round(p * (len(vals) - 1))))] if vals else None
+
+
+async def _load(base: str, args) -> dict:
+    import httpx
+
+    limits = httpx.Limits(max_connections=args.concurrency + args.chats + 10, max_keepalive_connections=args.concurrency + args.chats)
+    async with httpx.AsyncClient(base_url=base, timeout=120, limits=limits) as client:
+        chats = [
+            asyncio.create_task(client.post(f"/api/articles/{1 + i % 50}/chat", json={"message": "What happened?"}))
+            for i in range(args.chats)
+        ]
+        await asyncio.sleep(0.5)  # let the chats take their threads
+
+        latencies: list[float] = []
+        errors = 0
+        sem = asyncio.Semaphore(args.concurrency)
+
+        async def one(i: int) -> None:
+            nonlocal errors
+            async with sem:
+                t0 = time.perf_counter()
+                try:
+                    r = await client.get(READ_PATHS[i % len(READ_PATHS)])
+                    if r.status_code != 200:
+                        errors += 1
+                        return
+                except Exception:
+                    errors += 1
+                    return
+                latencies.append((time.perf_counter() - t0) * 1000)
+
+        t_start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(args.requests)))
+        elapsed = time.perf_counter() - t_start
+        for t in chats:
+            t.cancel()
+        await asyncio.gather(*chats, return_exceptions=True)
+    return {
+        "reads": len(latencies),
+        "errors": errors,
+        "reads_per_s": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(median(latencies), 1) if latencies else None,
+        "p95_ms": round(_pct(latencies, 0.95), 1) if latencies else None,
+        "p99_ms": round(_pct(latencies, 0.99), 1) if latencies else None,
+        "max_ms": round(max(latencies), 1) if latencies else None,
+    }
+
+
+def _run_server(db_path: str, ollama: str, async_db: str, args) -> dict:
+    port = _free_port()
+    env = {
+        **os.environ,
+        "DB_PATH": db_path,
+        "ASYNC_DB": async_db,
+        "OLLAMA_BASE_URL": ollama,
+        "CHAT_RATE_LIMIT_PER_MIN": "1000000",
+        "LEADER_ELECTION": "0",
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--lifespan", "off", "--log-level", "warning"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        import httpx
+        base = f"http://127.0.0.1:{port}"
+        for _ in range(100):
+            try:
+                if httpx.get(base + "/health", timeout=1).status_code == 200:
+                    break
+            except Exception:
+                time.sleep(0.1)
+        # Warm caches (settings, FTS probe) before measuring
+        for path in READ_PATHS:
+            httpx.get(base + path, timeout=10)
+        return asyncio.run(_load(base, args))
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--concurrency", type=int, default=100)
+    ap.add_argument("--requests", type=int, default=2000)
+    ap.add_argument("--chats", type=int, default=60, help="slow chat requests held open during the run")
+    ap.add_argument("--slow-s", type=float, default=8.0, help="fake LLM reply time")
+    ap.add_argument("--articles", type=int, default=2000)
+    args = ap.parse_args()
+
+    import logging
+    logging.disable(logging.CRITICAL)
+    db_path = os.path.join(tempfile.mkdtemp(prefix="bench_async_"), "bench.db")
+    _seed(db_path, args.articles)
+    llm_port = _free_port()
+    srv = _slow_ollama(llm_port, args.slow_s)
+    try:
+        results = {}
+        for label, flag in (("sync (threadpool)", "0"), ("async (aiosqlite)", "1")):
+            results[label] = _run_server(db_path, f"http://127.0.0.1:{llm_port}", flag, args)
+    finally:
+        srv.shutdown()
+
+    print(f"\n{args.requests} reads at concurrency {args.concurrency}, {args.chats} chats held for {args.slow_s}s")
+    keys = list(next(iter(results.values())).keys())
+    print(f"{'metric':<14}" + "".join(f"{k:>20}" for k in results))
+    for k in keys:
+        print(f"{k:<14}" + "".join(f"{str(r[k]):>20}" for r in results.values()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Payload size and latency of a 100-item /api/articles page.
+
+Seeds a scratch database with articles that have realistic `raw_content`
+and `ai_body` sizes, then compares:
+
+- building the page from `articles` with per-row Python (title, dates,
+  byline hash, excerpt), as the list did before `article_cards`, against
+  reading the precomputed cards;
+- response bytes and latency for view=full, view=card and a widget-style
+  `fields=` list, uncompressed, gzip and brotli.
+
+RESPONSE_CACHE is off so every request runs the query and serialization.
+
+    python scripts/bench_payload.py
+    python scripts/bench_payload.py --articles 2000 --repeat 50
+
+Run from the repository root.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from statistics import median
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORDS = (
+    "council city road school police weather storm river bridge market local "
+    "residents officials plan vote budget park festival team season fire crews "
+    "county board project funding traffic downtown museum library community "
+    "hospital students water power outage mayor report health housing"
+).split()
+
+PAGE = "/api/articles?page=1&limit=100"
+VARIANTS = [
+    ("full", PAGE),
+    ("card", PAGE + "&view=card"),
+    ("widget fields", PAGE + "&fields=title,image_url,source,sort_ts"),
+]
+ENCODINGS = [("identity", "identity"), ("gzip", "gzip"), ("br", "br")]
+
+
+def _text(rng: random.Random, n_words: int) -> str:
+    sentences = []
+    while n_words > 0:
+        k = min(n_words, rng.randint(8, 20))
+        sentences.append(" ".join(rng.choice(WORDS) for _ in range(k)).capitalize() + ".")
+        n_words -= k
+    return " ".join(sentences)
+
+
+def _seed(n: int) -> None:
+    from app.database import engine, init_db
+    from app.models import Article
+
+    init_db()
+    rng = random.Random(7)
+    now = datetime.utcnow()
+    rows = [{
+        "source_url": f"https://example.com/news/{i}",
+        "source_name": f"Source {i % 12}",
+        "source_title": _text(rng, 10),
+        "ai_title": _text(rng, 9),
+        "image_url": f"https://cdn.example.com/img/{i}.jpg",
+        "raw_content": _text(rng, 2500),  # about 18 KB scraped text
+        "ai_body": _text(rng, 400),       # about 3 KB rewrite
+        "ai_model": "bench",
+        "published_at": now - timedelta(minutes=i),
+        "fetched_at": now - timedelta(minutes=i),
+    } for i in range(n)]
+    with engine.begin() as conn:
+        conn.execute(Article.__table__.insert(), rows)
+
+
+def _ms(fn, repeat: int) -> float:
+    out = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        out.append((time.perf_counter() - t0) * 1000)
+    return median(out)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--articles", type=int, default=500)
+    ap.add_argument("--repeat", type=int, default=30)
+    args = ap.parse_args()
+
+    os.environ["DB_PATH"] = os.path.join(tempfile.mkdtemp(prefix="bench_payload_"), "bench.db")
+    os.environ["RESPONSE_CACHE"] = "0"
+    os.environ["LEADER_ELECTION"] = "0"
+    sys.path.insert(0, ROOT)
+    import logging
+    logging.disable(logging.CRITICAL)
+    _seed(args.articles)
+
+    from fastapi.testclient import TestClient
+    from app.database import SessionLocal
+    from app import cards
+    from app.main import app, ARTICLE_VIEWS, _build_article_query, _cards_to_dicts
+    from app.models import Article, sort_ts_from_key
+
+    def _per_row(fields):
+        def run():
+            session = SessionLocal()
+            try:
+                arts = session.query(Article).order_by(Article.sort_key.desc(), Article.id.desc()).limit(100).all()
+                for a in arts:
+                    fallback = (a.ai_model or "").startswith("fallback:")
+                    item = {
+                        "id": a.id, "title": a.ai_title or a.source_title, "source": a.source_name,
+                        "source_url": a.source_url, "image_url": a.image_url,
+                        "published_at": a.published_at.isoformat() if a.published_at else None,
+                        "fetched_at": a.fetched_at.isoformat(), "sort_ts": sort_ts_from_key(a.sort_key),
+                        "ai_model": a.ai_model,
+                        "byline": cards.byline(a.source_url, a.source_title, a.id) if (a.ai_body and not fallback) else None,
+                        "rewrite_note": cards.REWRITE_NOTE if fallback else None,
+                    }
+                    if "ai_body" in fields:
+                        item["ai_body"] = a.ai_body
+                    else:
+                        item["excerpt"] = cards.excerpt(a.ai_body)
+            finally:
+                session.close()
+        return run
+
+    def _cards(fields):
+        def run():
+            session = SessionLocal()
+            try:
+                _cards_to_dicts(session, _build_article_query(session).limit(100).all(), fields=fields)
+            finally:
+                session.close()
+        return run
+
+    print(f"\n{args.articles} articles; 100-item page; median of {args.repeat} runs")
+    print("\nLoad + dict conversion (ms)")
+    print(f"{'':<16}{'articles, per row':>20}{'article_cards':>16}")
+    for name, fields in (("view=full", ARTICLE_VIEWS["full"]), ("view=card", ARTICLE_VIEWS["card"])):
+        before = _ms(_per_row(fields), args.repeat)
+        after = _ms(_cards(fields), args.repeat)
+        print(f"{name:<16}{before:>20.2f}{after:>16.2f}")
+
+    client = TestClient(app)
+    print("\nHTTP response (bytes on the wire / median ms)")
+    print(f"{'':<16}" + "".join(f"{label:>22}" for label, _ in ENCODINGS))
+    for name, url in VARIANTS:
+        cells = []
+        for _, enc in ENCODINGS:
+            r = client.get(url, headers={"Accept-Encoding": enc})
+            r.raise_for_status()
+            size = int(r.headers.get("content-length") or len(r.content))
+            ms = _ms(lambda: client.get(url, headers={"Accept-Encoding": enc}), args.repeat)
+            cells.append(f"{size:>10,} / {ms:>6.1f}")
+        print(f"{name:<16}" + "".join(f"{c:>22}" for c in cells))
+    print("(before lean lists, every response was 'full' / identity)")
+
+
+if __name__ == "__main__":
+    main()
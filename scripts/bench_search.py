@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Article search benchmark: FTS5 index vs. the LIKE scan.
+
+Builds a scratch database with synthetic articles at each size, then times
+the same `/api/articles?q=` searches with SEARCH_FTS on and off.
+
+    python scripts/bench_search.py                       # 10k and 100k articles
+    python scripts/bench_search.py --sizes 10000 --repeat 20
+
+Run from the repository root. The 100k build takes a minute or two.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from statistics import median
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SYLLABLES = "ka lo mi ne ru sa ti vo be da fe gi ho ju ky la mo nu pe qui ro su ta ve wi xo ya zu".split()
+
+
+def _vocab(n: int = 20000) -> list[str]:
+    rng = random.Random(42)
+    words: list[str] = []
+    seen = set()
+    while len(words) < n:
+        w = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        if w not in seen:
+            seen.add(w)
+            words.append(w)
+    return words
+
+
+VOCAB = _vocab()
+# Common, mid-frequency and rare words, a two-word query, a prefix and a miss
+QUERIES = [VOCAB[0], VOCAB[20], VOCAB[100], VOCAB[400], f"{VOCAB[10]} {VOCAB[15]}", VOCAB[50][:4], "nonexistentterm"]
+
+
+def _text(rng: random.Random, n: int) -> str:
+    # Zipf-like word frequencies, roughly like real text
+    return " ".join(VOCAB[min(len(VOCAB) - 1, int(rng.paretovariate(1.0)) - 1)] for _ in range(n))
+
+
+def _build(db_path: str, size: int) -> None:
+    os.environ["DB_PATH"] = db_path
+    from app.database import engine, init_db
+    init_db()
+    rng = random.Random(size)
+    now = datetime.utcnow()
+    rows = []
+    for i in range(size):
+        title = _text(rng, 8)
+        rows.append({
+            "source_url": f"https://example.com/{size}/{i}",
+            "source_name": f"Source {i % 40}",
+            "source_title": title,
+            "ai_title": title.title(),
+            "ai_body": _text(rng, 180),
+            "published_at": now - timedelta(minutes=i),
+            "fetched_at": now - timedelta(minutes=i),
+            "is_published": True,
+        })
+    from app.models import Article
+    with engine.begin() as conn:
+        for start in range(0, len(rows), 5000):
+            conn.execute(Article.__table__.insert(), rows[start:start + 5000])
+
+
+def _time(client, q: str, repeat: int, sort_by: str | None) -> list[float]:
+    out = []
+    params = {"q": q, "limit": 20}
+    if sort_by:
+        params["sort_by"] = sort_by
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        r = client.get("/api/articles", params=params)
+        r.raise_for_status()
+        out.append((time.perf_counter() - t0) * 1000)
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", default="10000,100000", help="comma-separated article counts")
+    ap.add_argument("--repeat", type=int, default=10)
+    args = ap.parse_args()
+
+    sizes = [int(x) for x in args.sizes.split(",") if x.strip()]
+    if len(sizes) > 1:
+        # Each size needs a fresh process: DB_PATH is read at import time
+        import subprocess
+        for n in sizes:
+            subprocess.run([sys.executable, os.path.abspath(__file__), "--sizes", str(n), "--repeat", str(args.repeat)], check=True)
+        return
+
+    size = sizes[0]
+    sys.path.insert(0, ROOT)
+    import logging
+    logging.disable(logging.CRITICAL)
+    db_path = os.path.join(tempfile.mkdtemp(prefix="bench_search_"), "bench.db")
+    t0 = time.perf_counter()
+    _build(db_path, size)
+    build_s = time.perf_counter() - t0
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+    client = TestClient(app)
+
+    print(f"\n{size} articles (built and indexed in {build_s:.1f}s, {os.path.getsize(db_path) / 1e6:.0f} MB)")
+    print(f"{'query':<22}{'like p50':>10}{'like p95':>10}{'fts p50':>10}{'fts p95':>10}{'rel p50':>10}{'hits (fts/like)':>18}")
+    for q in QUERIES:
+        os.environ["SEARCH_FTS"] = "0"
+        like = _time(client, q, args.repeat, None)
+        total_like = client.get("/api/articles", params={"q": q, "limit": 1}).json()["total"]
+        os.environ["SEARCH_FTS"] = "1"
+        fts = _time(client, q, args.repeat, None)
+        rel = _time(client, q, args.repeat, "relevance")
+        total_fts = client.get("/api/articles", params={"q": q, "limit": 1}).json()["total"]
+        p95 = lambda v: sorted(v)[min(len(v) - 1, int(round(0.95 * (len(v) - 1))))]
+        hits = f"{total_fts}" if total_fts == total_like else f"{total_fts}/{total_like}"
+        print(f"{q:<22}{median(like):>10.1f}{p95(like):>10.1f}{median(fts):>10.1f}{p95(fts):>10.1f}{median(rel):>10.1f}{hits:>18}")
+    print("(ms; FTS matches whole words/stems with a prefix on the last word, LIKE matches the raw substring)")
+
+
+if __name__ == "__main__":
+    main()
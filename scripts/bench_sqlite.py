@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""Concurrent read/write benchmark for the SQLite profile.
+
+Runs N reader threads calling GET /api/articles (in-process, no server)
+while a writer thread mimics a harvest: inserts articles and updates them
+with rewrites in short transactions. Prints p50/p95/p99 read latency, read
+and write throughput, and "database is locked" errors.
+
+    python scripts/bench_sqlite.py                  # current profile (WAL by default)
+    python scripts/bench_sqlite.py --compare        # SQLite defaults vs. profile
+    python scripts/bench_sqlite.py --readers 16 --duration 20 --seed 5000
+
+Run from the repository root. Uses a throwaway database in a temp directory.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from statistics import median
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _pct(vals, p):
+    if not vals:
+        return None
+    vals = sorted(vals)
+    return vals[min(len(vals) - 1, int(round(p * (len(vals) - 1))))]
+
+
+def run_once(args) -> dict:
+    db_dir = tempfile.mkdtemp(prefix="bench_sqlite_")
+    os.environ["DB_PATH"] = os.path.join(db_dir, "bench.db")
+    sys.path.insert(0, ROOT)
+
+    import logging
+    logging.disable(logging.CRITICAL)
+    from sqlalchemy.exc import OperationalError
+    from fastapi.testclient import TestClient
+    from app.database import SessionLocal, init_db, engine
+    from app.models import Article
+    from app.main import app
+
+    init_db()
+    now = datetime.utcnow()
+    session = SessionLocal()
+    try:
+        for i in range(args.seed):
+            session.add(Article(
+                source_url=f"https://example.com/seed/{i}",
+                source_name=f"Source {i % 20}",
+                source_title=f"Seed article {i}",
+                published_at=now - timedelta(minutes=i),
+                fetched_at=now - timedelta(minutes=i),
+                raw_content="lorem ipsum " * 200,
+                ai_title=f"Seed article {i}",
+                ai_body="dolor sit amet " * 150,
+                ai_model="bench",
+            ))
+        session.commit()
+    finally:
+        session.close()
+
+    client = TestClient(app)
+    stop = threading.Event()
+    latencies: list[float] = []
+    read_errors = {"locked": 0, "other": 0}
+    writes = {"ok": 0, "locked": 0, "other": 0}
+    lock = threading.Lock()
+
+    def reader(n: int) -> None:
+        page = 1
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            try:
+                r = client.get("/api/articles", params={"page": page, "limit": 20})
+                ok = r.status_code == 200
+            except OperationalError as e:
+                ok = False
+                with lock:
+                    read_errors["locked" if "locked" in str(e) else "other"] += 1
+                continue
+            except Exception:
+                ok = False
+            dt = (time.perf_counter() - t0) * 1000
+            with lock:
+                if ok:
+                    latencies.append(dt)
+                else:
+                    read_errors["other"] += 1
+            page = page % 5 + 1
+
+    def writer() -> None:
+        i = 0
+        while not stop.is_set():
+            s = SessionLocal()
+            try:
+                art = Article(
+                    source_url=f"https://example.com/new/{i}",
+                    source_name="Writer",
+                    source_title=f"New article {i}",
+                    fetched_at=datetime.utcnow(),
+                    raw_content="fresh content " * 300,
+                )
+                s.add(art)
+                s.flush()
+                # Hold the write transaction open like a slow harvest step would
+                time.sleep(args.write_hold_ms / 1000.0)
+                s.commit()
+                art.ai_title = f"Rewritten {i}"
+                art.ai_body = "rewritten body " * 150
+                art.ai_model = "bench"
+                s.merge(art)
+                s.commit()
+                writes["ok"] += 1
+            except OperationalError as e:
+                s.rollback()
+                writes["locked" if "locked" in str(e) else "other"] += 1
+            finally:
+                s.close()
+            i += 1
+
+    threads = [threading.Thread(target=reader, args=(n,), daemon=True) for n in range(args.readers)]
+    threads.append(threading.Thread(target=writer, daemon=True))
+    t_start = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(args.duration)
+    stop.set()
+    for t in threads:
+        t.join(timeout=30)
+    elapsed = time.perf_counter() - t_start
+
+    with engine.connect() as conn:
+        journal = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+    return {
+        "journal_mode": journal,
+        "readers": args.readers,
+        "duration_s": round(elapsed, 2),
+        "reads": len(latencies),
+        "reads_per_s": round(len(latencies) / elapsed, 1),
+        "read_ms_p50": round(median(latencies), 2) if latencies else None,
+        "read_ms_p95": round(_pct(latencies, 0.95), 2) if latencies else None,
+        "read_ms_p99": round(_pct(latencies, 0.99), 2) if latencies else None,
+        "read_ms_max": round(max(latencies), 2) if latencies else None,
+        "read_lock_errors": read_errors["locked"],
+        "read_other_errors": read_errors["other"],
+        "writes": writes["ok"],
+        "writes_per_s": round(writes["ok"] / elapsed, 1),
+        "write_lock_errors": writes["locked"],
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--readers", type=int, default=8)
+    ap.add_argument("--duration", type=float, default=10.0, help="seconds")
+    ap.add_argument("--seed", type=int, default=2000, help="articles inserted before the run")
+    ap.add_argument("--write-hold-ms", type=float, default=20.0, help="time a write transaction stays open")
+    ap.add_argument("--compare", action="store_true", help="run with SQLite defaults, then with the profile")
+    ap.add_argument("--json", action="store_true", help="print one JSON object per run")
+    args = ap.parse_args()
+
+    if args.compare:
+        base = [sys.executable, os.path.abspath(__file__), "--json",
+                "--readers", str(args.readers), "--duration", str(args.duration),
+                "--seed", str(args.seed), "--write-hold-ms", str(args.write_hold_ms)]
+        results = {}
+        for label, extra_env in (("defaults", {"SQLITE_PRAGMAS": "0"}), ("profile", {"SQLITE_PRAGMAS": "1"})):
+            out = subprocess.run(base, env={**os.environ, **extra_env}, capture_output=True, text=True, check=True)
+            results[label] = json.loads(out.stdout.strip().splitlines()[-1])
+        keys = list(results["profile"].keys())
+        print(f"{'metric':<20}{'defaults':>14}{'profile':>14}")
+        for k in keys:
+            print(f"{k:<20}{str(results['defaults'].get(k)):>14}{str(results['profile'].get(k)):>14}")
+        return
+
+    res = run_once(args)
+    if args.json:
+        print(json.dumps(res))
+    else:
+        for k, v in res.items():
+            print(f"{k:<20}{v}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+"""Shared setup for the Python tests (the Playwright suite lives in tests/tests).
+
+The app reads DB_PATH at import time, so it points at a scratch database
+before any `app` module is imported.
+"""
+import logging
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+os.environ.setdefault("DB_PATH", os.path.join(tempfile.mkdtemp(prefix="news_ai_tests_"), "app.db"))
+os.environ.setdefault("LEADER_ELECTION", "0")
+logging.disable(logging.CRITICAL)
@@ -0,0 +1,58 @@
+import sqlite3
+from datetime import datetime
+
+from app.database import DB_PATH, SessionLocal, init_db
+from app.models import Article, ArticleCard
+
+
+def _card(article_id):
+    session = SessionLocal()
+    try:
+        return session.get(ArticleCard, article_id)
+    finally:
+        session.close()
+
+
+def test_orm_write_fills_excerpt_and_byline():
+    init_db()
+    session = SessionLocal()
+    try:
+        a = Article(
+            source_url="https://example.com/cards/orm", source_title="Story", ai_body="Body text.  " * 60,
+            ai_model="test", published_at=datetime(2026, 2, 3, 4, 5, 6), fetched_at=datetime(2026, 2, 3, 4, 5, 6, 7),
+        )
+        session.add(a)
+        session.commit()
+        card = _card(a.id)
+        assert card.published_at == "2026-02-03T04:05:06"
+        assert card.fetched_at == "2026-02-03T04:05:06.000007"
+        assert card.excerpt.startswith("Body text. Body text.") and card.excerpt.endswith("…")
+        assert card.byline
+
+        a.ai_model = "fallback:none"
+        session.commit()
+        assert _card(a.id).byline is None
+    finally:
+        session.close()
+
+
+def test_plain_sqlite_client_can_write_articles():
+    init_db()
+    db = sqlite3.connect(DB_PATH)
+    try:
+        cur = db.execute(
+            "INSERT INTO articles (source_url, source_title, ai_body, fetched_at, is_published) "
+            "VALUES ('https://example.com/cards/shell', 'Shell', 'Written from the shell.', '2026-03-04 05:06:07.000000', 1)"
+        )
+        article_id = cur.lastrowid
+        db.execute("UPDATE articles SET ai_title = 'Edited' WHERE id = ?", (article_id,))
+        db.commit()
+    finally:
+        db.close()
+    card = _card(article_id)
+    assert (card.title, card.fetched_at, card.excerpt) == ("Edited", "2026-03-04T05:06:07", None)
+
+    init_db()
+    card = _card(article_id)
+    assert card.excerpt == "Written from the shell."
+    assert card.byline
@@ -0,0 +1,27 @@
+import time
+
+from app.cluster import Cluster
+from app.database import init_db
+
+
+def test_leader_steps_down_when_lease_cannot_be_renewed(monkeypatch):
+    init_db()
+    monkeypatch.setenv("LEADER_LEASE_TTL_S", "0.2")
+    events = []
+    c = Cluster()
+    c.enabled = True
+    c._on_elected = lambda: events.append("elected")
+    c._on_demoted = lambda: events.append("demoted")
+    c._heartbeat()
+    assert c.is_leader()
+
+    def _locked():
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(c, "_try_acquire", _locked)
+    c._heartbeat()
+    assert c.is_leader(), "keeps the role while the lease is still valid"
+    time.sleep(0.25)
+    c._heartbeat()
+    assert not c.is_leader()
+    assert events == ["elected", "demoted"]
@@ -0,0 +1,19 @@
+from app.config_cache import LocationConfig
+from app.news_fetcher import MAX_FEEDS, feed_urls_for
+
+
+def _cfg(loc_id=2, feed_urls=None):
+    return LocationConfig(id=loc_id, location_name="Boise, Idaho", feed_urls=feed_urls)
+
+
+def test_location_feeds_are_not_cut_off():
+    custom = "https://example.com/boise.xml, https://example.org/local.rss"
+    feeds = feed_urls_for("Boise, Idaho", _cfg(feed_urls=custom))
+    assert feeds[:2] == ["https://example.com/boise.xml", "https://example.org/local.rss"]
+    assert len(feeds) == MAX_FEEDS + 2
+
+
+def test_extra_feeds_only_for_primary_location(monkeypatch):
+    monkeypatch.setenv("FEED_EXTRA_URLS", "https://example.net/extra.xml")
+    assert "https://example.net/extra.xml" in feed_urls_for("Albany, New York", _cfg(loc_id=1))
+    assert "https://example.net/extra.xml" not in feed_urls_for("Springfield, Illinois", _cfg(loc_id=3))
@@ -0,0 +1,92 @@
+import pytest
+
+from app import geo
+from app.database import SessionLocal, init_db
+from app.gazetteer import Gazetteer
+from app.models import GeocodeCache
+
+# name, alternate names, lat, lon, country, admin1 code, population, timezone
+PLACES = [
+    ("Paris", "Lutece,Paname", 48.85, 2.35, "FR", "11", 2138551, "Europe/Paris"),
+    ("Paris", "", 33.66, -95.56, "US", "TX", 24171, "America/Chicago"),
+    ("Springfield", "", 37.21, -93.29, "US", "MO", 169176, "America/Chicago"),
+    ("Springfield", "", 39.80, -89.64, "US", "IL", 114394, "America/Chicago"),
+    ("Schenectady", "", 42.81, -73.94, "US", "NY", 65625, "America/New_York"),
+]
+ADMIN1 = [("US.TX", "Texas"), ("US.MO", "Missouri"), ("US.IL", "Illinois"), ("US.NY", "New York"), ("FR.11", "Ile-de-France")]
+
+
+def _write_dump(directory, with_admin1=True):
+    lines = []
+    for i, (name, alt, lat, lon, cc, a1, pop, tz) in enumerate(PLACES):
+        cols = [""] * 19
+        cols[0], cols[1], cols[2], cols[3] = str(i + 1), name, name, alt
+        cols[4], cols[5], cols[8], cols[10], cols[14], cols[17] = str(lat), str(lon), cc, a1, str(pop), tz
+        lines.append("\t".join(cols))
+    path = directory / "cities.txt"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    if with_admin1:
+        (directory / "admin1CodesASCII.txt").write_text(
+            "".join(f"{code}\t{name}\t{name}\t0\n" for code, name in ADMIN1), encoding="utf-8"
+        )
+    return str(path)
+
+
+@pytest.fixture
+def gaz(tmp_path, monkeypatch):
+    monkeypatch.delenv("GAZETTEER_ADMIN1_PATH", raising=False)
+    return Gazetteer(_write_dump(tmp_path))
+
+
+def test_exact_and_alternate_names(gaz):
+    assert gaz.lookup("Paris")["country_code"] == "FR"
+    assert gaz.lookup("Paname")["country_code"] == "FR"
+    assert gaz.lookup("Paris, Texas")["admin1"] == "Texas"
+    assert gaz.lookup("Springfield, IL")["admin1_code"] == "IL"
+    assert gaz.lookup("Springfield, Illinois")["admin1_code"] == "IL"
+
+
+def test_prefix_is_only_for_autocomplete(gaz):
+    assert gaz.lookup("Spri") is None
+    assert gaz.lookup("Schen") is None
+    assert [p["admin1_code"] for p in gaz.complete("Spri")] == ["MO", "IL"]
+
+
+def test_fuzzy_lookup(gaz):
+    place = gaz.lookup("Schenectdy, NY")
+    assert place["name"] == "Schenectady" and place["fuzzy_score"] >= 0.5
+    assert gaz.lookup("Schenectdy, Ohio") is None
+
+
+def test_hint_mismatch_returns_none(gaz):
+    assert gaz.lookup("Paris, Tennessee") is None
+    assert gaz.lookup("Springfield, Oregon") is None
+
+
+def test_full_state_name_needs_admin1_file(tmp_path, monkeypatch):
+    monkeypatch.delenv("GAZETTEER_ADMIN1_PATH", raising=False)
+    gaz = Gazetteer(_write_dump(tmp_path, with_admin1=False))
+    assert gaz.lookup("Springfield, Illinois") is None
+    assert gaz.lookup("Springfield, IL")["admin1_code"] == "IL"
+
+
+def test_geocode_does_not_cache_hint_mismatch_as_gazetteer_hit(gaz, monkeypatch):
+    init_db()
+    monkeypatch.setattr(geo, "gazetteer", gaz)
+    monkeypatch.setattr(geo, "_openmeteo_search", lambda name: {
+        "name": "Paris", "admin1": "Tennessee", "latitude": 36.30, "longitude": -88.33, "timezone": "America/Chicago",
+    })
+    key = "paris tennessee"
+    geo._GEOCODE_MEMO.pop(key, None)
+    session = SessionLocal()
+    session.query(GeocodeCache).filter_by(query=key).delete()
+    session.commit()
+    session.close()
+
+    assert geo.geocode("Paris, Tennessee")["admin1"] == "Tennessee"
+    session = SessionLocal()
+    try:
+        row = session.get(GeocodeCache, key)
+        assert (row.source, row.admin1) == ("openmeteo", "Tennessee")
+    finally:
+        session.close()
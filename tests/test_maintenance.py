@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta
+
+from app import maintenance
+from app.database import SessionLocal, init_db
+from app.models import ArchivedArticle, Article
+
+
+def test_archive_does_not_overwrite_row_with_reused_id():
+    init_db()
+    old = datetime.utcnow() - timedelta(days=400)
+    session = SessionLocal()
+    try:
+        session.query(ArchivedArticle).delete()
+        session.query(Article).filter(Article.source_url.like("https://example.com/arch/%")).delete()
+        session.add(ArchivedArticle(id=990001, source_url="https://example.com/arch/old", title="Old story"))
+        session.add(Article(
+            id=990001, source_url="https://example.com/arch/new", source_title="New story",
+            published_at=old, fetched_at=old,
+        ))
+        session.commit()
+    finally:
+        session.close()
+
+    assert maintenance.archive_old_articles(30) >= 1
+
+    session = SessionLocal()
+    try:
+        rows = {r.source_url: r for r in session.query(ArchivedArticle)}
+        assert rows["https://example.com/arch/old"].title == "Old story"
+        assert rows["https://example.com/arch/old"].id == 990001
+        assert rows["https://example.com/arch/new"].title == "New story"
+        assert rows["https://example.com/arch/new"].id != 990001
+    finally:
+        session.close()
@@ -0,0 +1,18 @@
+from app.events import bus
+from app.progress import Progress
+
+
+def test_every_visible_change_is_published(monkeypatch):
+    published = []
+    monkeypatch.setattr(bus, "publish", lambda type_, data: published.append((type_, data)))
+    p = Progress()
+    p.start()
+    p.add_rewrite_total(3)
+    assert published[-1][1]["total"] == 3
+    p.stage("fetch", fetched=2)
+    assert published[-1][1]["stages"]["fetch"] == {"fetched": 2}
+    p.stage_inc("fetch", "errors")
+    assert published[-1][1]["stages"]["fetch"]["errors"] == 1
+    p.set_rewrite_total(5)
+    assert published[-1][1]["total"] == 5
+    assert all(type_ == "progress" for type_, _ in published)
@@ -0,0 +1,78 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.database import SessionLocal, engine, init_db
+from app.models import Article, Bookmark
+
+
+@pytest.fixture(scope="module")
+def seeded():
+    init_db()
+    base = datetime(2026, 1, 1)
+    session = SessionLocal()
+    try:
+        session.query(Bookmark).delete()
+        session.query(Article).delete()
+        session.add_all([
+            Article(
+                source_url=f"https://example.com/qc/{i}", source_name=f"Source {i % 3}", location_id=1,
+                source_title=f"Story {i}", ai_title=f"Story {i}", ai_body="Body text. " * 40, ai_model="test",
+                published_at=base + timedelta(hours=i), fetched_at=base + timedelta(hours=i),
+            )
+            for i in range(60)
+        ])
+        session.commit()
+        for a in session.query(Article).limit(10):
+            session.add(Bookmark(article_id=a.id))
+        session.commit()
+    finally:
+        session.close()
+
+
+@contextmanager
+def count_queries():
+    statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+
+
+def _page(limit, view="full", **kw):
+    from app.main import ARTICLE_VIEWS, _articles_page
+
+    params = dict(page=1, limit=limit, q=None, source=None, date_from=None, date_to=None, sort_by=None,
+                  location_id=None, cursor=None, include_total=None, fields=ARTICLE_VIEWS[view])
+    params.update(kw)
+    session = SessionLocal()
+    try:
+        with count_queries() as statements:
+            result = _articles_page(session, **params)
+        return result, len(statements)
+    finally:
+        session.close()
+
+
+@pytest.mark.parametrize("kw, expected", [
+    # cards page + total + bookmark state for the page + ai_body by id
+    ({}, 4),
+    # the card view loads no bodies
+    ({"view": "card"}, 3),
+    # no total
+    ({"include_total": False}, 3),
+])
+def test_article_page_query_count_does_not_grow_with_limit(seeded, kw, expected):
+    counts = {}
+    for limit in (5, 20, 50):
+        result, n = _page(limit, **kw)
+        assert len(result["items"]) == limit
+        counts[limit] = n
+    assert set(counts.values()) == {expected}, counts
@@ -0,0 +1,25 @@
+import threading
+from types import SimpleNamespace
+
+from app import scheduler
+from app.pools import FairQueue
+from app.progress import progress
+
+
+def test_cancelled_rewrite_still_completes_the_bar():
+    queue = FairQueue()
+    progress.start()
+    for i in range(4):
+        queue.put(1, SimpleNamespace(id=i, raw_content="text", ai_body=None, ai_model=None))
+        progress.add_rewrite_total(1)
+    queue.close()
+    fetch_done = threading.Event()
+    fetch_done.set()
+
+    processed = scheduler._rewrite_loop(queue, fetch_done, base_url=None, model=None, should_stop=lambda: True)
+
+    snap = progress.snapshot()
+    assert processed == 0
+    assert snap["completed"] == snap["total"] == 4
+    assert snap["stages"]["rewrite"]["skipped"] == 4
+    progress.reset()
@@ -0,0 +1,22 @@
+from starlette.requests import Request
+
+from app.static_files import SpaIndex
+
+
+def _request(if_none_match):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match is not None else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_spa_index_etag_matching(tmp_path):
+    page = tmp_path / "index.html"
+    page.write_text("<!doctype html><title>app</title>")
+    index = SpaIndex(str(page))
+    tag = index.etag
+    assert index.response(_request(None)).status_code == 200
+    assert index.response(_request(tag)).status_code == 304
+    assert index.response(_request(f"W/{tag}")).status_code == 304
+    assert index.response(_request(f'"other", W/{tag}')).status_code == 304
+    assert index.response(_request("*")).status_code == 304
+    assert index.response(_request('"other"')).status_code == 200
+    assert index.response(_request(tag.strip('"'))).status_code == 200
@@ -635,12 +635,33 @@ export default function App() {
     }
   }
 
+  // Push updates over SSE; fall back to polling if the stream is unavailable
+  const [streamOk, setStreamOk] = useState(false)
   useEffect(() => {
+    if (typeof EventSource === 'undefined') return
+    const es = new EventSource('/api/events')
+    es.onopen = () => setStreamOk(true)
+    es.onerror = () => setStreamOk(false)
+    es.addEventListener('progress', (e) => {
+      try {
+        const s = JSON.parse(e.data)
+        setStatus(prev => ({ ...(prev || {}), ...s }))
+        setRunning(!!s?.running)
+      } catch (_) {}
+    })
+    es.addEventListener('articles_added', () => { loadAll().catch(()=>{}) })
+    es.addEventListener('weather', () => { loadAll().catch(()=>{}) })
+    return () => es.close()
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [])
+
+  useEffect(() => {
+    if (streamOk) return
     // Poll status frequently while running; otherwise slower
     loadStatus()
     const ivl = setInterval(loadStatus, running ? 1000 : 10000)
     return () => clearInterval(ivl)
-  }, [running])
+  }, [running, streamOk])
 
   async function onRunNow() {
     setRunning(true)